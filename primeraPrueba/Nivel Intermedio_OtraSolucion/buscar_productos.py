@@ -22,77 +22,211 @@ Consideraciones:
 # 4. Ingresar la palabra clave cuando se solicite (ejmp: laptop, celular...)
 # 5. Para salir del programa, escribir 'salir' cuando se pida la palabra clave
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import urllib.parse
 import time
+import os
+import sys
+from contextlib import closing
 
-def buscar_productos(palabra_clave):
-    palabra_codificada = urllib.parse.quote(palabra_clave)
-    url = f"https://www.amazon.com.co/s?k={palabra_codificada}"
-    
-    # peticion HTTP
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'es-CO,es;q=0.8,en-US;q=0.5,en;q=0.3',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
+# BeautifulSoup solo se necesita en el modo 'bs4'
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+# Infraestructura compartida con producto_Scraper.py (carpeta primeraPrueba):
+# la descarga (caché, limitador, reintentos) es la del adaptador de Amazon de
+# tiendas.py, que también aporta la lectura en flujo
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cache_respuestas import CacheRespuestas
+from cliente_async import ClienteAsync
+from precios import Precio
+from exportacion import ExportadorProductos
+from producto_Scraper import MetricasBusqueda, ScrapingMercadoLibre
+from tiendas import crear_adaptador, limpiar_vendedor_amazon
+
+TIMEOUT = 15
+LIMITE = 5
+
+# Origen de las búsquedas; AMAZON_URL_BASE apunta el script a un servidor de
+# replay local (servidor_replay.py) para pruebas sin red
+URL_BASE = os.environ.get('AMAZON_URL_BASE', 'https://www.amazon.com.co').rstrip('/')
+
+# 'bs4': árbol completo de BeautifulSoup
+# 'flujo': html.parser por eventos (adaptador de Amazon), deja de leer al tener LIMITE productos
+MODO_PARSEO = os.environ.get('AMAZON_MODO_PARSEO', 'bs4')
+
+# Formato de exportación ('csv', 'jsonl' o 'parquet'); vacío = solo consola.
+# Con exportación activa los productos se escriben por lotes en RUTA_EXPORTACION
+FORMATO_EXPORTACION = os.environ.get('AMAZON_EXPORTAR', '')
+RUTA_EXPORTACION = os.path.join('exportes', 'amazon')
+
+def crear_tienda(cache=None):
+    # Adaptador de Amazon de tiendas.py: URL de búsqueda y descarga con la
+    # infraestructura del scraper (sin productos de ejemplo si algo falla)
+    scraper = ScrapingMercadoLibre(cache=cache, usar_fallback=False)
+    tienda = crear_adaptador('amazon', scraper)
+    tienda.base_url = URL_BASE
+    return tienda
+
+_tienda = None
+
+def tienda_por_defecto():
+    # Tienda compartida por las llamadas que no pasan la suya, como
+    # buscar_productos(palabra_clave); reutiliza sus conexiones entre búsquedas
+    global _tienda
+    if _tienda is None:
+        _tienda = crear_tienda()
+    return _tienda
+
+def buscar_productos(palabra_clave, tienda=None, modo=None, exportador=None):
+    tienda = tienda or tienda_por_defecto()
+    modo = modo or MODO_PARSEO
+    url = tienda.construir_url(palabra_clave)
+    metricas = MetricasBusqueda(palabra_clave, url)
     
     try:
         print(f"Buscando en: {url}")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        productos = soup.find_all('div', {'data-component-type': 's-search-result'})
-        
-        print(f"\nResultados de búsqueda para: {palabra_clave}")
-        print("-" * 50)
-        
-        if not productos:
-            print("No se encontraron productos. Verificando la estructura de la página...")
-            print("Primeros 500 caracteres del HTML recibido:")
-            print(response.text[:500])
-            return
-        
-        for i, producto in enumerate(productos[:5], 1):
-            try:
-                titulo_element = producto.find('h2')
-                if titulo_element:
-                    titulo = titulo_element.text.strip()
-                else:
-                    continue
-                
-                precio_element = producto.find('span', class_='a-price-whole')
-                if precio_element:
-                    precio = precio_element.text.strip()
-                else:
-                    precio = "Precio no disponible"
+        if modo == 'flujo':
+            # El adaptador lee la página en flujo y corta la descarga al tener LIMITE productos
+            productos, html = tienda.buscar(palabra_clave, LIMITE, metricas), None
+        else:
+            with closing(tienda.descargar(url, metricas)) as fragmentos:
+                html = ''.join(fragmentos)
+            with metricas.medir('patron'):
+                productos = extraer_productos_bs4(html, url)
+        entregar_productos(productos, palabra_clave, exportador, html)
                 
-                print(f"\nProducto {i}:")
-                print(f"Título: {titulo}")
-                print(f"Precio: ${precio}")
-                print("-" * 30)
-                    
-            except Exception as e:
-                print(f"Error al procesar el producto {i}: {str(e)}")
-                continue
-                
-    except requests.RequestException as e:
+    except Exception as e:
         print(f"Error al realizar la búsqueda: {e}")
         print("Detalles del error:", str(e))
+    finally:
+        tienda.scraper.reportar_metricas(metricas)
+
+async def buscar_productos_async(palabra_clave, tienda, cliente, modo=None, exportador=None):
+    # Misma búsqueda sobre el cliente asyncio compartido (sin hilos); los
+    # errores se propagan para que buscar_lote_async los informe por palabra
+    modo = modo or MODO_PARSEO
+    url = tienda.construir_url(palabra_clave)
+    metricas = MetricasBusqueda(palabra_clave, url)
+    
+    try:
+        print(f"Buscando en: {url}")
+        if modo == 'flujo':
+            productos, html = await tienda.buscar_async(palabra_clave, LIMITE, cliente, metricas), None
+        else:
+            html = await tienda.scraper.descargar_html_async(url, tienda.scraper.limitador, cliente, metricas)
+            with metricas.medir('patron'):
+                productos = extraer_productos_bs4(html, url)
+        entregar_productos(productos, palabra_clave, exportador, html)
+    finally:
+        tienda.scraper.reportar_metricas(metricas)
+
+async def buscar_lote_async(palabras, tienda, max_conexiones=100, modo=None, exportador=None):
+    # Todas las búsquedas en vuelo a la vez dentro de un solo proceso. Una
+    # búsqueda que falla (HTTP, conexión, timeout o parseo) no cancela las
+    # demás: se informa con su palabra clave y se devuelven las fallidas
+    async with ClienteAsync(max_conexiones, timeout=TIMEOUT) as cliente:
+        resultados = await asyncio.gather(*(buscar_productos_async(palabra, tienda, cliente, modo, exportador)
+                                            for palabra in palabras), return_exceptions=True)
+    
+    fallidas = [(palabra, error) for palabra, error in zip(palabras, resultados)
+                if isinstance(error, Exception)]
+    for palabra, error in fallidas:
+        print(f"Error al buscar '{palabra}': {type(error).__name__}: {error}")
+    if fallidas:
+        print(f"{len(fallidas)} de {len(palabras)} búsquedas fallaron")
+    return fallidas
+
+def entregar_productos(productos, palabra_clave, exportador=None, html=None):
+    # Sin exportador se imprime como siempre; con exportador va al archivo sin pasar por consola
+    if exportador is None:
+        mostrar_productos(productos, palabra_clave, html)
+        return
+    cantidad = exportador.escribir_muchos(productos, palabra_clave=palabra_clave, tienda='amazon')
+    print(f"{cantidad} productos de '{palabra_clave}' enviados a la exportación")
+
+def mostrar_productos(productos, palabra_clave, html=None):
+    print(f"\nResultados de búsqueda para: {palabra_clave}")
+    print("-" * 50)
+    
+    if not productos:
+        print("No se encontraron productos: la página no tiene tarjetas s-search-result")
+        # En modo 'flujo' la página no se conserva completa
+        if html is not None:
+            print("Primeros 500 caracteres del HTML recibido:")
+            print(html[:500])
+        return
+    
+    for i, datos in enumerate(productos, 1):
+        precio = datos['precio']
+        print(f"\nProducto {i}:")
+        print(f"Título: {datos['titulo']}")
+        print(f"Precio: {precio if precio is not None else 'Precio no disponible'}")
+        if datos['vendedor']:
+            print(f"Vendedor: {datos['vendedor']}")
+        if datos['url']:
+            print(f"Enlace: {datos['url']}")
+        print("-" * 30)
+
+def extraer_productos_bs4(html, url_base, limite=LIMITE):
+    if BeautifulSoup is None:
+        raise ImportError("El modo 'bs4' requiere beautifulsoup4 (pip install beautifulsoup4)")
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    productos = []
+    for i, tarjeta in enumerate(soup.find_all('div', {'data-component-type': 's-search-result'})[:limite], 1):
+        try:
+            datos = extraer_tarjeta(tarjeta, url_base)
+            if datos:
+                productos.append(datos)
+        except Exception as e:
+            print(f"Error al procesar el producto {i}: {str(e)}")
+    return productos
+
+def extraer_tarjeta(producto, url_base):
+    # Todos los campos se buscan dentro de la misma tarjeta s-search-result,
+    # así una tarjeta sin precio no desplaza los datos de las siguientes
+    titulo_element = producto.find('h2')
+    if not titulo_element:
+        return None
+    
+    precio_element = producto.find('span', class_='a-price-whole')
+    enlace_element = titulo_element.find('a', href=True) or producto.find('a', class_='a-link-normal', href=True)
+    imagen_element = producto.find('img', class_='s-image')
+    vendedor_element = producto.find('div', class_='a-row a-size-base a-color-secondary')
+    
+    vendedor = limpiar_vendedor_amazon(vendedor_element.get_text(' ', strip=True)) if vendedor_element else ''
+    
+    return {
+        'titulo': titulo_element.get_text(' ', strip=True),
+        'precio': Precio.desde_texto(precio_element.text, 'COP') if precio_element else None,
+        'url': urllib.parse.urljoin(url_base, enlace_element['href']) if enlace_element else None,
+        'imagen': imagen_element.get('src') if imagen_element else None,
+        'vendedor': vendedor or None,
+    }
 
 def main():
+    tienda = crear_tienda(CacheRespuestas())
+    exportador = ExportadorProductos(RUTA_EXPORTACION, FORMATO_EXPORTACION) if FORMATO_EXPORTACION else None
     while True:
         palabra = input("\nIngrese la palabra clave para buscar (o 'salir' para terminar): ")
         if palabra.lower() == 'salir':
             break
-        buscar_productos(palabra)
+        # Varias palabras separadas por comas se buscan a la vez con asyncio
+        palabras = [p.strip() for p in palabra.split(',') if p.strip()]
+        if len(palabras) > 1:
+            asyncio.run(buscar_lote_async(palabras, tienda, exportador=exportador))
+        else:
+            buscar_productos(palabra, tienda, exportador=exportador)
         #delay  
         time.sleep(1)
+    
+    tienda.scraper.cerrar()
+    if exportador:
+        exportador.cerrar()
+        print(f"Exportados {exportador.exportados} productos en: {', '.join(exportador.archivos)}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,471 @@
+"""
+Benchmark del camino crítico del scraping (sin conexión a internet)
+
+Mide la extracción de productos de cada página con el extractor de su tienda
+(_hacer_scraping de ScrapingMercadoLibre o extraer_productos del adaptador
+registrado en tiendas.py), y limpiar_texto y _limpiar_precio, sobre un corpus
+de páginas de resultados guardadas en fixtures/ (MercadoLibre y Amazon, de
+distintos tamaños) y reporta:
+- Páginas por segundo
+- Latencia p50 / p99 por página
+- Pico de memoria (tracemalloc)
+
+Los resultados se pueden guardar como línea base y comparar en ejecuciones
+posteriores para detectar regresiones. En las páginas de MercadoLibre se mide
+además la búsqueda con regex de la versión original (busqueda_original): la
+extracción actual no debe ser más lenta que ella en la misma ejecución.
+
+Uso:
+    python benchmark_scraping.py
+    python benchmark_scraping.py --guardar-base benchmark_base.json
+    python benchmark_scraping.py --comparar benchmark_base.json --umbral 1.5
+    python benchmark_scraping.py --umbral-original 1.5
+    python benchmark_scraping.py --generar-fixtures
+
+Cualquier página real guardada en fixtures/ (.html o .html.gz) se incluye
+automáticamente en el corpus; el prefijo del nombre indica la tienda.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from producto_Scraper import ScrapingMercadoLibre
+from tiendas import crear_adaptador, tiendas_registradas
+
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Entradas de las funciones de limpieza: nodos de texto y números con separadores
+_TEXTOS = re.compile(r'>([^<]{15,300})<')
+_NUMEROS = re.compile(r'\d[\d.,]{2,}')
+
+# Patrones de la versión original de _hacer_scraping, de títulos y de precios
+PATRONES_TITULO_ORIGINAL = [re.compile(patron, re.IGNORECASE | re.DOTALL) for patron in (
+    r'<h2[^>]*class="[^"]*ui-search-item__title[^"]*"[^>]*>([^<]{15,120})</h2>',
+    r'<a[^>]*class="[^"]*ui-search-link[^"]*"[^>]*title="([^"]{15,120})"',
+    r'<li[^>]*class="[^"]*ui-search-layout__item[^"]*"[^>]*>.*?<h2[^>]*>([^<]{15,120})</h2>',
+    r'<div[^>]*class="[^"]*ui-search-item__title[^"]*"[^>]*>([^<]{15,120})</div>',
+    r'<span[^>]*class="[^"]*ui-search-item__title[^"]*"[^>]*>([^<]{15,120})</span>',
+)]
+PATRONES_PRECIO_ORIGINAL = [re.compile(patron, re.IGNORECASE) for patron in (
+    r'<span[^>]*class="[^"]*price-tag-fraction[^"]*"[^>]*>([\d.]+(?:,\d{2})?)</span>',
+    r'<div[^>]*class="[^"]*price-tag[^"]*"[^>]*>.*?([\d.]+(?:,\d{2})?)</div>',
+    r'<span[^>]*class="[^"]*price-tag[^"]*"[^>]*>.*?([\d.]+(?:,\d{2})?)</span>',
+    r'<span[^>]*>.*?\$\s*([\d.]+(?:,\d{2})?)</span>',
+    r'price-tag[^>]*>.*?([\d.]+(?:,\d{2})?)',
+)]
+
+
+def cargar_corpus(directorio=DIRECTORIO_FIXTURES):
+    """
+    Carga las páginas guardadas del directorio de fixtures
+
+    Args:
+        directorio (str): Carpeta con archivos .html o .html.gz
+
+    Returns:
+        list: Tuplas (nombre, html) ordenadas por nombre
+    """
+    corpus = []
+    for nombre in sorted(os.listdir(directorio)):
+        ruta = os.path.join(directorio, nombre)
+        if nombre.endswith('.html.gz'):
+            with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+                corpus.append((nombre[:-len('.html.gz')], archivo.read()))
+        elif nombre.endswith('.html'):
+            with open(ruta, encoding='utf-8') as archivo:
+                corpus.append((nombre[:-len('.html')], archivo.read()))
+    return corpus
+
+
+def busqueda_original(html, limite):
+    """
+    Búsquedas de la versión original de _hacer_scraping, sin la limpieza
+
+    Un findall por patrón, de títulos y de precios, hasta reunir 'limite'
+    coincidencias. Es la referencia de velocidad de la extracción de
+    MercadoLibre.
+
+    Args:
+        html (str): Página de resultados
+        limite (int): Coincidencias tras las que se deja de probar patrones
+
+    Returns:
+        tuple: (títulos, precios) encontrados, sin limpiar
+    """
+    encontrados = []
+    for patrones in (PATRONES_TITULO_ORIGINAL, PATRONES_PRECIO_ORIGINAL):
+        coincidencias = []
+        for patron in patrones:
+            coincidencias += patron.findall(html)
+            if len(coincidencias) >= limite:
+                break
+        encontrados.append(coincidencias)
+    return tuple(encontrados)
+
+
+def tienda_de(nombre):
+    """
+    Tienda de una página del corpus según el prefijo de su nombre
+
+    Args:
+        nombre (str): Nombre de la página ('amazon_laptop_16')
+
+    Returns:
+        str: Tienda registrada en tiendas.py; 'mercadolibre' si el prefijo no lo es
+    """
+    prefijo = nombre.split('_', 1)[0]
+    return prefijo if prefijo in tiendas_registradas() else 'mercadolibre'
+
+
+def preparar_casos(scraper, html, limite, tienda='mercadolibre'):
+    """
+    Prepara las funciones a medir sobre una página
+
+    La extracción se mide con el extractor de la tienda de la página:
+    _hacer_scraping para MercadoLibre y extraer_productos del adaptador para
+    las demás. Las páginas de MercadoLibre miden también busqueda_original.
+
+    Args:
+        scraper (ScrapingMercadoLibre): Instancia a medir
+        html (str): Página de resultados
+        limite (int): Límite de productos de la extracción
+        tienda (str): Tienda a la que pertenece la página
+
+    Returns:
+        dict: Nombre del caso -> función sin argumentos
+    """
+    textos = _TEXTOS.findall(html)
+    numeros = _NUMEROS.findall(html)
+
+    def limpiar_textos():
+        for texto in textos:
+            scraper.limpiar_texto(texto)
+
+    def limpiar_precios():
+        for numero in numeros:
+            scraper._limpiar_precio(numero)
+
+    if tienda == 'mercadolibre':
+        casos = {'_hacer_scraping': lambda: scraper._hacer_scraping(html, limite),
+                 'busqueda_original': lambda: busqueda_original(html, limite)}
+    else:
+        adaptador = crear_adaptador(tienda, scraper)
+        url = adaptador.construir_url('laptop')
+        casos = {'extraer_productos': lambda: list(adaptador.extraer_productos((html,), url, limite))}
+    casos['limpiar_texto'] = limpiar_textos
+    casos['_limpiar_precio'] = limpiar_precios
+    return casos
+
+
+def percentil(valores_ordenados, p):
+    """
+    Percentil por el método del rango más cercano
+
+    Args:
+        valores_ordenados (list): Valores ordenados de menor a mayor
+        p (float): Percentil entre 0 y 100
+
+    Returns:
+        float: Valor del percentil
+    """
+    indice = max(0, min(len(valores_ordenados) - 1,
+                        round(p / 100 * len(valores_ordenados) + 0.5) - 1))
+    return valores_ordenados[indice]
+
+
+def medir(funcion, repeticiones, calentamiento=3):
+    """
+    Ejecuta una función varias veces y calcula sus métricas
+
+    Args:
+        funcion (callable): Caso a medir
+        repeticiones (int): Ejecuciones medidas
+        calentamiento (int): Ejecuciones previas descartadas
+
+    Returns:
+        dict: paginas_s, p50_ms, p99_ms y pico_kb
+    """
+    for _ in range(calentamiento):
+        funcion()
+
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+
+    # El pico de memoria se mide aparte: tracemalloc ralentiza la ejecución
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'paginas_s': len(latencias) / sum(latencias),
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'pico_kb': pico / 1024,
+    }
+
+
+def ejecutar(corpus, repeticiones, limite):
+    """
+    Mide todos los casos sobre todas las páginas del corpus
+
+    Args:
+        corpus (list): Tuplas (nombre, html)
+        repeticiones (int): Ejecuciones medidas por caso y página
+        limite (int): Límite de productos de la extracción
+
+    Returns:
+        dict: {caso: {pagina: métricas}}
+    """
+    scraper = ScrapingMercadoLibre()
+    resultados = {}
+    with open(os.devnull, 'w') as nulo:
+        for nombre, html in corpus:
+            for caso, funcion in preparar_casos(scraper, html, limite, tienda_de(nombre)).items():
+                # _hacer_scraping imprime su progreso; no forma parte de la medición
+                with redirect_stdout(nulo):
+                    metricas = medir(funcion, repeticiones)
+                resultados.setdefault(caso, {})[nombre] = metricas
+    return resultados
+
+
+def mostrar(resultados, base=None, umbral=1.5):
+    """
+    Imprime la tabla de resultados y las regresiones frente a la línea base
+
+    Args:
+        resultados (dict): Métricas de esta ejecución
+        base (dict): Métricas guardadas de una ejecución anterior
+        umbral (float): Razón p50 actual / p50 base considerada regresión
+
+    Returns:
+        list: Regresiones encontradas como (caso, pagina, razon)
+    """
+    regresiones = []
+    print("=" * 100)
+    print(f"{'CASO':<20}{'PÁGINA':<34}{'PÁG/S':>10}{'P50 MS':>10}{'P99 MS':>10}{'PICO KB':>10}  VS BASE")
+    print("=" * 100)
+    for caso, paginas in resultados.items():
+        for pagina, m in paginas.items():
+            comparacion = ''
+            anterior = (base or {}).get(caso, {}).get(pagina)
+            if anterior:
+                razon = m['p50_ms'] / anterior['p50_ms']
+                comparacion = f"{razon:.2f}x"
+                if razon > umbral:
+                    regresiones.append((caso, pagina, razon))
+                    comparacion += ' !'
+            print(f"{caso:<20}{pagina:<34}{m['paginas_s']:>10.1f}{m['p50_ms']:>10.3f}"
+                  f"{m['p99_ms']:>10.3f}{m['pico_kb']:>10.1f}  {comparacion}")
+    print("=" * 100)
+
+    for caso, pagina, razon in regresiones:
+        print(f"[REGRESIÓN] {caso} en {pagina}: {razon:.2f}x más lento que la línea base")
+    return regresiones
+
+
+def comparar_con_original(resultados, umbral=1.5):
+    """
+    Compara la extracción de MercadoLibre con la búsqueda de la versión original
+
+    Las dos se miden en la misma ejecución, así que la razón no depende de la
+    máquina. Se decide con la suma de p50 de todas las páginas: por página
+    pesa mucho cuántos patrones llega a probar la versión original. Hoy la
+    razón ronda 0.9; la búsqueda con un patrón combinado que se probaba en
+    cada posición la llevaba a 2.5.
+
+    Args:
+        resultados (dict): Métricas de esta ejecución
+        umbral (float): Razón p50 extracción / p50 original considerada regresión
+
+    Returns:
+        list: Regresiones encontradas como (caso, pagina, razon)
+    """
+    originales = resultados.get('busqueda_original', {})
+    paginas = [pagina for pagina in resultados.get('_hacer_scraping', {}) if pagina in originales]
+    if not paginas:
+        return []
+
+    actual = original = 0.0
+    for pagina in paginas:
+        m, referencia = resultados['_hacer_scraping'][pagina], originales[pagina]
+        print(f"[INFO] _hacer_scraping en {pagina}: {m['p50_ms'] / referencia['p50_ms']:.2f}x la versión original")
+        actual += m['p50_ms']
+        original += referencia['p50_ms']
+
+    razon = actual / original
+    print(f"[INFO] _hacer_scraping en el corpus: {razon:.2f}x la versión original")
+    if razon <= umbral:
+        return []
+    print(f"[REGRESIÓN] _hacer_scraping: {razon:.2f}x más lento que la versión original")
+    return [('_hacer_scraping', 'corpus', razon)]
+
+
+def generar_fixtures(directorio=DIRECTORIO_FIXTURES, semilla=2024):
+    """
+    Genera el corpus sintético con el marcado de las páginas de resultados
+
+    Reproduce la estructura de las tarjetas de MercadoLibre
+    (ui-search-layout__item) y de Amazon (s-search-result), con ruido típico
+    de una página real (scripts, estilos, atributos de tracking) y algunas
+    tarjetas patrocinadas sin precio.
+
+    Args:
+        directorio (str): Carpeta de salida
+        semilla (int): Semilla para que el corpus sea reproducible
+    """
+    azar = random.Random(semilla)
+    marcas = ['Lenovo', 'HP', 'ASUS', 'Acer', 'Dell', 'Samsung', 'Xiaomi', 'Apple', 'LG', 'Sony']
+    detalles = ['Intel Core i5 8GB RAM 256GB SSD', 'AMD Ryzen 7 16GB 512GB SSD',
+                '15.6" Full HD Windows 11', '128GB 8GB RAM Azul', '4K UHD Smart TV 55"',
+                'Intel Celeron 4GB 128GB Gris', 'Pantalla 14" &amp; Teclado Retroiluminado']
+
+    def titulo():
+        return f"{azar.choice(marcas)} {azar.choice(detalles)} Modelo {azar.randint(100, 999)}"
+
+    def precio():
+        return f"{azar.randint(300, 9000) * 1000:,}".replace(',', '.')
+
+    ruido = ('<script type="application/json">{"tracking":{"id":"%s","flags":[%s]}}</script>'
+             '<style>.c%d{margin:0 auto;padding:4px}</style>')
+
+    def pagina_mercadolibre(tarjetas):
+        partes = ['<!DOCTYPE html><html lang="es-CO"><head><title>Laptop | MercadoLibre</title>']
+        partes += [ruido % (azar.random(), ','.join(str(azar.randint(0, 99)) for _ in range(40)), i)
+                   for i in range(20)]
+        partes.append('</head><body><ol class="ui-search-layout ui-search-layout--stack">')
+        for i in range(tarjetas):
+            item = azar.randint(100000000, 999999999)
+            patrocinada = i % 9 == 4
+            partes.append(
+                f'<li class="ui-search-layout__item shops__layout-item" data-index="{i}">'
+                f'<div class="ui-search-result__wrapper"><div class="andes-card ui-search-result">'
+                f'<div class="ui-search-result__image"><a href="https://articulo.mercadolibre.com.co/MCO-{item}-producto-_JM" '
+                f'class="ui-search-link" title="{titulo()}"><img class="ui-search-result-image__element" '
+                f'src="https://http2.mlstatic.com/D_NQ_NP_{item}-O.webp" width="284" height="284" alt=""></a></div>'
+                f'<div class="ui-search-result__content-wrapper">'
+                f'<h2 class="ui-search-item__title shops__item-title">{titulo()}</h2>'
+                f'<p class="ui-search-official-store-label ui-search-color--GRAY">Vendido por {azar.choice(marcas)}</p>'
+            )
+            if patrocinada:
+                partes.append('<span class="ui-search-item__ad-label">Publicidad</span>')
+            else:
+                partes.append(
+                    f'<div class="ui-search-price ui-search-price--size-medium"><span class="price-tag ui-search-price__part">'
+                    f'<span class="price-tag-symbol">$</span><span class="price-tag-fraction">{precio()}</span></span></div>'
+                )
+            partes.append('<div class="ui-search-installments">en 12x sin interés</div></div></div></div></li>')
+        partes.append('</ol></body></html>')
+        return ''.join(partes)
+
+    def pagina_amazon(resultados):
+        partes = ['<!doctype html><html lang="es-co"><head><title>Amazon.com.co : laptop</title>']
+        partes += [ruido % (azar.random(), ','.join(str(azar.randint(0, 99)) for _ in range(60)), i)
+                   for i in range(30)]
+        partes.append('</head><body><div class="s-main-slot s-result-list s-search-results sg-row">')
+        for i in range(resultados):
+            asin = 'B0' + ''.join(azar.choice('ABCDEFGHJKLMNPQRSTUVWXYZ0123456789') for _ in range(8))
+            valor = precio()
+            partes.append(
+                f'<div data-asin="{asin}" data-index="{i + 1}" data-component-type="s-search-result" '
+                f'class="sg-col-4-of-24 s-result-item s-asin sg-col-4-of-12 AdHolder">'
+                f'<div class="sg-col-inner"><div class="s-widget-container s-spacing-small">'
+                f'<span class="rush-component" data-component-type="s-product-image">'
+                f'<a class="a-link-normal s-no-outline" href="/dp/{asin}/ref=sr_1_{i + 1}">'
+                f'<img class="s-image" src="https://m.media-amazon.com/images/I/{asin}._AC_UY218_.jpg" alt=""></a></span>'
+                f'<div class="a-section a-spacing-small puis-padding-left-small">'
+                f'<h2 class="a-size-mini a-spacing-none a-color-base s-line-clamp-4">'
+                f'<a class="a-link-normal s-underline-text s-link-style a-text-normal" href="/dp/{asin}/ref=sr_1_{i + 1}">'
+                f'<span class="a-size-base-plus a-color-base a-text-normal">{titulo()}</span></a></h2>'
+                f'<div class="a-row a-size-small"><span aria-label="4,5 de 5 estrellas">'
+                f'<i class="a-icon a-icon-star-small a-star-small-4-5"></i></span></div>'
+            )
+            if i % 7 != 3:
+                partes.append(
+                    f'<div class="a-row a-size-base a-color-base"><a class="a-link-normal" href="/dp/{asin}">'
+                    f'<span class="a-price" data-a-size="xl" data-a-color="base"><span class="a-offscreen">${valor}</span>'
+                    f'<span aria-hidden="true"><span class="a-price-symbol">$</span>'
+                    f'<span class="a-price-whole">{valor}</span></span></span></a></div>'
+                )
+            partes.append('</div></div></div></div>')
+        partes.append('</div></body></html>')
+        return ''.join(partes)
+
+    os.makedirs(directorio, exist_ok=True)
+    paginas = {
+        'mercadolibre_laptop_10': pagina_mercadolibre(10),
+        'mercadolibre_laptop_50': pagina_mercadolibre(50),
+        'mercadolibre_laptop_200': pagina_mercadolibre(200),
+        'amazon_laptop_16': pagina_amazon(16),
+        'amazon_laptop_60': pagina_amazon(60),
+    }
+    for nombre, html in paginas.items():
+        ruta = os.path.join(directorio, nombre + '.html.gz')
+        # mtime=0 para que regenerar el corpus no cambie los archivos
+        with open(ruta, 'wb') as archivo, gzip.GzipFile(fileobj=archivo, mode='wb', mtime=0) as comprimido:
+            comprimido.write(html.encode('utf-8'))
+        print(f"[INFO] Fixture generado: {ruta} ({len(html)} caracteres)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del parsing de páginas de resultados")
+    parser.add_argument('--repeticiones', type=int, default=50,
+                        help="ejecuciones medidas por caso y página")
+    parser.add_argument('--limite', type=int, default=50,
+                        help="límite de productos de la extracción")
+    parser.add_argument('--fixtures', default=DIRECTORIO_FIXTURES,
+                        help="carpeta con las páginas guardadas")
+    parser.add_argument('--guardar-base', metavar='RUTA',
+                        help="guarda los resultados como línea base")
+    parser.add_argument('--comparar', metavar='RUTA',
+                        help="compara contra una línea base guardada")
+    parser.add_argument('--umbral', type=float, default=1.5,
+                        help="razón de p50 a partir de la cual se reporta regresión")
+    parser.add_argument('--umbral-original', type=float, default=1.5,
+                        help="razón de p50 frente a la versión original a partir de la cual se reporta regresión")
+    parser.add_argument('--generar-fixtures', action='store_true',
+                        help="regenera el corpus sintético y termina")
+    args = parser.parse_args()
+
+    if args.generar_fixtures:
+        generar_fixtures(args.fixtures)
+        return 0
+
+    corpus = cargar_corpus(args.fixtures)
+    if not corpus:
+        print(f"[ERROR] No hay páginas en {args.fixtures}")
+        return 1
+
+    print(f"[INFO] Corpus: {len(corpus)} páginas, {args.repeticiones} repeticiones por caso")
+    resultados = ejecutar(corpus, args.repeticiones, args.limite)
+
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+
+    regresiones = mostrar(resultados, base, args.umbral)
+    regresiones += comparar_con_original(resultados, args.umbral_original)
+
+    if args.guardar_base:
+        with open(args.guardar_base, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"[INFO] Línea base guardada en {args.guardar_base}")
+
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Caché local de respuestas HTTP para las páginas de búsqueda
+
+Características técnicas:
+- Almacenamiento en SQLite (solo librerías estándar)
+- Clave por URL normalizada (esquema/host en minúsculas, parámetros ordenados)
+- Expiración por TTL y tamaño máximo con desalojo LRU
+- Revalidación condicional con ETag / Last-Modified cuando la entrada expira
+- Seguro para usar desde varios hilos
+"""
+
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Dict, NamedTuple, Optional
+
+
+class EntradaCache(NamedTuple):
+    """
+    Respuesta almacenada en caché
+
+    Attributes:
+        cuerpo (str): Contenido HTML decodificado
+        etag (Optional[str]): Header ETag de la respuesta original
+        last_modified (Optional[str]): Header Last-Modified de la respuesta original
+        vigente (bool): True si la entrada no ha superado el TTL
+    """
+    cuerpo: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    vigente: bool
+
+    def headers_condicionales(self) -> Dict[str, str]:
+        """
+        Headers para revalidar la entrada con el servidor
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since disponibles
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CacheRespuestas:
+    """
+    Caché de respuestas HTTP persistida en SQLite
+
+    Attributes:
+        ruta (str): Archivo SQLite (':memory:' para una caché temporal)
+        ttl (float): Segundos durante los que una entrada se sirve sin revalidar
+        max_bytes (int): Tamaño máximo de los cuerpos almacenados
+    """
+
+    def __init__(self, ruta: str = 'cache_respuestas.db', ttl: float = 900,
+                 max_bytes: int = 50 * 1024 * 1024):
+        if ttl < 0:
+            raise ValueError("ttl no puede ser negativo")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes debe ser mayor que 0")
+        self.ruta = ruta
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.executescript('''
+            CREATE TABLE IF NOT EXISTS respuestas (
+                url TEXT PRIMARY KEY,
+                cuerpo TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                guardado REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL,
+                tamano INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_respuestas_acceso
+                ON respuestas (ultimo_acceso);
+        ''')
+
+    @staticmethod
+    def normalizar_url(url: str) -> str:
+        """
+        Normaliza una URL para usarla como clave de caché
+
+        Args:
+            url (str): URL original
+
+        Returns:
+            str: URL con esquema y host en minúsculas, sin puerto por defecto,
+            sin fragmento y con los parámetros ordenados
+        """
+        partes = urllib.parse.urlsplit(url)
+        esquema = partes.scheme.lower()
+        host = (partes.hostname or '').lower()
+        puertos_defecto = {'http': 80, 'https': 443}
+        if partes.port and partes.port != puertos_defecto.get(esquema):
+            host = f"{host}:{partes.port}"
+        parametros = sorted(urllib.parse.parse_qsl(partes.query, keep_blank_values=True))
+        consulta = urllib.parse.urlencode(parametros)
+        return urllib.parse.urlunsplit((esquema, host, partes.path or '/', consulta, ''))
+
+    def obtener(self, url: str) -> Optional[EntradaCache]:
+        """
+        Busca una respuesta en caché y la marca como usada recientemente
+
+        Args:
+            url (str): URL de la petición
+
+        Returns:
+            Optional[EntradaCache]: Entrada almacenada (vigente o expirada) o None
+        """
+        clave = self.normalizar_url(url)
+        ahora = time.time()
+        with self._lock:
+            fila = self._conexion.execute(
+                'SELECT cuerpo, etag, last_modified, guardado FROM respuestas WHERE url = ?',
+                (clave,)
+            ).fetchone()
+            if fila is None:
+                return None
+            self._conexion.execute(
+                'UPDATE respuestas SET ultimo_acceso = ? WHERE url = ?', (ahora, clave)
+            )
+            self._conexion.commit()
+
+        cuerpo, etag, last_modified, guardado = fila
+        return EntradaCache(cuerpo, etag, last_modified, ahora - guardado < self.ttl)
+
+    def guardar(self, url: str, cuerpo: str, etag: Optional[str] = None,
+                last_modified: Optional[str] = None):
+        """
+        Almacena una respuesta y desaloja las menos usadas si se supera max_bytes
+
+        Args:
+            url (str): URL de la petición
+            cuerpo (str): Contenido decodificado
+            etag (Optional[str]): Header ETag recibido
+            last_modified (Optional[str]): Header Last-Modified recibido
+        """
+        tamano = len(cuerpo.encode('utf-8'))
+        if tamano > self.max_bytes:
+            return
+
+        clave = self.normalizar_url(url)
+        ahora = time.time()
+        with self._lock:
+            self._conexion.execute(
+                'INSERT OR REPLACE INTO respuestas '
+                '(url, cuerpo, etag, last_modified, guardado, ultimo_acceso, tamano) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (clave, cuerpo, etag, last_modified, ahora, ahora, tamano)
+            )
+            self._desalojar()
+            self._conexion.commit()
+
+    def refrescar(self, url: str):
+        """
+        Reinicia el TTL de una entrada tras una respuesta 304 Not Modified
+
+        Args:
+            url (str): URL de la petición
+        """
+        ahora = time.time()
+        with self._lock:
+            self._conexion.execute(
+                'UPDATE respuestas SET guardado = ?, ultimo_acceso = ? WHERE url = ?',
+                (ahora, ahora, self.normalizar_url(url))
+            )
+            self._conexion.commit()
+
+    def cerrar(self):
+        """
+        Cierra la conexión con la base de datos
+        """
+        with self._lock:
+            self._conexion.close()
+
+    def _desalojar(self):
+        """
+        Elimina las entradas usadas hace más tiempo hasta respetar max_bytes
+        """
+        total, = self._conexion.execute(
+            'SELECT COALESCE(SUM(tamano), 0) FROM respuestas'
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        cursor = self._conexion.execute(
+            'SELECT url, tamano FROM respuestas ORDER BY ultimo_acceso'
+        )
+        desalojadas = []
+        for url, tamano in cursor:
+            if total <= self.max_bytes:
+                break
+            desalojadas.append((url,))
+            total -= tamano
+        self._conexion.executemany('DELETE FROM respuestas WHERE url = ?', desalojadas)
@@ -0,0 +1,331 @@
+"""
+Cliente HTTP asíncrono para las páginas de búsqueda
+
+Características técnicas:
+- Solo librerías estándar: streams de asyncio y ssl, sin aiohttp ni hilos
+- Conexiones keep-alive reutilizadas por host
+- Límite global de peticiones en vuelo para mantener cientos de búsquedas
+  concurrentes en un solo proceso
+- Cuerpos con Content-Length, chunked o delimitados por cierre de conexión
+- Redirecciones y errores como urllib.error.HTTPError / URLError, igual que
+  el pool síncrono de producto_Scraper.py
+"""
+
+import asyncio
+import http.client
+import io
+import socket
+import ssl
+import time
+import urllib.error
+import urllib.parse
+from typing import Dict, NamedTuple, Optional
+
+
+class RespuestaAsync(NamedTuple):
+    """
+    Respuesta HTTP leída por completo
+
+    Attributes:
+        url (str): URL final tras seguir las redirecciones
+        status (int): Código de estado HTTP
+        reason (str): Texto del estado
+        headers (http.client.HTTPMessage): Headers de la respuesta
+        cuerpo (bytes): Cuerpo tal como llegó (sin quitar Content-Encoding)
+    """
+    url: str
+    status: int
+    reason: str
+    headers: http.client.HTTPMessage
+    cuerpo: bytes
+
+    def getheader(self, nombre: str, defecto: Optional[str] = None) -> Optional[str]:
+        """
+        Valor de un header, con la misma firma que HTTPResponse.getheader
+        """
+        return self.headers.get(nombre, defecto)
+
+    def texto(self) -> str:
+        """
+        Decodifica el cuerpo con el charset de Content-Type (UTF-8 por defecto)
+
+        Returns:
+            str: Cuerpo decodificado; solo válido si no hay Content-Encoding
+        """
+        charset = self.headers.get_content_charset() or 'utf-8'
+        try:
+            return self.cuerpo.decode(charset, errors='ignore')
+        except LookupError:
+            return self.cuerpo.decode('utf-8', errors='ignore')
+
+
+class _ConexionAsync(NamedTuple):
+    """
+    Par de streams de una conexión abierta
+    """
+    lector: asyncio.StreamReader
+    escritor: asyncio.StreamWriter
+
+
+class ClienteAsync:
+    """
+    Cliente HTTP/1.1 sobre asyncio con conexiones keep-alive por host
+
+    Debe crearse y usarse dentro del mismo bucle de eventos. Se puede usar
+    como gestor de contexto asíncrono para cerrar las conexiones al salir.
+
+    Attributes:
+        max_conexiones (int): Peticiones en vuelo como máximo
+        tamano_pool (int): Conexiones inactivas que se conservan por host
+        tiempo_inactividad (float): Segundos tras los que una conexión
+            inactiva se descarta
+        timeout (float): Timeout de cada operación de red en segundos
+    """
+
+    CODIGOS_REDIRECCION = (301, 302, 303, 307, 308)
+
+    def __init__(self, max_conexiones: int = 100, tamano_pool: int = 4,
+                 tiempo_inactividad: float = 30.0, timeout: float = 15):
+        if max_conexiones < 1:
+            raise ValueError("max_conexiones debe ser al menos 1")
+        if tamano_pool < 1:
+            raise ValueError("tamano_pool debe ser al menos 1")
+        self.max_conexiones = max_conexiones
+        self.tamano_pool = tamano_pool
+        self.tiempo_inactividad = tiempo_inactividad
+        self.timeout = timeout
+
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+        self._inactivas = {}
+        self._semaforo = asyncio.Semaphore(max_conexiones)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar()
+
+    async def obtener(self, url: str, headers: Dict[str, str], max_redirecciones: int = 5,
+                      metricas=None) -> RespuestaAsync:
+        """
+        Envía una petición GET y lee la respuesta completa
+
+        Args:
+            url (str): URL a descargar
+            headers (Dict[str, str]): Headers HTTP de la petición
+            max_redirecciones (int): Redirecciones permitidas
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+                de DNS, conexión, primer byte y descarga
+        Returns:
+            RespuestaAsync: Respuesta con el cuerpo leído
+        Raises:
+            urllib.error.HTTPError: Si el servidor responde con un código >= 400
+            urllib.error.URLError: Si falla la conexión o se agota el timeout
+        """
+        async with self._semaforo:
+            for _ in range(max_redirecciones + 1):
+                respuesta = await self._peticion(url, headers, metricas)
+
+                ubicacion = respuesta.getheader('Location')
+                if respuesta.status in self.CODIGOS_REDIRECCION and ubicacion:
+                    url = urllib.parse.urljoin(url, ubicacion)
+                    continue
+
+                if respuesta.status >= 400:
+                    raise urllib.error.HTTPError(url, respuesta.status, respuesta.reason,
+                                                 respuesta.headers, io.BytesIO(respuesta.cuerpo))
+                return respuesta
+
+        raise urllib.error.URLError(f"Demasiadas redirecciones: {url}")
+
+    async def cerrar(self):
+        """
+        Cierra todas las conexiones inactivas
+        """
+        inactivas, self._inactivas = self._inactivas, {}
+        for conexiones in inactivas.values():
+            for conexion, _ in conexiones:
+                conexion.escritor.close()
+
+    def _clave(self, url):
+        """
+        Separa una URL en la clave del host (esquema, host, puerto) y la ruta
+        """
+        partes = urllib.parse.urlsplit(url)
+        if partes.scheme not in ('http', 'https') or not partes.hostname:
+            raise urllib.error.URLError(f"URL no soportada: {url}")
+        puerto = partes.port or (443 if partes.scheme == 'https' else 80)
+        ruta = partes.path or '/'
+        if partes.query:
+            ruta += '?' + partes.query
+        return (partes.scheme, partes.hostname, puerto), ruta
+
+    def _tomar(self, clave):
+        """
+        Devuelve una conexión inactiva vigente del host o None
+        """
+        limite = time.monotonic() - self.tiempo_inactividad
+        conexiones = self._inactivas.get(clave, [])
+        while conexiones:
+            conexion, ultimo_uso = conexiones.pop()
+            if ultimo_uso >= limite and not conexion.lector.at_eof():
+                return conexion
+            conexion.escritor.close()
+        return None
+
+    def _liberar(self, clave, conexion, reutilizable):
+        """
+        Devuelve la conexión al pool o la cierra si no se puede reutilizar
+        """
+        if reutilizable:
+            conexiones = self._inactivas.setdefault(clave, [])
+            if len(conexiones) < self.tamano_pool:
+                conexiones.append((conexion, time.monotonic()))
+                return
+        conexion.escritor.close()
+
+    async def _conectar(self, clave, metricas):
+        """
+        Abre una conexión nueva separando la resolución DNS del resto
+        """
+        esquema, host, puerto = clave
+        bucle = asyncio.get_running_loop()
+
+        inicio = time.perf_counter()
+        destinos = await asyncio.wait_for(
+            bucle.getaddrinfo(host, puerto, type=socket.SOCK_STREAM), self.timeout)
+        if metricas is not None:
+            metricas.sumar('dns', time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        error = None
+        for _, _, _, _, destino in destinos:
+            try:
+                lector, escritor = await asyncio.wait_for(asyncio.open_connection(
+                    destino[0], destino[1],
+                    ssl=self.ssl_context if esquema == 'https' else None,
+                    server_hostname=host if esquema == 'https' else None
+                ), self.timeout)
+                break
+            except OSError as e:
+                error = e
+        else:
+            raise error or OSError(f"No se pudo resolver {host}")
+
+        # Con asyncio el handshake TLS forma parte de open_connection
+        if metricas is not None:
+            metricas.sumar('conexion', time.perf_counter() - inicio)
+            metricas.contar('conexiones_nuevas')
+        return _ConexionAsync(lector, escritor)
+
+    async def _peticion(self, url, headers, metricas):
+        """
+        Envía la petición por una conexión reutilizada o nueva
+
+        Si una conexión reutilizada fue cerrada por el servidor mientras
+        estaba inactiva, reintenta una vez con una conexión nueva.
+        """
+        clave, ruta = self._clave(url)
+        conexion = self._tomar(clave)
+        reutilizada = conexion is not None
+        if reutilizada and metricas is not None:
+            metricas.contar('conexiones_reutilizadas')
+
+        while True:
+            try:
+                if conexion is None:
+                    conexion = await self._conectar(clave, metricas)
+                status, reason, cabeceras, cuerpo, reutilizable = await self._intercambiar(
+                    conexion, clave, ruta, headers, metricas)
+                self._liberar(clave, conexion, reutilizable)
+                return RespuestaAsync(url, status, reason, cabeceras, cuerpo)
+            except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError) as e:
+                if conexion is not None:
+                    conexion.escritor.close()
+                if not reutilizada:
+                    raise urllib.error.URLError(e)
+                conexion, reutilizada = None, False
+            except asyncio.TimeoutError:
+                if conexion is not None:
+                    conexion.escritor.close()
+                raise urllib.error.URLError(f"Timeout de {self.timeout} segundos: {url}")
+            except (OSError, ValueError, asyncio.LimitOverrunError, http.client.HTTPException) as e:
+                if conexion is not None:
+                    conexion.escritor.close()
+                raise urllib.error.URLError(e)
+
+    async def _intercambiar(self, conexion, clave, ruta, headers, metricas):
+        """
+        Escribe la petición y lee la respuesta completa de una conexión
+
+        Returns:
+            tuple: (status, reason, headers, cuerpo, reutilizable)
+        """
+        esquema, host, puerto = clave
+        if puerto != (443 if esquema == 'https' else 80):
+            host = f"{host}:{puerto}"
+
+        lineas = [f"GET {ruta} HTTP/1.1", f"Host: {host}"]
+        lineas += [f"{nombre}: {valor}" for nombre, valor in headers.items()
+                   if nombre.lower() != 'host']
+        inicio = time.perf_counter()
+        conexion.escritor.write(('\r\n'.join(lineas) + '\r\n\r\n').encode('latin-1'))
+        await asyncio.wait_for(conexion.escritor.drain(), self.timeout)
+
+        cabecera = await asyncio.wait_for(conexion.lector.readuntil(b'\r\n\r\n'), self.timeout)
+        if metricas is not None:
+            metricas.sumar('primer_byte', time.perf_counter() - inicio)
+
+        linea_estado, _, resto = cabecera.partition(b'\r\n')
+        version, _, estado = linea_estado.decode('latin-1').partition(' ')
+        codigo, _, reason = estado.partition(' ')
+        if not version.startswith('HTTP/') or not codigo.isdigit():
+            raise http.client.BadStatusLine(linea_estado.decode('latin-1'))
+        status = int(codigo)
+        cabeceras = http.client.parse_headers(io.BytesIO(resto))
+
+        inicio = time.perf_counter()
+        cuerpo, hasta_cierre = await self._leer_cuerpo(conexion.lector, status, cabeceras)
+        if metricas is not None:
+            metricas.sumar('descarga', time.perf_counter() - inicio)
+            metricas.contar('bytes_recibidos', len(cuerpo))
+
+        conexion_header = (cabeceras.get('Connection') or '').lower()
+        if version == 'HTTP/1.0':
+            reutilizable = conexion_header == 'keep-alive'
+        else:
+            reutilizable = conexion_header != 'close'
+        return status, reason, cabeceras, cuerpo, reutilizable and not hasta_cierre
+
+    async def _leer_cuerpo(self, lector, status, cabeceras):
+        """
+        Lee el cuerpo según su delimitación HTTP/1.1
+
+        Returns:
+            tuple: (cuerpo, hasta_cierre) donde hasta_cierre indica que el
+            cuerpo terminaba con el cierre de la conexión
+        """
+        if status < 200 or status in (204, 304):
+            return b'', False
+
+        if 'chunked' in (cabeceras.get('Transfer-Encoding') or '').lower():
+            partes = []
+            while True:
+                linea = await asyncio.wait_for(lector.readuntil(b'\r\n'), self.timeout)
+                tamano = int(linea.split(b';', 1)[0].strip() or b'0', 16)
+                if tamano == 0:
+                    # Trailers opcionales hasta la línea vacía
+                    while await asyncio.wait_for(lector.readuntil(b'\r\n'), self.timeout) != b'\r\n':
+                        pass
+                    return b''.join(partes), False
+                partes.append(await asyncio.wait_for(lector.readexactly(tamano), self.timeout))
+                await asyncio.wait_for(lector.readexactly(2), self.timeout)
+
+        longitud = cabeceras.get('Content-Length')
+        if longitud is not None:
+            return await asyncio.wait_for(lector.readexactly(int(longitud)), self.timeout), False
+
+        return await asyncio.wait_for(lector.read(), self.timeout), True
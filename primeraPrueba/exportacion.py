@@ -0,0 +1,312 @@
+"""
+Exportación de productos extraídos a CSV, JSONL o Parquet
+
+Etapa final del pipeline para ejecuciones largas sin consola: los productos
+se acumulan en lotes y se escriben en bloque, y el archivo rota al superar un
+tamaño máximo, de modo que la memoria no crece con la cantidad exportada.
+
+Características técnicas:
+- CSV y JSONL con librerías estándar; Parquet si pyarrow está instalado
+- Escritura por lotes con buffer (una escritura por lote, no por producto)
+- Rotación de archivos por tamaño (productos-00000.csv, productos-00001.csv...)
+- Selección y orden de columnas; el precio se exporta como decimal exacto y
+  en unidades menores
+- Seguro para usar desde varios hilos (buscar_productos_lote, BusquedaMultitienda)
+
+Uso:
+    python exportacion.py laptop celular --formato jsonl --salida exportes/productos
+    python exportacion.py laptop --formato csv --columnas titulo precio url --max-mb 50
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+# Parquet es opcional: solo se necesita pyarrow si se pide ese formato
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Columnas disponibles, en el orden por defecto
+COLUMNAS = ('id', 'titulo', 'precio', 'precio_unidades_menores', 'moneda', 'url',
+            'imagen', 'vendedor', 'tienda', 'palabra_clave', 'extraido')
+
+_COLUMNAS_ENTERAS = frozenset({'id', 'precio_unidades_menores'})
+
+
+def fila_producto(producto: Dict, **extra) -> Dict:
+    """
+    Aplana un producto en una fila con todas las COLUMNAS
+
+    Args:
+        producto (Dict): Producto del scraper (precio como Precio o None)
+        **extra: Valores de columnas que no vienen en el producto
+            (palabra_clave, tienda...)
+    Returns:
+        Dict: Valores por columna; None donde no hay dato
+    """
+    precio = producto.get('precio')
+    fila = {columna: producto.get(columna) for columna in COLUMNAS}
+    fila.update(extra)
+    fila['precio'] = str(precio.valor) if precio is not None else None
+    fila['precio_unidades_menores'] = precio.unidades_menores if precio is not None else None
+    fila['moneda'] = precio.moneda if precio is not None else fila['moneda']
+    fila['extraido'] = fila['extraido'] or time.strftime('%Y-%m-%dT%H:%M:%S')
+    return fila
+
+
+class _EscritorCSV:
+    """
+    Archivo CSV con encabezado; cada lote se serializa en memoria y se
+    escribe de una vez
+    """
+
+    extension = 'csv'
+
+    def __init__(self, ruta, columnas):
+        self.columnas = columnas
+        self.bytes_escritos = 0
+        self._archivo = open(ruta, 'wb', buffering=1024 * 1024)
+        self.escribir_lote([dict(zip(columnas, columnas))])
+
+    def escribir_lote(self, filas):
+        texto = io.StringIO()
+        escritor = csv.writer(texto, lineterminator='\n')
+        escritor.writerows([['' if fila[columna] is None else fila[columna] for columna in self.columnas]
+                            for fila in filas])
+        datos = texto.getvalue().encode('utf-8')
+        self._archivo.write(datos)
+        self.bytes_escritos += len(datos)
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class _EscritorJSONL:
+    """
+    Un objeto JSON por línea, escrito por lotes
+    """
+
+    extension = 'jsonl'
+
+    def __init__(self, ruta, columnas):
+        self.columnas = columnas
+        self.bytes_escritos = 0
+        self._archivo = open(ruta, 'wb', buffering=1024 * 1024)
+
+    def escribir_lote(self, filas):
+        lineas = [json.dumps({columna: fila[columna] for columna in self.columnas}, ensure_ascii=False)
+                  for fila in filas]
+        datos = ('\n'.join(lineas) + '\n').encode('utf-8')
+        self._archivo.write(datos)
+        self.bytes_escritos += len(datos)
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class _EscritorParquet:
+    """
+    Archivo Parquet con un row group por lote (requiere pyarrow)
+    """
+
+    extension = 'parquet'
+
+    def __init__(self, ruta, columnas):
+        if pyarrow is None:
+            raise ImportError("El formato parquet requiere pyarrow (pip install pyarrow)")
+        self.columnas = columnas
+        self._esquema = pyarrow.schema([
+            (columna, pyarrow.int64() if columna in _COLUMNAS_ENTERAS else pyarrow.string())
+            for columna in columnas
+        ])
+        self._archivo = open(ruta, 'wb')
+        self._escritor = pyarrow.parquet.ParquetWriter(self._archivo, self._esquema, compression='snappy')
+
+    @property
+    def bytes_escritos(self):
+        return self._archivo.tell()
+
+    def escribir_lote(self, filas):
+        tabla = pyarrow.Table.from_pylist(
+            [{columna: fila[columna] for columna in self.columnas} for fila in filas],
+            schema=self._esquema
+        )
+        self._escritor.write_table(tabla)
+
+    def cerrar(self):
+        self._escritor.close()
+        self._archivo.close()
+
+
+_ESCRITORES = {
+    'csv': _EscritorCSV,
+    'jsonl': _EscritorJSONL,
+    'parquet': _EscritorParquet,
+}
+
+
+class ExportadorProductos:
+    """
+    Escribe productos en CSV, JSONL o Parquet por lotes, rotando por tamaño
+
+    Se puede usar como gestor de contexto para vaciar el último lote y
+    cerrar el archivo al terminar.
+
+    Attributes:
+        ruta_base (str): Ruta sin extensión; cada archivo añade '-NNNNN.ext'
+        formato (str): 'csv', 'jsonl' o 'parquet'
+        columnas (List[str]): Columnas exportadas, en orden
+        tamano_lote (int): Productos acumulados antes de escribir
+        max_bytes (int): Tamaño a partir del cual se abre un archivo nuevo
+        archivos (List[str]): Archivos creados hasta el momento
+        exportados (int): Productos escritos en total
+    """
+
+    def __init__(self, ruta_base: str, formato: str = 'jsonl',
+                 columnas: Optional[List[str]] = None, tamano_lote: int = 500,
+                 max_bytes: int = 100 * 1024 * 1024):
+        if formato not in _ESCRITORES:
+            raise ValueError(f"Formato no soportado: '{formato}'. Disponibles: {', '.join(_ESCRITORES)}")
+        columnas = list(columnas or COLUMNAS)
+        desconocidas = [columna for columna in columnas if columna not in COLUMNAS]
+        if desconocidas:
+            raise ValueError(f"Columnas desconocidas: {', '.join(desconocidas)}")
+        if tamano_lote < 1:
+            raise ValueError("tamano_lote debe ser al menos 1")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes debe ser mayor que 0")
+        if formato == 'parquet' and pyarrow is None:
+            raise ImportError("El formato parquet requiere pyarrow (pip install pyarrow)")
+
+        self.ruta_base = ruta_base
+        self.formato = formato
+        self.columnas = columnas
+        self.tamano_lote = tamano_lote
+        self.max_bytes = max_bytes
+        self.archivos = []
+        self.exportados = 0
+
+        self._lote = []
+        self._escritor = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def escribir(self, producto: Dict, **extra):
+        """
+        Añade un producto al lote actual y lo escribe si está lleno
+
+        Args:
+            producto (Dict): Producto del scraper
+            **extra: Columnas adicionales (palabra_clave, tienda...)
+        """
+        fila = fila_producto(producto, **extra)
+        with self._lock:
+            self._lote.append(fila)
+            if len(self._lote) >= self.tamano_lote:
+                self._vaciar()
+
+    def escribir_muchos(self, productos: Iterable[Dict], **extra) -> int:
+        """
+        Añade varios productos (por ejemplo, un generador del scraper)
+
+        Args:
+            productos (Iterable[Dict]): Productos del scraper
+            **extra: Columnas adicionales comunes a todos
+        Returns:
+            int: Productos añadidos
+        """
+        cantidad = 0
+        for producto in productos:
+            self.escribir(producto, **extra)
+            cantidad += 1
+        return cantidad
+
+    def vaciar(self):
+        """
+        Escribe el lote pendiente aunque no esté lleno
+        """
+        with self._lock:
+            self._vaciar()
+
+    def cerrar(self):
+        """
+        Escribe el lote pendiente y cierra el archivo actual
+        """
+        with self._lock:
+            self._vaciar()
+            if self._escritor is not None:
+                self._escritor.cerrar()
+                self._escritor = None
+
+    def _vaciar(self):
+        """
+        Escribe el lote en el archivo actual y rota si superó max_bytes
+        """
+        if not self._lote:
+            return
+        if self._escritor is None:
+            self._abrir_siguiente()
+        self._escritor.escribir_lote(self._lote)
+        self.exportados += len(self._lote)
+        self._lote = []
+
+        if self._escritor.bytes_escritos >= self.max_bytes:
+            self._escritor.cerrar()
+            self._escritor = None
+
+    def _abrir_siguiente(self):
+        """
+        Abre el siguiente archivo de la rotación
+        """
+        clase = _ESCRITORES[self.formato]
+        ruta = f"{self.ruta_base}-{len(self.archivos):05d}.{clase.extension}"
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._escritor = clase(ruta, self.columnas)
+        self.archivos.append(ruta)
+
+
+def main():
+    from producto_Scraper import ScrapingMercadoLibre
+    from cache_respuestas import CacheRespuestas
+
+    parser = argparse.ArgumentParser(description="Exporta productos de MercadoLibre sin salida por consola")
+    parser.add_argument('palabras', nargs='+', help='Términos de búsqueda')
+    parser.add_argument('--formato', choices=list(_ESCRITORES), default='jsonl')
+    parser.add_argument('--salida', default=os.path.join('exportes', 'productos'),
+                        help='Ruta base de los archivos (sin extensión)')
+    parser.add_argument('--columnas', nargs='+', choices=COLUMNAS, default=None)
+    parser.add_argument('--limite', type=int, default=500, help='Productos por término')
+    parser.add_argument('--tamano-lote', type=int, default=500)
+    parser.add_argument('--max-mb', type=float, default=100, help='Tamaño de rotación en MB')
+    args = parser.parse_args()
+
+    scraper = ScrapingMercadoLibre(cache=CacheRespuestas(), usar_fallback=False)
+    with ExportadorProductos(args.salida, args.formato, args.columnas, args.tamano_lote,
+                             int(args.max_mb * 1024 * 1024)) as exportador:
+        for palabra in args.palabras:
+            exportador.escribir_muchos(scraper.iter_productos_paginado(palabra, args.limite),
+                                       palabra_clave=palabra, tienda='mercadolibre')
+    scraper.cerrar()
+
+    print(f"[SUCCESS] {exportador.exportados} productos exportados en {len(exportador.archivos)} archivos")
+    for ruta in exportador.archivos:
+        print(f"   {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Historial de precios de productos extraídos
+
+Cada ejecución del scraper registra los precios observados contra un
+identificador estable del producto (tomado de su URL) y solo escribe una
+observación cuando el precio es nuevo o cambió, en lugar de guardar y
+comparar instantáneas completas.
+
+Características técnicas:
+- Almacenamiento en SQLite (solo librerías estándar)
+- ID estable desde la URL: MCO-123456 (MercadoLibre) o AMZN-B0XXXXXXXX (Amazon /dp/ASIN)
+- Upserts por lotes: una consulta IN por lote para conocer el último precio
+  y un executemany para los cambios, todo en una transacción
+- Índices para el historial de un producto y las mayores bajadas del día
+- Seguro para usar desde varios hilos
+
+Uso:
+    python historial_precios.py laptop celular
+"""
+
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from precios import Precio
+
+# Publicación de MercadoLibre elegida dentro de un catálogo: ?wid=MCO123456789
+_PATRON_WID_ML = re.compile(r'\b(?:wid|item_id)=(M[A-Z]{2})-?(\d{5,})')
+# Publicación de MercadoLibre en la ruta: /MCO-123456789-titulo-_JM
+_PATRON_ITEM_ML = re.compile(r'/(M[A-Z]{2})-(\d{5,})')
+# Producto de catálogo de MercadoLibre: /p/MCO123456
+_PATRON_CATALOGO_ML = re.compile(r'/p/(M[A-Z]{2}\d{5,})')
+# ASIN de Amazon: /dp/B0XXXXXXXX o /gp/product/B0XXXXXXXX
+_PATRON_ASIN = re.compile(r'/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?=[/?&#]|$)')
+
+
+def id_producto_desde_url(url: Optional[str]) -> Optional[str]:
+    """
+    Obtiene un identificador estable del producto a partir de su URL
+
+    Se ignoran el título en la ruta, los parámetros de seguimiento y los
+    redireccionamientos de anuncios (la URL destino viene codificada).
+
+    Args:
+        url (Optional[str]): URL del listado
+
+    Returns:
+        Optional[str]: 'MCO-123456789' (publicación), 'MCO123456' (catálogo,
+        sin guion para no chocar con publicaciones), 'AMZN-B0XXXXXXXX' o
+        None si la URL no identifica un producto conocido
+    """
+    if not url:
+        return None
+    texto = urllib.parse.unquote(url)
+
+    coincidencia = _PATRON_WID_ML.search(texto) or _PATRON_ITEM_ML.search(texto)
+    if coincidencia:
+        return f"{coincidencia.group(1)}-{coincidencia.group(2)}"
+
+    coincidencia = _PATRON_CATALOGO_ML.search(texto)
+    if coincidencia:
+        return coincidencia.group(1)
+
+    coincidencia = _PATRON_ASIN.search(texto)
+    if coincidencia:
+        return f"AMZN-{coincidencia.group(1)}"
+    return None
+
+
+class CambioPrecio(NamedTuple):
+    """
+    Precio nuevo o modificado de un producto
+
+    Attributes:
+        id_producto (str): Identificador estable del producto
+        titulo (str): Último título conocido
+        url (Optional[str]): Último enlace conocido
+        anterior (Optional[Precio]): Precio previo (None si el producto es nuevo)
+        actual (Precio): Precio observado
+    """
+    id_producto: str
+    titulo: str
+    url: Optional[str]
+    anterior: Optional[Precio]
+    actual: Precio
+
+    @property
+    def variacion(self) -> Optional[int]:
+        """
+        Diferencia en unidades menores (negativa si bajó); None si no es comparable
+        """
+        if self.anterior is None or self.anterior.moneda != self.actual.moneda:
+            return None
+        return self.actual.unidades_menores - self.anterior.unidades_menores
+
+    @property
+    def porcentaje(self) -> Optional[float]:
+        """
+        Variación relativa respecto al precio anterior, en porcentaje
+        """
+        variacion = self.variacion
+        if variacion is None or not self.anterior.unidades_menores:
+            return None
+        return 100.0 * variacion / self.anterior.unidades_menores
+
+
+class HistorialPrecios:
+    """
+    Historial de precios persistido en SQLite
+
+    Attributes:
+        ruta (str): Archivo SQLite (':memory:' para un historial temporal)
+        tamano_lote (int): Productos por consulta y escritura en bloque
+    """
+
+    def __init__(self, ruta: str = 'historial_precios.db', tamano_lote: int = 500):
+        if tamano_lote < 1:
+            raise ValueError("tamano_lote debe ser al menos 1")
+        self.ruta = ruta
+        self.tamano_lote = tamano_lote
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.executescript('''
+            CREATE TABLE IF NOT EXISTS productos (
+                id_producto TEXT PRIMARY KEY,
+                tienda TEXT,
+                titulo TEXT NOT NULL,
+                url TEXT,
+                precio INTEGER NOT NULL,
+                moneda TEXT NOT NULL,
+                primera_vez REAL NOT NULL,
+                actualizado REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS observaciones (
+                id_producto TEXT NOT NULL,
+                observado REAL NOT NULL,
+                dia TEXT NOT NULL,
+                precio INTEGER NOT NULL,
+                moneda TEXT NOT NULL,
+                variacion INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_observaciones_producto
+                ON observaciones (id_producto, observado);
+            CREATE INDEX IF NOT EXISTS idx_observaciones_bajadas
+                ON observaciones (dia, variacion);
+        ''')
+
+    def registrar(self, productos: Iterable[Dict], tienda: Optional[str] = None) -> List[CambioPrecio]:
+        """
+        Registra los precios observados y devuelve solo los nuevos o cambiados
+
+        Los productos sin precio o cuya URL no identifica el producto se
+        ignoran; si un mismo producto aparece varias veces, cuenta la última.
+
+        Args:
+            productos (Iterable[Dict]): Productos del scraper (precio como Precio)
+            tienda (Optional[str]): Tienda de origen; si se omite se usa la
+                clave 'tienda' de cada producto
+
+        Returns:
+            List[CambioPrecio]: Cambios escritos en el historial
+        """
+        vigentes = {}
+        for producto in productos:
+            id_producto = id_producto_desde_url(producto.get('url'))
+            if id_producto is not None and producto.get('precio') is not None:
+                vigentes[id_producto] = producto
+        if not vigentes:
+            return []
+
+        ahora = time.time()
+        dia = time.strftime('%Y-%m-%d', time.localtime(ahora))
+        ids = list(vigentes)
+        cambios = []
+        with self._lock:
+            with self._conexion:
+                for inicio in range(0, len(ids), self.tamano_lote):
+                    lote = ids[inicio:inicio + self.tamano_lote]
+                    cambios.extend(self._registrar_lote(lote, vigentes, tienda, ahora, dia))
+        return cambios
+
+    def historial(self, id_producto: str) -> List[Tuple[float, Precio]]:
+        """
+        Precios registrados de un producto, del más antiguo al más reciente
+
+        Args:
+            id_producto (str): Identificador devuelto por id_producto_desde_url
+
+        Returns:
+            List[Tuple[float, Precio]]: Momento de la observación (epoch) y precio
+        """
+        with self._lock:
+            filas = self._conexion.execute(
+                'SELECT observado, precio, moneda FROM observaciones '
+                'WHERE id_producto = ? ORDER BY observado',
+                (id_producto,)
+            ).fetchall()
+        return [(observado, Precio(precio, moneda)) for observado, precio, moneda in filas]
+
+    def mayores_bajadas(self, limite: int = 10, dia: Optional[str] = None) -> List[CambioPrecio]:
+        """
+        Productos cuyo precio más bajó en un día (en unidades menores)
+
+        Args:
+            limite (int): Número máximo de resultados
+            dia (Optional[str]): Fecha 'AAAA-MM-DD'; por defecto hoy
+
+        Returns:
+            List[CambioPrecio]: Bajadas ordenadas de mayor a menor
+        """
+        dia = dia or time.strftime('%Y-%m-%d')
+        with self._lock:
+            filas = self._conexion.execute(
+                'SELECT o.id_producto, p.titulo, p.url, o.precio - o.variacion, o.precio, o.moneda '
+                'FROM observaciones o JOIN productos p ON p.id_producto = o.id_producto '
+                'WHERE o.dia = ? AND o.variacion < 0 ORDER BY o.variacion LIMIT ?',
+                (dia, limite)
+            ).fetchall()
+        return [CambioPrecio(id_producto, titulo, url, Precio(anterior, moneda), Precio(actual, moneda))
+                for id_producto, titulo, url, anterior, actual, moneda in filas]
+
+    def cerrar(self):
+        """
+        Cierra la conexión con la base de datos
+        """
+        with self._lock:
+            self._conexion.close()
+
+    def _registrar_lote(self, ids, vigentes, tienda, ahora, dia):
+        """
+        Compara un lote con el último precio guardado y escribe los cambios
+        """
+        marcadores = ','.join('?' * len(ids))
+        conocidos = {
+            id_producto: Precio(precio, moneda)
+            for id_producto, precio, moneda in self._conexion.execute(
+                f'SELECT id_producto, precio, moneda FROM productos WHERE id_producto IN ({marcadores})',
+                ids
+            )
+        }
+
+        cambios = []
+        for id_producto in ids:
+            producto = vigentes[id_producto]
+            actual = producto['precio']
+            anterior = conocidos.get(id_producto)
+            if actual != anterior:
+                cambios.append(CambioPrecio(id_producto, producto.get('titulo') or '',
+                                            producto.get('url'), anterior, actual))
+        if not cambios:
+            return cambios
+
+        self._conexion.executemany(
+            'INSERT INTO productos '
+            '(id_producto, tienda, titulo, url, precio, moneda, primera_vez, actualizado) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (id_producto) DO UPDATE SET '
+            'tienda = COALESCE(excluded.tienda, tienda), titulo = excluded.titulo, url = excluded.url, '
+            'precio = excluded.precio, moneda = excluded.moneda, actualizado = excluded.actualizado',
+            [(cambio.id_producto, tienda or vigentes[cambio.id_producto].get('tienda'), cambio.titulo,
+              cambio.url, cambio.actual.unidades_menores, cambio.actual.moneda, ahora, ahora)
+             for cambio in cambios]
+        )
+        self._conexion.executemany(
+            'INSERT INTO observaciones (id_producto, observado, dia, precio, moneda, variacion) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(cambio.id_producto, ahora, dia, cambio.actual.unidades_menores, cambio.actual.moneda,
+              cambio.variacion) for cambio in cambios]
+        )
+        return cambios
+
+
+def main():
+    from producto_Scraper import ScrapingMercadoLibre
+    from cache_respuestas import CacheRespuestas
+
+    palabras = sys.argv[1:] or ['laptop']
+    historial = HistorialPrecios()
+    scraper = ScrapingMercadoLibre(cache=CacheRespuestas(), historial=historial, usar_fallback=False)
+    for palabra in palabras:
+        scraper.buscar_productos_paginado(palabra, limite=200)
+    scraper.cerrar()
+
+    print("\nMAYORES BAJADAS DE HOY")
+    print("-" * 70)
+    bajadas = historial.mayores_bajadas()
+    if not bajadas:
+        print("Sin bajadas registradas hoy")
+    for cambio in bajadas:
+        print(f"{cambio.id_producto}: {cambio.titulo[:40]}")
+        print(f"   {cambio.anterior} -> {cambio.actual} ({cambio.porcentaje:.1f}%)")
+    historial.cerrar()
+
+
+if __name__ == "__main__":
+    main()
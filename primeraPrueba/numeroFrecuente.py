@@ -1,17 +1,865 @@
-# Crea una función llamada numero_mas_frecuente(lista) que reciba una lista de números enteros y 
+# Crea una función llamada numero_mas_frecuente(lista) que reciba una lista de números enteros y
 # devuelva el número que más veces se repite. Si hay más de uno con la misma frecuencia, devuelve el menor.
 
+import heapq
+import math
+import mmap
+import multiprocessing
+import os
+import random
+import sys
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import NamedTuple
+
+# NumPy es opcional: sin él todas las entradas usan la versión en Python puro
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A partir de este tamaño una lista se convierte a arreglo de NumPy
+UMBRAL_NUMPY = 10_000
+# bincount se usa si el rango de valores no supera este múltiplo del tamaño
+# (o RANGO_MINIMO_BINCOUNT); si no, np.unique, que ordena pero no depende del rango
+FACTOR_BINCOUNT = 4
+RANGO_MINIMO_BINCOUNT = 1 << 16
+
+_MASCARA_64 = (1 << 64) - 1
+
 # Solución:
 
-def numero_mas_frecuente(l):
-    return sorted(
-        ((x, l.count(x)) for x in {*l}),
-        key=lambda p: (-p[1], p[0])
-    )[0][0]
+def numero_mas_frecuente(l, usar_numpy=None, aproximado=None):
+    """
+    Número que más se repite; en caso de empate, el menor
+
+    Args:
+        l (iterable): Enteros (lista, tupla o arreglo de NumPy)
+        usar_numpy (Optional[bool]): Forzar (True) o descartar (False) la
+            versión vectorizada; None la elige según el tipo y el tamaño
+        aproximado (Optional[int]): Si se indica, usa FrecuentesAproximados
+            con ese número de contadores: memoria fija y un resultado cuya
+            frecuencia difiere de la moda como mucho en n/(aproximado+1)
+    Returns:
+        int: Valor más frecuente
+    """
+    if aproximado:
+        resumen = FrecuentesAproximados(k=aproximado)
+        resumen.add_many(l)
+        return resumen.mas_frecuente()
+    if usar_numpy is None:
+        usar_numpy = _conviene_numpy(l)
+    if usar_numpy:
+        if np is None:
+            raise ImportError("usar_numpy=True requiere numpy (pip install numpy)")
+        resultado = _mas_frecuente_numpy(l)
+        if resultado is not None:
+            return resultado
+    return _mas_frecuente_python(l)
+
+
+def _mas_frecuente_python(l):
+    """
+    Una pasada para contar (Counter cuenta en C) y otra sobre los valores
+    distintos para elegir: O(n) en lugar de O(n·k) con l.count
+    """
+    conteos = Counter(l)
+    if not conteos:
+        raise ValueError("La lista está vacía")
+    # max con clave (frecuencia, -valor): mayor frecuencia y, a igualdad, menor valor
+    return max(conteos.items(), key=lambda p: (p[1], -p[0]))[0]
+
+
+def _conviene_numpy(l):
+    """
+    La versión vectorizada compensa con arreglos de enteros o listas grandes
+    de enteros (la conversión a arreglo es lineal y se amortiza)
+    """
+    if np is None:
+        return False
+    if isinstance(l, np.ndarray):
+        return l.dtype.kind in 'iu'
+    return isinstance(l, (list, tuple)) and len(l) >= UMBRAL_NUMPY and type(l[0]) is int
+
+
+def _mas_frecuente_numpy(l):
+    """
+    Cuenta con _conteos_ordenados; como los valores salen ordenados, argmax
+    devuelve el primer máximo, que es el menor valor
+
+    Returns:
+        Optional[int]: Valor más frecuente, o None si la entrada no es un
+        arreglo de enteros (por ejemplo, enteros que no caben en 64 bits)
+    """
+    arreglo = np.asarray(l)
+    if arreglo.dtype.kind not in 'iu':
+        return None
+    arreglo = arreglo.ravel()
+    if arreglo.size == 0:
+        raise ValueError("La lista está vacía")
+    valores, conteos = _conteos_ordenados(arreglo)
+    return int(valores[conteos.argmax()])
+
+
+def _conteos_ordenados(arreglo):
+    """
+    Valores distintos de un arreglo de enteros, ordenados, y sus conteos
+
+    bincount sobre los valores desplazados si el rango es denso (lineal,
+    sin ordenar); np.unique si no, que ordena pero no depende del rango.
+    """
+    if arreglo.itemsize < 8:
+        # Con 8-32 bits la resta del mínimo podría desbordar el tipo original
+        arreglo = arreglo.astype(np.int64)
+    minimo = arreglo.min()
+    rango = int(arreglo.max()) - int(minimo) + 1
+    if rango <= max(FACTOR_BINCOUNT * arreglo.size, RANGO_MINIMO_BINCOUNT):
+        conteos = np.bincount((arreglo - minimo).astype(np.intp))
+        presentes = np.flatnonzero(conteos)
+        return presentes.astype(arreglo.dtype) + minimo, conteos[presentes]
+    return np.unique(arreglo, return_counts=True)
+
+
+class FrecuenciaTracker:
+    """
+    Número más frecuente de un flujo que cambia, sin recalcular desde cero
+
+    Agrupa los valores en cubetas por frecuencia (frecuencia -> valores) y
+    recuerda la frecuencia máxima. Cada cubeta tiene además un montículo
+    para saber su menor valor; las entradas obsoletas se descartan al
+    consultar y el montículo se reconstruye si crece demasiado, así que la
+    memoria es proporcional a los valores distintos.
+
+    Costes: add/remove O(log k), mas_frecuente O(log k) amortizado (k =
+    valores distintos en la cubeta máxima, normalmente muy pocos).
+
+    Attributes:
+        total (int): Número de elementos presentes
+    """
+
+    def __init__(self, valores=()):
+        self.total = 0
+        self._conteos = {}
+        self._cubetas = {}
+        self._montones = {}
+        self._maximo = 0
+        self.add_many(valores)
+
+    def __len__(self):
+        return self.total
+
+    def __contains__(self, valor):
+        return valor in self._conteos
+
+    def conteo(self, valor):
+        """
+        Veces que aparece un valor
+        """
+        return self._conteos.get(valor, 0)
+
+    def add(self, valor):
+        """
+        Añade una aparición de 'valor'
+        """
+        anterior = self._conteos.get(valor, 0)
+        self._mover(valor, anterior, anterior + 1)
+        self.total += 1
+
+    def add_many(self, valores):
+        """
+        Añade varias apariciones; cada valor distinto cambia de cubeta una sola vez
+        """
+        for valor, veces in Counter(valores).items():
+            anterior = self._conteos.get(valor, 0)
+            self._mover(valor, anterior, anterior + veces)
+            self.total += veces
+
+    def remove(self, valor):
+        """
+        Quita una aparición de 'valor'
+
+        Raises:
+            ValueError: Si el valor no está presente
+        """
+        anterior = self._conteos.get(valor, 0)
+        if not anterior:
+            raise ValueError(f"{valor!r} no está en el tracker")
+        self._mover(valor, anterior, anterior - 1)
+        self.total -= 1
+
+    def mas_frecuente(self):
+        """
+        Valor con más apariciones; en caso de empate, el menor
+
+        Raises:
+            ValueError: Si no hay elementos
+        """
+        if not self._maximo:
+            raise ValueError("El tracker está vacío")
+        cubeta = self._cubetas[self._maximo]
+        monton = self._montones[self._maximo]
+        while monton[0] not in cubeta:
+            heapq.heappop(monton)
+        return monton[0]
+
+    def frecuencia_maxima(self):
+        """
+        Apariciones del valor más frecuente (0 si está vacío)
+        """
+        return self._maximo
+
+    def _mover(self, valor, anterior, nuevo):
+        """
+        Pasa 'valor' de la cubeta 'anterior' a la cubeta 'nuevo' (0 = ninguna)
+        """
+        if anterior:
+            cubeta = self._cubetas[anterior]
+            cubeta.discard(valor)
+            if not cubeta:
+                del self._cubetas[anterior]
+                del self._montones[anterior]
+        if nuevo:
+            self._conteos[valor] = nuevo
+            cubeta = self._cubetas.setdefault(nuevo, set())
+            cubeta.add(valor)
+            monton = self._montones.setdefault(nuevo, [])
+            heapq.heappush(monton, valor)
+            if len(monton) > 2 * len(cubeta) + 8:
+                # Demasiadas entradas obsoletas: se reconstruye con los valores vigentes
+                monton[:] = cubeta
+                heapq.heapify(monton)
+        else:
+            del self._conteos[valor]
+
+        if nuevo > self._maximo:
+            self._maximo = nuevo
+        # Al quitar de la cubeta máxima el valor baja a la inmediatamente inferior
+        while self._maximo and self._maximo not in self._cubetas:
+            self._maximo -= 1
+
+
+class VentanaFrecuencia:
+    """
+    Número más frecuente entre los últimos 'tamano' valores recibidos
+
+    Cada valor nuevo expulsa al más antiguo cuando la ventana está llena;
+    la memoria es O(tamano) y cada evento cuesta lo mismo que un add y un
+    remove de FrecuenciaTracker.
+    """
+
+    def __init__(self, tamano):
+        if tamano < 1:
+            raise ValueError("tamano debe ser al menos 1")
+        self.tamano = tamano
+        self._valores = deque()
+        self._tracker = FrecuenciaTracker()
+
+    def __len__(self):
+        return len(self._valores)
+
+    def add(self, valor):
+        """
+        Añade un valor y expulsa el más antiguo si la ventana está llena
+        """
+        if len(self._valores) == self.tamano:
+            self._tracker.remove(self._valores.popleft())
+        self._valores.append(valor)
+        self._tracker.add(valor)
+
+    def add_many(self, valores):
+        """
+        Añade varios valores en orden de llegada
+        """
+        for valor in valores:
+            self.add(valor)
+
+    def mas_frecuente(self):
+        """
+        Valor más frecuente de la ventana; en caso de empate, el menor
+        """
+        return self._tracker.mas_frecuente()
+
+
+class VentanaTemporalFrecuencia:
+    """
+    Número más frecuente entre los valores de los últimos 'segundos'
+
+    Guarda (instante, valor) en orden de llegada y expulsa por la izquierda
+    los que salen de la ventana, tanto al añadir como al consultar. Cada
+    evento entra y sale una sola vez (O(1) amortizado); la memoria es la de
+    los eventos dentro de la ventana. Un instante anterior al último
+    recibido se trata como ese último, para que la ventana siga ordenada.
+
+    Attributes:
+        segundos (float): Duración de la ventana
+        reloj (Callable[[], float]): Fuente de tiempo si no se indica el instante
+    """
+
+    def __init__(self, segundos, reloj=time.monotonic):
+        if segundos <= 0:
+            raise ValueError("segundos debe ser mayor que 0")
+        self.segundos = segundos
+        self.reloj = reloj
+        self._eventos = deque()
+        self._tracker = FrecuenciaTracker()
+        self._ultimo = float('-inf')
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def add(self, valor, instante=None):
+        """
+        Añade un valor observado en 'instante' (por defecto, ahora)
+        """
+        instante = self._instante(instante)
+        self._expirar(instante)
+        self._eventos.append((instante, valor))
+        self._tracker.add(valor)
+
+    def add_many(self, valores, instante=None):
+        """
+        Añade varios valores observados en el mismo instante
+        """
+        valores = list(valores)
+        instante = self._instante(instante)
+        self._expirar(instante)
+        self._eventos.extend((instante, valor) for valor in valores)
+        self._tracker.add_many(valores)
+
+    def mas_frecuente(self, instante=None):
+        """
+        Valor más frecuente de la ventana que termina en 'instante' (por
+        defecto, ahora); en caso de empate, el menor
+        """
+        self._expirar(self._instante(instante))
+        return self._tracker.mas_frecuente()
+
+    def _instante(self, instante):
+        instante = self.reloj() if instante is None else instante
+        self._ultimo = max(self._ultimo, instante)
+        return self._ultimo
+
+    def _expirar(self, instante):
+        limite = instante - self.segundos
+        while self._eventos and self._eventos[0][0] <= limite:
+            self._tracker.remove(self._eventos.popleft()[1])
+
+
+class FrecuenciaDecaida:
+    """
+    Número más "caliente" con peso que decae exponencialmente con el tiempo
+
+    Cada aparición pesa 1 en su instante y la mitad cada 'vida_media'. Se
+    usa decaimiento hacia adelante: en lugar de envejecer todos los pesos,
+    cada evento suma exp(λ·(t - t0)), que crece con el tiempo; así los
+    pesos acumulados siguen siendo comparables, solo cambia el valor que se
+    añade y el máximo se actualiza en O(1). Cuando el factor se hace grande
+    se reescala todo a t0 = t (O(k), amortizado) y se descartan los valores
+    cuyo peso real bajó de 'peso_minimo', lo que acota la memoria.
+
+    'instante' puede ser tiempo real o un contador de eventos (vida_media en
+    eventos) si se prefiere decaimiento por número de llegadas.
+
+    Attributes:
+        vida_media (float): Tiempo en el que un peso se reduce a la mitad
+        peso_minimo (float): Peso por debajo del cual un valor se olvida
+        reloj (Callable[[], float]): Fuente de tiempo si no se indica el instante
+    """
+
+    # Exponente a partir del cual se reescalan los pesos (e^40 ≈ 2·10^17)
+    MAXIMO_EXPONENTE = 40.0
+
+    def __init__(self, vida_media, peso_minimo=1e-6, reloj=time.monotonic):
+        if vida_media <= 0:
+            raise ValueError("vida_media debe ser mayor que 0")
+        self.vida_media = vida_media
+        self.peso_minimo = peso_minimo
+        self.reloj = reloj
+        self._lambda = math.log(2) / vida_media
+        self._origen = None
+        self._ultimo = float('-inf')
+        self._pesos = {}
+        self._mejor = None
+
+    def __len__(self):
+        return len(self._pesos)
+
+    def add(self, valor, instante=None):
+        """
+        Añade una aparición de 'valor' en 'instante' (por defecto, ahora)
+        """
+        factor = self._factor(self._instante(instante))
+        peso = self._pesos.get(valor, 0.0) + factor
+        self._pesos[valor] = peso
+        if self._es_mejor(valor, peso, self._mejor):
+            self._mejor = valor
+
+    def add_many(self, valores, instante=None):
+        """
+        Añade varias apariciones en el mismo instante
+        """
+        instante = self._instante(instante)
+        for valor in valores:
+            self.add(valor, instante)
+
+    def mas_frecuente(self):
+        """
+        Valor con mayor peso decaído; en caso de empate, el menor
+
+        El orden entre valores no cambia al pasar el tiempo sin eventos,
+        así que no hace falta indicar instante.
+        """
+        if self._mejor is None:
+            raise ValueError("No hay valores registrados")
+        return self._mejor
+
+    def peso(self, valor, instante=None):
+        """
+        Peso decaído de 'valor' en 'instante' (por defecto, ahora)
+        """
+        if valor not in self._pesos:
+            return 0.0
+        instante = self.reloj() if instante is None else instante
+        return self._pesos[valor] * math.exp(-self._lambda * (instante - self._origen))
+
+    def _instante(self, instante):
+        instante = self.reloj() if instante is None else instante
+        self._ultimo = max(self._ultimo, instante)
+        return self._ultimo
+
+    def _factor(self, instante):
+        if self._origen is None:
+            self._origen = instante
+        exponente = self._lambda * (instante - self._origen)
+        if exponente > self.MAXIMO_EXPONENTE:
+            self._reescalar(instante, math.exp(-exponente))
+            exponente = 0.0
+        return math.exp(exponente)
+
+    def _reescalar(self, instante, escala):
+        """
+        Lleva los pesos a origen 'instante' y olvida los insignificantes
+        """
+        self._origen = instante
+        self._mejor = None
+        pesos = {}
+        for valor, peso in self._pesos.items():
+            peso *= escala
+            if peso < self.peso_minimo:
+                continue
+            pesos[valor] = peso
+            if self._es_mejor(valor, peso, self._mejor, pesos):
+                self._mejor = valor
+        self._pesos = pesos
+
+    def _es_mejor(self, valor, peso, mejor, pesos=None):
+        if mejor is None or valor == mejor:
+            return True
+        peso_mejor = (self._pesos if pesos is None else pesos)[mejor]
+        return peso > peso_mejor or (peso == peso_mejor and valor < mejor)
+
+
+class Estimacion(NamedTuple):
+    """
+    Frecuencia estimada de un valor: la real está en [minimo, maximo]
+    """
+    valor: int
+    minimo: int
+    maximo: int
+
+
+class FrecuentesAproximados:
+    """
+    Valores más frecuentes (heavy hitters) con memoria fija
+
+    Combina dos resúmenes de tamaño constante, independientes del número de
+    valores distintos:
+    - Misra-Gries con k contadores: guarda los candidatos y una cota
+      inferior de su frecuencia. Cada reducción descuenta lo mismo a k+1
+      valores, así que lo descontado en total es como mucho n/(k+1).
+    - Count-Min de 'profundidad' filas x 'ancho' columnas: cota superior de
+      la frecuencia de cualquier valor; sobrestima como mucho ε·n con
+      probabilidad 1-δ (ancho = e/ε, profundidad = ln(1/δ)).
+
+    Cota de error (determinista): si r = mas_frecuente() y m es la moda
+    exacta, f(r) >= f(m) - error_maximo, con error_maximo <= n/(k+1).
+    Cualquier valor con frecuencia mayor que n/(k+1) está entre los
+    candidatos. Con ε pequeño, Count-Min suele dejar el intervalo de cada
+    candidato mucho más estrecho.
+
+    Memoria: k contadores (diccionario) + ancho·profundidad enteros de 8
+    bytes; con los valores por defecto, unos 2 MB.
+
+    Attributes:
+        k (int): Contadores de Misra-Gries (candidatos como máximo)
+        ancho (int): Columnas de Count-Min (potencia de 2 >= e/ε)
+        profundidad (int): Filas de Count-Min
+        total (int): Elementos procesados
+    """
+
+    # Elementos contados juntos en add_many antes de fusionarlos en el resumen
+    TAMANO_BLOQUE = 65536
+
+    def __init__(self, k=1024, epsilon=1e-4, delta=1e-3, semilla=0):
+        if k < 1:
+            raise ValueError("k debe ser al menos 1")
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon y delta deben estar entre 0 y 1")
+        self.k = k
+        self.total = 0
+        self._candidatos = {}
+        self._descontado = 0
+        self._respaldo = None
+
+        bits = max(1, math.ceil(math.log2(math.e / epsilon)))
+        self.ancho = 1 << bits
+        self.profundidad = max(1, math.ceil(math.log(1 / delta)))
+        # Hash multiplicar-desplazar sobre 64 bits: ((a·x + b) mod 2^64) >> (64 - bits)
+        self._desplazamiento = 64 - bits
+        generador = random.Random(semilla)
+        self._hashes = [(generador.getrandbits(64) | 1, generador.getrandbits(64))
+                        for _ in range(self.profundidad)]
+        self._tabla = [array('q', bytes(8 * self.ancho)) for _ in range(self.profundidad)]
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def error_maximo(self):
+        """
+        Máxima diferencia entre la frecuencia del resultado y la de la moda
+        """
+        return self._descontado
+
+    def add(self, valor):
+        """
+        Añade una aparición de 'valor' (Misra-Gries clásico: O(1) amortizado)
+        """
+        self.total += 1
+        self._sumar_count_min(valor, 1)
+        self._respaldo = valor
+        if valor in self._candidatos or len(self._candidatos) < self.k:
+            self._candidatos[valor] = self._candidatos.get(valor, 0) + 1
+            return
+        # Sin hueco: se descuenta 1 a los k candidatos y al valor nuevo
+        self._descontado += 1
+        self._candidatos = {v: c - 1 for v, c in self._candidatos.items() if c > 1}
+
+    def add_many(self, valores):
+        """
+        Añade muchos valores por bloques de TAMANO_BLOQUE
+
+        Cada bloque se cuenta por separado (con NumPy si la entrada es un
+        arreglo de enteros) y se fusiona en el resumen, que nunca supera k
+        candidatos.
+        """
+        if np is not None and isinstance(valores, np.ndarray) and valores.dtype.kind in 'iu':
+            valores = valores.ravel()
+            for inicio in range(0, valores.size, self.TAMANO_BLOQUE):
+                self._fusionar_numpy(valores[inicio:inicio + self.TAMANO_BLOQUE])
+            return
+
+        iterador = iter(valores)
+        while True:
+            bloque = Counter(islice(iterador, self.TAMANO_BLOQUE))
+            if not bloque:
+                return
+            for valor, veces in bloque.items():
+                self._sumar_count_min(valor, veces)
+            self._fusionar(bloque.items(), sum(bloque.values()))
+
+    def estimar(self, valor):
+        """
+        Intervalo en el que está la frecuencia real de 'valor'
+
+        Returns:
+            Estimacion: Cota inferior (Misra-Gries) y superior (la menor entre
+            Count-Min y la inferior más lo descontado)
+        """
+        minimo = self._candidatos.get(valor, 0)
+        maximo = min(self._count_min(valor), minimo + self._descontado)
+        return Estimacion(valor, minimo, maximo)
+
+    def top(self, cantidad=10):
+        """
+        Candidatos más frecuentes por cota superior; empates, el menor valor
+
+        Args:
+            cantidad (int): Número máximo de resultados (como mucho k)
+        Returns:
+            List[Estimacion]: De más a menos frecuente
+        """
+        estimaciones = [self.estimar(valor) for valor in self._candidatos]
+        return heapq.nsmallest(cantidad, estimaciones, key=lambda e: (-e.maximo, e.valor))
+
+    def mas_frecuente(self):
+        """
+        Candidato con la mayor cota superior; en caso de empate, el menor
+
+        Raises:
+            ValueError: Si no se ha añadido ningún valor
+        """
+        if not self.total:
+            raise ValueError("No hay valores registrados")
+        mejores = self.top(1)
+        # Sin candidatos ningún valor supera n/(k+1): cualquiera cumple la cota
+        return mejores[0].valor if mejores else self._respaldo
+
+    def _fusionar(self, conteos, cantidad):
+        """
+        Suma conteos (valor, veces) de un bloque y reduce a k candidatos
+        restando la (k+1)-ésima mayor frecuencia, como en Misra-Gries
+        """
+        self.total += cantidad
+        candidatos = self._candidatos
+        mayor = None
+        for valor, veces in conteos:
+            candidatos[valor] = candidatos.get(valor, 0) + veces
+            if mayor is None or veces > mayor[1]:
+                mayor = (valor, veces)
+        if mayor is not None:
+            self._respaldo = mayor[0]
+        if len(candidatos) <= self.k:
+            return
+        corte = heapq.nlargest(self.k + 1, candidatos.values())[-1]
+        self._descontado += corte
+        self._candidatos = {v: c - corte for v, c in candidatos.items() if c > corte}
+
+    def _fusionar_numpy(self, bloque):
+        """
+        Igual que un bloque de add_many, con np.unique y Count-Min vectorizado
+        """
+        valores, veces = np.unique(bloque, return_counts=True)
+        claves = valores.astype(np.uint64)
+        for (a, b), fila in zip(self._hashes, self._tabla):
+            indices = (np.uint64(a) * claves + np.uint64(b)) >> np.uint64(self._desplazamiento)
+            np.add.at(np.frombuffer(fila, dtype=np.int64), indices.astype(np.intp), veces)
+        self._fusionar(zip(valores.tolist(), veces.tolist()), int(bloque.size))
+
+    def _columnas(self, valor):
+        clave = valor & _MASCARA_64
+        return [((a * clave + b) & _MASCARA_64) >> self._desplazamiento for a, b in self._hashes]
+
+    def _sumar_count_min(self, valor, veces):
+        for fila, columna in zip(self._tabla, self._columnas(valor)):
+            fila[columna] += veces
+
+    def _count_min(self, valor):
+        return min(fila[columna] for fila, columna in zip(self._tabla, self._columnas(valor)))
+
+
+def verificar_aproximacion(valores, tamano_muestra=100_000, semilla=0, **parametros):
+    """
+    Compara el modo aproximado con numero_mas_frecuente sobre una muestra
+
+    Toma una muestra aleatoria (sin reemplazo) de 'valores', calcula la moda
+    exacta y la aproximada y comprueba que todas las estimaciones contienen
+    la frecuencia real y que el resultado cumple la cota de error.
+
+    Args:
+        valores (Sequence[int]): Lista o arreglo completo
+        tamano_muestra (int): Elementos de la muestra
+        semilla (int): Semilla del muestreo
+        **parametros: k, epsilon, delta... de FrecuentesAproximados
+    Returns:
+        dict: exacto, aproximado, coincide, frecuencias de ambos,
+        error_maximo y dentro_de_cota
+    """
+    if len(valores) > tamano_muestra:
+        indices = sorted(random.Random(semilla).sample(range(len(valores)), tamano_muestra))
+        muestra = [int(valores[i]) for i in indices]
+    else:
+        muestra = [int(valor) for valor in valores]
+
+    aproximado = FrecuentesAproximados(**parametros)
+    aproximado.add_many(muestra)
+    conteos = Counter(muestra)
+    exacto = numero_mas_frecuente(muestra, usar_numpy=False)
+    resultado = aproximado.mas_frecuente()
+
+    intervalos_validos = all(e.minimo <= conteos[e.valor] <= e.maximo
+                             for e in aproximado.top(aproximado.k))
+    return {
+        'exacto': exacto,
+        'aproximado': resultado,
+        'coincide': exacto == resultado,
+        'frecuencia_exacta': conteos[exacto],
+        'frecuencia_aproximado': conteos[resultado],
+        'error_maximo': aproximado.error_maximo,
+        'dentro_de_cota': intervalos_validos
+                          and conteos[exacto] - conteos[resultado] <= aproximado.error_maximo,
+    }
+
+
+def numero_mas_frecuente_archivo(origen, procesos=None, tipo='<i8', tamano_bloque=1 << 23):
+    """
+    numero_mas_frecuente sobre un archivo binario o un buffer de enteros
+
+    Un archivo se mapea en memoria (mmap) y se divide en tramos de
+    'tamano_bloque' elementos que cuentan varios procesos a la vez; cada
+    proceso abre su propio mapa, así que no se copian datos entre procesos
+    y el archivo puede ser mayor que la RAM. Un buffer en memoria (bytes,
+    bytearray, memoryview, array('q'), mmap o arreglo de NumPy) se cuenta
+    por tramos con hilos, porque NumPy libera el GIL al ordenar. Hay como mucho dos
+    tramos por trabajador en vuelo, así que los conteos parciales que
+    esperan a ser fusionados no crecen con el tamaño del archivo.
+
+    Los procesos se crean con 'spawn' y no con 'fork': quien llama puede
+    tener hilos en marcha (pools de descarga, el propio NumPy) y un fork
+    copiaría sus locks tomados al proceso hijo.
+
+    Con NumPy cada tramo se cuenta sin crear un int de Python por elemento
+    (_conteos_ordenados) y los conteos parciales, ordenados por valor, se
+    fusionan de forma exacta: el resultado, empate incluido, es el mismo
+    que el de numero_mas_frecuente. Sin NumPy solo se admite int64 nativo
+    y cada tramo se cuenta con Counter.
+
+    Args:
+        origen (str | os.PathLike | buffer): Ruta del archivo o buffer
+        procesos (Optional[int]): Procesos (o hilos, para buffers); por
+            defecto, los núcleos disponibles
+        tipo (str): Tipo de NumPy de cada elemento ('<i8' = int64 little-endian);
+            se ignora si 'origen' ya es un arreglo de NumPy
+        tamano_bloque (int): Elementos por tramo (8M int64 = 64 MB)
+    Returns:
+        int: Valor más frecuente
+    """
+    if tamano_bloque < 1:
+        raise ValueError("tamano_bloque debe ser al menos 1")
+    if np is not None and isinstance(origen, np.ndarray):
+        tipo = origen.dtype.str
+        origen = np.ascontiguousarray(origen).ravel()
+    if np is None:
+        if tipo not in ('<i8', '=i8') or sys.byteorder != 'little':
+            raise ImportError(f"El tipo {tipo!r} requiere numpy (pip install numpy)")
+        tamano_elemento = 8
+    else:
+        if np.dtype(tipo).kind not in 'iu':
+            raise ValueError(f"El tipo {tipo!r} no es entero")
+        tamano_elemento = np.dtype(tipo).itemsize
+
+    es_ruta = isinstance(origen, (str, os.PathLike))
+    if es_ruta:
+        origen = os.fspath(origen)
+        tamano = os.path.getsize(origen)
+    else:
+        with memoryview(origen) as vista:
+            tamano = vista.nbytes
+    if tamano % tamano_elemento:
+        raise ValueError(f"El tamaño ({tamano} bytes) no es múltiplo de {tamano_elemento}")
+    elementos = tamano // tamano_elemento
+    if not elementos:
+        raise ValueError("La lista está vacía")
+
+    inicios = range(0, elementos, tamano_bloque)
+    cantidades = [min(tamano_bloque, elementos - inicio) for inicio in inicios]
+    trabajadores = min(procesos or os.cpu_count() or 1, len(cantidades))
+    if es_ruta:
+        executor = ProcessPoolExecutor(trabajadores, mp_context=multiprocessing.get_context('spawn'))
+        contar = partial(_contar_tramo_archivo, origen, tipo)
+    else:
+        executor = ThreadPoolExecutor(trabajadores)
+        contar = partial(_contar_tramo_buffer, origen, tipo)
+
+    with executor:
+        parciales = _mapear_acotado(executor, contar, zip(inicios, cantidades), 2 * trabajadores)
+        if np is None:
+            total = Counter()
+            for parcial in parciales:
+                total.update(parcial)
+            return max(total.items(), key=lambda p: (p[1], -p[0]))[0]
+        valores, conteos = _fusionar_parciales(parciales)
+    return int(valores[conteos.argmax()])
+
+
+def _mapear_acotado(executor, funcion, argumentos, en_vuelo):
+    """
+    Como executor.map, en orden, pero sin enviar más de 'en_vuelo' tareas
+    por delante del resultado que se está consumiendo
+    """
+    pendientes = deque()
+    for args in argumentos:
+        if len(pendientes) >= en_vuelo:
+            yield pendientes.popleft().result()
+        pendientes.append(executor.submit(funcion, *args))
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def _contar_tramo_archivo(ruta, tipo, inicio, cantidad):
+    """
+    Cuenta 'cantidad' elementos desde 'inicio' de un archivo (en otro proceso)
+    """
+    with open(ruta, 'rb') as archivo, mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        return _contar_tramo_buffer(mapa, tipo, inicio, cantidad)
+
+
+def _contar_tramo_buffer(buffer, tipo, inicio, cantidad):
+    """
+    Cuenta un tramo de un buffer: (valores, conteos) ordenados con NumPy,
+    Counter sin él. No deja vistas abiertas sobre el buffer (un mmap no se
+    puede cerrar mientras las tenga). Un buffer con formato propio
+    (array('q'), memoryview tipada) se recorre como bytes, igual que con
+    np.frombuffer.
+    """
+    if np is None:
+        with memoryview(buffer) as vista, vista.cast('B') as octetos, \
+                octetos[inicio * 8:(inicio + cantidad) * 8] as tramo, tramo.cast('q') as enteros:
+            return Counter(enteros)
+    arreglo = np.frombuffer(buffer, dtype=tipo, count=cantidad, offset=inicio * np.dtype(tipo).itemsize)
+    # Los resultados son arreglos nuevos; la vista se libera al salir
+    return _conteos_ordenados(arreglo)
+
+
+def _fusionar_parciales(parciales):
+    """
+    Suma los conteos (valores, conteos) de todos los tramos
+
+    Se fusiona cuando lo pendiente supera al doble de lo acumulado: cada
+    valor se vuelve a fusionar O(log tramos) veces como máximo y en memoria
+    hay, como mucho, unas tres veces los valores distintos.
+    """
+    acumulado = None
+    pendientes = []
+    tamano_pendiente = 0
+    for parcial in parciales:
+        if acumulado is None:
+            acumulado = parcial
+            continue
+        pendientes.append(parcial)
+        tamano_pendiente += len(parcial[0])
+        if tamano_pendiente > 2 * len(acumulado[0]):
+            acumulado = _fusionar_ordenados([acumulado] + pendientes)
+            pendientes = []
+            tamano_pendiente = 0
+    if pendientes:
+        acumulado = _fusionar_ordenados([acumulado] + pendientes)
+    return acumulado
+
+
+def _fusionar_ordenados(partes):
+    """
+    Fusiona listas (valores, conteos) ya ordenadas sumando los valores repetidos
+
+    argsort estable aprovecha que cada parte ya viene ordenada.
+    """
+    valores = np.concatenate([parte[0] for parte in partes])
+    conteos = np.concatenate([parte[1] for parte in partes])
+    orden = np.argsort(valores, kind='stable')
+    valores = valores[orden]
+    conteos = conteos[orden]
+    inicios = np.flatnonzero(np.concatenate(([True], valores[1:] != valores[:-1])))
+    return valores[inicios], np.add.reduceat(conteos, inicios)
+
 
 # Para este primer ejercicio incluí un bloque if __name__ == "__main__" simplemente para poder probar la función de forma directa desde la terminal.
 # Esto me permite imprimir un ejemplo y verificar que el resultado sea el esperado, sin que se ejecute nada si en algún momento quisiera importar la función desde otro archivo.
-# También traté de salirme un poco de lo común: en lugar de usar Counter o un diccionario, decidí trabajar con comprensión de listas y sorted() con doble criterio (primero por frecuencia descendente y luego por valor ascendente en caso de empate).
+# La primera versión usaba sorted() con doble criterio y l.count por cada valor distinto (O(n·k)); con listas de millones
+# de enteros no terminaba. Ahora se cuenta una sola vez y se conserva el mismo criterio: mayor frecuencia y, si empatan, el menor.
 
 if __name__ == "__main__":
     muestra1 = [1, 3, 1, 3, 2, 1]
@@ -21,7 +869,20 @@ if __name__ == "__main__":
     muestra2 = [4, 4, 5, 5]
     print("Resultado esperado: 4")
     print("Resultado obtenido:", numero_mas_frecuente(muestra2))
-    
+
+    # Flujo: la moda se actualiza con cada valor que entra o sale
+    tracker = FrecuenciaTracker(muestra1)
+    tracker.remove(1)
+    tracker.add(3)
+    print("Resultado esperado: 3")
+    print("Resultado obtenido:", tracker.mas_frecuente())
+
+    # Ventana con los 3 últimos valores de muestra1: [3, 2, 1]
+    ventana = VentanaFrecuencia(3)
+    ventana.add_many(muestra1)
+    print("Resultado esperado: 1")
+    print("Resultado obtenido:", ventana.mas_frecuente())
+
 #Resultado
 
 # # Resultado esperado: 1
@@ -29,4 +890,4 @@ if __name__ == "__main__":
 # # Resultado esperado: 4
 # # Resultado obtenido: 4
 
-# Sergio Alejandro Quiroga
\ No newline at end of file
+# Sergio Alejandro Quiroga
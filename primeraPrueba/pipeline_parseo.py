@@ -0,0 +1,363 @@
+"""
+Pipeline de descarga y extracción en procesos separados para crawls grandes
+
+La extracción de productos es trabajo de CPU que retiene el GIL:
+con el pool de hilos de buscar_productos_lote todas las páginas se
+procesan en un solo núcleo. Aquí los hilos de E/S solo descargan y
+descomprimen, dejan los bytes de cada página en una cola acotada y un
+ProcessPoolExecutor decodifica y extrae en todos los núcleos.
+
+Características técnicas:
+- Contrapresión: si los procesos no dan abasto la cola se llena y los hilos
+  de descarga esperan, sin acumular páginas en memoria
+- Extracciones en vuelo acotadas (2 por proceso) para no desbordar el pool
+- Resultados en el orden de las tareas u ordenados por finalización
+- Caché, limitador por host, reintentos y métricas del scraper compartidos
+- Procesos con contexto 'spawn': no se hace fork de un proceso con hilos
+
+Uso:
+    python pipeline_parseo.py laptop celular televisor --limite 200 --procesos 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, NamedTuple, Optional
+
+from producto_Scraper import MetricasBusqueda, Producto, ScrapingMercadoLibre
+
+# Extractor de cada proceso del pool, creado una vez por _iniciar_proceso
+_EXTRACTOR = None
+
+
+def _iniciar_proceso(base_url, moneda):
+    """
+    Prepara en cada proceso el scraper usado solo para extraer
+    """
+    global _EXTRACTOR
+    _EXTRACTOR = ScrapingMercadoLibre(base_url=base_url, usar_fallback=False)
+    _EXTRACTOR.moneda = moneda
+
+
+def _parsear_pagina(datos, limite):
+    """
+    Decodifica y extrae los productos de una página (se ejecuta en otro proceso)
+
+    Args:
+        datos (bytes): HTML en UTF-8
+        limite (int): Número máximo de productos de la página
+    Returns:
+        tuple: Campos de cada producto, segundos de decodificación y de extracción
+    """
+    inicio = time.perf_counter()
+    html_content = datos.decode('utf-8', errors='ignore')
+    decodificado = time.perf_counter()
+    campos = list(_EXTRACTOR.extraer_productos(html_content, limite))
+    return campos, decodificado - inicio, time.perf_counter() - decodificado
+
+
+class ResultadoPagina(NamedTuple):
+    """
+    Productos extraídos de una página del listado
+
+    Attributes:
+        palabra_clave (str): Término buscado
+        termino (int): Posición del término en la lista buscada (distingue
+            los términos repetidos)
+        desde (int): Posición del primer producto de la página (1, 51, 101...)
+        productos (List[Producto]): Productos con id igual a su posición en el listado
+        error (Optional[str]): Motivo si la descarga o la extracción falló
+        metricas (MetricasBusqueda): Tiempos de la página
+    """
+    palabra_clave: str
+    termino: int
+    desde: int
+    productos: List[Producto]
+    error: Optional[str]
+    metricas: MetricasBusqueda
+
+
+class PipelineParseo:
+    """
+    Descarga con hilos y extrae con procesos, con una cola acotada entre medias
+
+    Se puede usar como gestor de contexto para cerrar el pool de procesos.
+
+    Attributes:
+        scraper (ScrapingMercadoLibre): Aporta URL, caché, limitador y reintentos
+        hilos_descarga (int): Descargas simultáneas
+        procesos (int): Procesos de extracción
+        max_pendientes (int): Páginas descargadas que pueden esperar en la cola
+        ordenado (bool): Entregar los resultados en el orden de las tareas;
+            False los entrega según terminan
+    """
+
+    def __init__(self, scraper: Optional[ScrapingMercadoLibre] = None, hilos_descarga: int = 8,
+                 procesos: Optional[int] = None, max_pendientes: int = 32, ordenado: bool = True,
+                 peticiones_por_segundo: Optional[float] = None):
+        procesos = procesos or os.cpu_count() or 1
+        if hilos_descarga < 1:
+            raise ValueError("hilos_descarga debe ser al menos 1")
+        if procesos < 1:
+            raise ValueError("procesos debe ser al menos 1")
+        if max_pendientes < 1:
+            raise ValueError("max_pendientes debe ser al menos 1")
+
+        self.scraper = scraper or ScrapingMercadoLibre(usar_fallback=False)
+        self.hilos_descarga = hilos_descarga
+        self.procesos = procesos
+        self.max_pendientes = max_pendientes
+        self.ordenado = ordenado
+        self.limitador = self.scraper.limitador_para(peticiones_por_segundo)
+
+        self._max_en_proceso = 2 * procesos
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        """
+        Termina los procesos de extracción
+        """
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def procesar(self, palabras: List[str], limite: int = 50) -> Iterator[ResultadoPagina]:
+        """
+        Descarga y extrae todas las páginas necesarias para cada término
+
+        Como en la búsqueda paginada del scraper, una página sin productos
+        marca el fin del listado de su término: las páginas siguientes ya no
+        se descargan ni se mandan a extraer, y en modo ordenado tampoco se
+        entregan. En modo desordenado pueden llegar páginas posteriores que
+        ya estaban en curso.
+
+        Args:
+            palabras (List[str]): Términos de búsqueda
+            limite (int): Número máximo de productos por término
+
+        Yields:
+            ResultadoPagina: Una por página, en el orden de las tareas si
+            'ordenado' está activo o según terminan si no
+        """
+        if limite < 1:
+            raise ValueError("limite debe ser al menos 1")
+        por_pagina = self.scraper.PRODUCTOS_POR_PAGINA
+        tareas = [(termino, palabra, desde) for termino, palabra in enumerate(palabras)
+                  for desde in range(1, limite + 1, por_pagina)]
+        if not tareas:
+            return
+
+        executor = self._pool()
+        cola = queue.Queue(maxsize=self.max_pendientes)
+        parar = threading.Event()
+        estado = {'siguiente': 0, 'proximo': 0}
+        condicion = threading.Condition()
+        # Término -> 'desde' de su primera página sin productos
+        fin_listado = {}
+
+        def descartada(indice):
+            termino, _, desde = tareas[indice]
+            return desde > fin_listado.get(termino, desde)
+
+        # En modo ordenado, ninguna descarga se adelanta más de 'ventana'
+        # tareas a la próxima que se debe entregar: acota el buffer de reorden
+        ventana = self.max_pendientes + self._max_en_proceso + self.hilos_descarga
+
+        def descargar():
+            while not parar.is_set():
+                with condicion:
+                    indice = estado['siguiente']
+                    if indice >= len(tareas):
+                        return
+                    estado['siguiente'] += 1
+                    while (self.ordenado and not parar.is_set()
+                           and indice >= estado['proximo'] + ventana):
+                        condicion.wait(0.2)
+                    saltar = descartada(indice)
+                _, palabra, desde = tareas[indice]
+                if saltar:
+                    datos, error, metricas = None, None, None
+                else:
+                    url = self.scraper.construir_url(palabra, desde)
+                    metricas = MetricasBusqueda(palabra, url)
+                    try:
+                        datos, error = self.scraper.descargar_bytes(url, self.limitador, metricas), None
+                    except Exception as e:
+                        datos, error = None, e
+                while not parar.is_set():
+                    try:
+                        cola.put((indice, datos, error, metricas), timeout=0.2)
+                        break
+                    except queue.Full:
+                        continue
+
+        hilos = [threading.Thread(target=descargar, daemon=True)
+                 for _ in range(min(self.hilos_descarga, len(tareas)))]
+        for hilo in hilos:
+            hilo.start()
+        print(f"[INFO] Pipeline: {len(tareas)} páginas, {len(hilos)} hilos de descarga, "
+              f"{self.procesos} procesos de extracción")
+
+        pendientes = {}
+        listos = {}
+        recibidas = 0
+        entregadas = 0
+        try:
+            while entregadas < len(tareas):
+                completados = []
+                while recibidas < len(tareas) and len(pendientes) < self._max_en_proceso:
+                    try:
+                        # Sin extracciones en curso no hay nada más que esperar
+                        indice, datos, error, metricas = cola.get(block=not pendientes)
+                    except queue.Empty:
+                        break
+                    recibidas += 1
+                    _, _, desde = tareas[indice]
+                    if metricas is None or descartada(indice):
+                        # Página posterior al fin del listado: no se extrae
+                        completados.append((indice, None))
+                        continue
+                    if error is not None:
+                        completados.append((indice, self._resultado_error(tareas[indice], error, metricas)))
+                        continue
+                    limite_pagina = min(por_pagina, limite - desde + 1)
+                    pendientes[executor.submit(_parsear_pagina, datos, limite_pagina)] = (indice, metricas)
+
+                if pendientes:
+                    hechos, _ = wait(pendientes, timeout=0.05 if recibidas < len(tareas) else None,
+                                     return_when=FIRST_COMPLETED)
+                    for futuro in hechos:
+                        indice, metricas = pendientes.pop(futuro)
+                        resultado = self._resultado(tareas[indice], futuro, metricas)
+                        if resultado.error is None and not resultado.productos:
+                            with condicion:
+                                fin_listado[resultado.termino] = min(
+                                    resultado.desde, fin_listado.get(resultado.termino, resultado.desde))
+                        completados.append((indice, resultado))
+
+                for indice, resultado in completados:
+                    if not self.ordenado:
+                        entregadas += 1
+                        if resultado is not None:
+                            yield resultado
+                        continue
+                    listos[indice] = resultado
+                while estado['proximo'] in listos:
+                    indice = estado['proximo']
+                    resultado = listos.pop(indice)
+                    with condicion:
+                        estado['proximo'] += 1
+                        condicion.notify_all()
+                    entregadas += 1
+                    # Las que terminaron antes de conocerse el fin del listado
+                    if resultado is not None and not descartada(indice):
+                        yield resultado
+        finally:
+            parar.set()
+            with condicion:
+                condicion.notify_all()
+            for futuro in pendientes:
+                futuro.cancel()
+            for hilo in hilos:
+                hilo.join()
+
+    def buscar_lote(self, palabras: List[str], limite: int = 50) -> List[List[Producto]]:
+        """
+        Equivalente a buscar_productos_lote con la extracción en procesos
+
+        Args:
+            palabras (List[str]): Términos de búsqueda
+            limite (int): Número máximo de productos por término
+
+        Returns:
+            List[List[Producto]]: Productos de cada término, en el mismo
+            orden que 'palabras' (un término repetido tiene su propia lista)
+            y en el orden del listado hasta su primera página sin productos
+        """
+        palabras = list(palabras)
+        paginas = [[] for _ in palabras]
+        for resultado in self.procesar(palabras, limite):
+            paginas[resultado.termino].append(resultado)
+
+        productos = []
+        for resultados in paginas:
+            encontrados = []
+            for resultado in sorted(resultados, key=lambda resultado: resultado.desde):
+                if resultado.error is None and not resultado.productos:
+                    break
+                encontrados.extend(resultado.productos)
+            productos.append(encontrados[:limite])
+        return productos
+
+    def _pool(self):
+        """
+        Crea el pool de procesos la primera vez que se necesita
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.procesos,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_iniciar_proceso,
+                initargs=(self.scraper.base_url, self.scraper.moneda)
+            )
+        return self._executor
+
+    def _resultado(self, tarea, futuro, metricas):
+        """
+        Convierte la extracción terminada de una página en ResultadoPagina
+        """
+        termino, palabra, desde = tarea
+        try:
+            campos, decodificacion, patron = futuro.result()
+        except Exception as e:
+            return self._resultado_error(tarea, e, metricas)
+        metricas.sumar('decodificacion', decodificacion)
+        metricas.sumar('patron', patron)
+        metricas.contar('productos', len(campos))
+        productos = [{'id': desde + posicion, **producto} for posicion, producto in enumerate(campos)]
+        self.scraper.reportar_metricas(metricas)
+        return ResultadoPagina(palabra, termino, desde, productos, None, metricas)
+
+    def _resultado_error(self, tarea, error, metricas):
+        """
+        ResultadoPagina vacío para una página que no se pudo descargar o extraer
+        """
+        termino, palabra, desde = tarea
+        print(f"[ERROR] '{palabra}' desde {desde}: {error}")
+        self.scraper.reportar_metricas(metricas)
+        return ResultadoPagina(palabra, termino, desde, [], str(error), metricas)
+
+
+def main():
+    from cache_respuestas import CacheRespuestas
+
+    parser = argparse.ArgumentParser(description="Crawl de MercadoLibre con extracción en varios procesos")
+    parser.add_argument('palabras', nargs='+', help='Términos de búsqueda')
+    parser.add_argument('--limite', type=int, default=200, help='Productos por término')
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--hilos', type=int, default=8)
+    parser.add_argument('--desordenado', action='store_true', help='Entregar según terminan')
+    args = parser.parse_args()
+
+    scraper = ScrapingMercadoLibre(cache=CacheRespuestas(), usar_fallback=False)
+    inicio = time.perf_counter()
+    total = 0
+    with PipelineParseo(scraper, args.hilos, args.procesos, ordenado=not args.desordenado) as pipeline:
+        for resultado in pipeline.procesar(args.palabras, args.limite):
+            total += len(resultado.productos)
+    scraper.cerrar()
+    print(f"\n[SUCCESS] {total} productos en {time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Precios estructurados para los productos extraídos
+
+Características técnicas:
+- Importe entero en unidades menores (centavos) más código de moneda ISO 4217
+- Parsing de separadores de miles y decimales según la moneda (COP, USD, ...)
+- Formato de salida compatible con el mostrado por los scrapers ("$1.899.000 COP")
+- Ordenable y comparable sin volver a parsear cadenas (solo dentro de una moneda)
+"""
+
+import re
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+
+class FormatoMoneda(NamedTuple):
+    """
+    Convenciones de escritura de una moneda
+
+    Attributes:
+        simbolo (str): Símbolo que precede al importe
+        decimales (int): Dígitos de la unidad menor
+        separador_miles (str): Separador de grupos de miles
+        separador_decimal (str): Separador de la parte decimal
+    """
+    simbolo: str
+    decimales: int
+    separador_miles: str
+    separador_decimal: str
+
+
+MONEDAS = {
+    'COP': FormatoMoneda('$', 2, '.', ','),
+    'ARS': FormatoMoneda('$', 2, '.', ','),
+    'CLP': FormatoMoneda('$', 0, '.', ','),
+    'BRL': FormatoMoneda('R$', 2, '.', ','),
+    'EUR': FormatoMoneda('€', 2, '.', ','),
+    'MXN': FormatoMoneda('$', 2, ',', '.'),
+    'USD': FormatoMoneda('$', 2, ',', '.'),
+}
+
+_NO_NUMERICO = re.compile(r'[^\d.,]')
+
+
+class Precio(NamedTuple):
+    """
+    Importe monetario en unidades menores
+
+    Se ordena por importe, así que una lista de precios de la misma moneda
+    se puede ordenar o agregar directamente. Comparar con <, <=, > o >=
+    precios de monedas distintas lanza TypeError: para ordenar resultados
+    de varias tiendas hay que agrupar antes por moneda.
+
+    Attributes:
+        unidades_menores (int): Importe en la unidad menor (centavos)
+        moneda (str): Código ISO 4217
+    """
+    unidades_menores: int
+    moneda: str = 'COP'
+
+    @classmethod
+    def desde_texto(cls, texto: str, moneda: str = 'COP') -> Optional['Precio']:
+        """
+        Interpreta un precio escrito con separadores de miles y decimales
+
+        Los separadores se interpretan con las convenciones de la moneda
+        ("12.50" son 1.250 COP y 12,50 USD). Si aparecen ambos, el último es
+        el decimal. Un separador decimal que se repite o al que siguen más
+        dígitos que los decimales de la moneda no puede serlo y separa miles
+        ("1,299" en COP).
+
+        Args:
+            texto (str): Texto del precio ("$ 1.899.000", "1,299.99", "2.499.")
+            moneda (str): Código de la moneda del sitio
+
+        Returns:
+            Optional[Precio]: Precio o None si el texto no contiene un importe
+        """
+        formato = MONEDAS[moneda]
+        limpio = _NO_NUMERICO.sub('', texto or '').strip('.,')
+        if not limpio or not limpio[0].isdigit():
+            return None
+
+        ultimo_miles = limpio.rfind(formato.separador_miles)
+        ultimo_decimal = limpio.rfind(formato.separador_decimal)
+        if ultimo_miles >= 0 and ultimo_decimal >= 0:
+            separador = limpio[max(ultimo_miles, ultimo_decimal)]
+        elif ultimo_decimal >= 0:
+            separador = formato.separador_decimal
+            partes = limpio.split(separador)
+            if len(partes) > 2 or not 1 <= len(partes[1]) <= max(formato.decimales, 2):
+                separador = None
+        else:
+            separador = None
+
+        if separador is None:
+            entero, fraccion = limpio, ''
+        else:
+            entero, _, fraccion = limpio.rpartition(separador)
+        entero = entero.replace('.', '').replace(',', '')
+
+        # Aritmética entera: redondeo half-up sin límite de precisión
+        fraccion = fraccion.ljust(formato.decimales + 1, '0')
+        menores = int(entero or '0') * 10 ** formato.decimales + int(fraccion[:formato.decimales] or '0')
+        if fraccion[formato.decimales] >= '5':
+            menores += 1
+        return cls(menores, moneda)
+
+    @property
+    def valor(self) -> Decimal:
+        """
+        Importe en la unidad principal de la moneda
+        """
+        return Decimal(self.unidades_menores).scaleb(-MONEDAS[self.moneda].decimales)
+
+    def __str__(self) -> str:
+        """
+        Formato local de la moneda; los decimales se omiten si son cero
+        """
+        formato = MONEDAS[self.moneda]
+        entero, fraccion = divmod(self.unidades_menores, 10 ** formato.decimales)
+        texto = f"{entero:,}".replace(',', formato.separador_miles)
+        if fraccion:
+            texto += f"{formato.separador_decimal}{fraccion:0{formato.decimales}d}"
+        return f"{formato.simbolo}{texto} {self.moneda}"
+
+    def __lt__(self, otro):
+        return self._importes(otro, '<', lambda a, b: a < b)
+
+    def __le__(self, otro):
+        return self._importes(otro, '<=', lambda a, b: a <= b)
+
+    def __gt__(self, otro):
+        return self._importes(otro, '>', lambda a, b: a > b)
+
+    def __ge__(self, otro):
+        return self._importes(otro, '>=', lambda a, b: a >= b)
+
+    def _importes(self, otro, operador, comparar):
+        """
+        Compara los importes de dos precios de la misma moneda
+        """
+        if not isinstance(otro, Precio):
+            return NotImplemented
+        if self.moneda != otro.moneda:
+            raise TypeError(f"No se pueden comparar precios en {self.moneda} y {otro.moneda} "
+                            f"con '{operador}'")
+        return comparar(self.unidades_menores, otro.unidades_menores)
@@ -10,21 +10,716 @@ Características técnicas:
 - Implementación sin dependencias externas (solo librerías estándar)
 - Manejo robusto de errores y excepciones
 - Sistema anti-bloqueo con rotación de User-Agents
-- Simulación de comportamiento humano
+- Límite de peticiones por host (token bucket) con backoff exponencial
 - Sistema de fallback con datos de ejemplo
+- Conexiones keep-alive reutilizadas y descompresión gzip/deflate
+- Backend asyncio opcional para cientos de búsquedas concurrentes
+- Caché local de respuestas con TTL y revalidación condicional
+- Historial de precios opcional que solo escribe precios nuevos o cambiados
+- Métricas de tiempo por etapa (red, decodificación, extracción)
 - Documentación técnica completa
 - Código modular y mantenible
 """
 # Solucion
 # Linea 439 para cambiar el valor de la variable palabra:   palabra = "laptop"
 
-import urllib.request
 import urllib.parse
+import urllib.error
+import http.client
+import asyncio
+import io
 import re
+import zlib
+import codecs
+import html
+import html.entities
+import email.utils
+import socket
 import ssl
 import time
 import random
-from typing import List, Dict, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, closing, nullcontext
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Optional, Tuple
+
+from cache_respuestas import CacheRespuestas
+from cliente_async import ClienteAsync
+from historial_precios import HistorialPrecios
+from precios import MONEDAS, Precio
+
+# Producto extraído: id (int), titulo (str), precio (Precio, o None si la
+# tarjeta no muestra precio) y url, imagen y vendedor (str o None), todos
+# tomados de la misma tarjeta de resultado
+Producto = Dict[str, Any]
+
+# Brotli es opcional: solo se anuncia 'br' si hay un decodificador instalado
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Extracción guiada por literales. Probar un patrón con '[^>]*\bclass="...'
+# en cada '<' del documento es lo que domina el tiempo de extracción, así que
+# las tarjetas de resultado se delimitan con str.find de su clase y, dentro de
+# cada una, cada campo se busca por los literales que lo identifican (su clase
+# CSS, '$' o '<h2'). El patrón del campo solo se prueba anclado en el '<' de
+# la etiqueta que contiene la marca (ver ScrapingMercadoLibre._primer_valor).
+_MARCA_TARJETA = 'ui-search-layout__item'
+_PATRON_TARJETA = re.compile(r'<li\b[^>]*?\bclass="[^"]*?ui-search-layout__item', re.IGNORECASE)
+
+_PATRON_TITULO = re.compile(r"""
+    <(?P<etiqueta>h2|div|span)\b[^>]*?\bclass="[^"]*?ui-search-item__title[^"]*"[^>]*>
+    (?P<titulo>[^<]{15,120})</(?P=etiqueta)>
+""", re.IGNORECASE | re.VERBOSE)
+_PATRON_TITULO_H2 = re.compile(r'<h2\b[^>]*>(?P<titulo>[^<]{15,120})</h2>', re.IGNORECASE)
+# En los enlaces el href precede a class y comprobar la clase con el patrón
+# obliga a recorrer la URL carácter a carácter: se comprueba en sus atributos
+_PATRON_ENLACE = re.compile(r'<a\b([^>]*)>', re.IGNORECASE)
+_CLASE_ENLACE = 'ui-search-link'
+_PATRON_IMAGEN = re.compile(r'<img\b([^>]*?\bclass="[^"]*?ui-search-result-image__element[^"]*"[^>]*)>',
+                            re.IGNORECASE)
+_PATRON_VENDEDOR = re.compile(r"""
+    <(?:p|span)\b[^>]*?\bclass="[^"]*?(?:ui-search-official-store-label|poly-component__seller)[^"]*"[^>]*>
+    ([^<]{1,120})<
+""", re.IGNORECASE | re.VERBOSE)
+# 'price-tag' también aparece en price-tag-fraction: en el contenedor se
+# saltan las etiquetas internas y el '$' hasta la fracción
+_PATRON_PRECIO = re.compile(r"""
+    <(?:span|div)\b[^>]*?\bclass="[^"]*?price-tag[^"]*"[^>]*>(?:\s*(?:<[^>]*>|\$))*\s*
+    (?P<precio>[\d.]+(?:,\d{2})?)
+""", re.IGNORECASE | re.VERBOSE)
+_PATRON_PRECIO_SIGNO = re.compile(r'<span\b[^>]*>\s*\$\s*(?P<precio>[\d.]+(?:,\d{2})?)', re.IGNORECASE)
+
+# Marca literal -> (campo, patrón anclado que lo extrae)
+_CAMPOS_POR_MARCA = {
+    'ui-search-item__title': ('titulo', _PATRON_TITULO),
+    '<h2': ('titulo', _PATRON_TITULO_H2),
+    '<H2': ('titulo', _PATRON_TITULO_H2),
+    'ui-search-link': ('enlace', _PATRON_ENLACE),
+    'ui-search-result-image__element': ('imagen', _PATRON_IMAGEN),
+    'ui-search-official-store-label': ('vendedor', _PATRON_VENDEDOR),
+    'poly-component__seller': ('vendedor', _PATRON_VENDEDOR),
+    'price-tag': ('precio', _PATRON_PRECIO),
+    '$': ('precio', _PATRON_PRECIO_SIGNO),
+}
+_PATRON_MARCAS = re.compile('|'.join(re.escape(marca) for marca in _CAMPOS_POR_MARCA))
+
+# Fuentes (marca, patrón) de cada campo dentro de una tarjeta; el enlace va
+# primero entre las del título porque su atributo title suele ser el primero
+_FUENTES_TITULO = (('ui-search-link', _PATRON_ENLACE), ('ui-search-item__title', _PATRON_TITULO),
+                   ('<h2', _PATRON_TITULO_H2), ('<H2', _PATRON_TITULO_H2))
+_FUENTES_ENLACE = (('ui-search-link', _PATRON_ENLACE),)
+_FUENTES_IMAGEN = (('ui-search-result-image__element', _PATRON_IMAGEN),)
+_FUENTES_VENDEDOR = (('ui-search-official-store-label', _PATRON_VENDEDOR),
+                     ('poly-component__seller', _PATRON_VENDEDOR))
+_FUENTES_PRECIO = (('price-tag', _PATRON_PRECIO), ('$', _PATRON_PRECIO_SIGNO))
+
+# Atributos de las etiquetas <a>/<img> de una tarjeta (href, title, src...)
+_PATRON_ATRIBUTO = re.compile(r'([\w-]+)="([^"]*)"')
+_PREFIJO_VENDEDOR = re.compile(r'^(?:vendido\s+)?por\s+', re.IGNORECASE)
+
+# Normalización de títulos en una pasada. Un tramo de espacios (incluidas las
+# entidades de espacio y las etiquetas intercaladas) se reduce a un espacio;
+# una etiqueta aislada se elimina y una entidad se decodifica. Un espacio
+# simple entre palabras no coincide, así que no paga la llamada de reemplazo.
+# El resultado es el de quitar etiquetas, html.unescape y colapsar espacios;
+# la única diferencia es que una referencia a un código no válido (&#11;) se
+# elimina sin unir los espacios que la rodean.
+# Las entidades de espacio decodifican igual que html.unescape: &emsp;,
+# &#x3000;, etc.; sin ';' solo valen nbsp y las numéricas. Los códigos son los
+# espacios de str.isspace() que html.unescape mantiene como espacio: quedan
+# fuera 0x0B y 0x1C-0x1F (los elimina) y 0x85 (lo convierte en '…')
+_NOMBRES_ESPACIO = sorted((nombre for nombre, valor in html.entities.html5.items() if valor.isspace()),
+                          key=len, reverse=True)
+_CODIGOS_ESPACIO = (0x09, 0x0A, 0x0C, 0x0D, 0x20, 0xA0, 0x1680,
+                    *range(0x2000, 0x200B), 0x2028, 0x2029, 0x202F, 0x205F, 0x3000)
+_ENTIDAD_ESPACIO = (r'&(?:' + '|'.join(map(re.escape, _NOMBRES_ESPACIO))
+                    + r'|\#0*(?:' + '|'.join(map(str, _CODIGOS_ESPACIO)) + r')(?![0-9]);?'
+                    + r'|\#[xX]0*(?i:' + '|'.join(f'{codigo:x}' for codigo in _CODIGOS_ESPACIO)
+                    + r')(?![0-9a-fA-F]);?)')
+_PATRON_NORMALIZAR = re.compile(rf"""
+    (?P<espacio>(?!\x20(?![\s<&]))(?:<[^>]+>)*(?:\s|{_ENTIDAD_ESPACIO})(?:\s|{_ENTIDAD_ESPACIO}|<[^>]+>)*)
+  | (?P<etiqueta><[^>]+>)
+  | &(?P<numerica>\#[0-9]+|\#[xX][0-9a-fA-F]+);?
+  | &(?P<nombre>[A-Za-z][A-Za-z0-9]*;?)
+""", re.VERBOSE)
+
+_ENTIDADES_HTML5 = html.entities.html5
+
+
+def _normalizar_fragmento(match):
+    """
+    Reemplazo de cada coincidencia de _PATRON_NORMALIZAR
+    """
+    tipo = match.lastgroup
+    if tipo == 'espacio':
+        return ' '
+    if tipo == 'etiqueta':
+        return ''
+    if tipo == 'numerica':
+        return html.unescape(match.group())
+    
+    nombre = match.group('nombre')
+    if nombre in _ENTIDADES_HTML5:
+        return _ENTIDADES_HTML5[nombre]
+    # Sin coincidencia exacta, html.unescape usa el prefijo más largo que sea
+    # una entidad antigua sin ';' ("&notit;" -> "¬it;") o deja el texto tal cual
+    return html.unescape(match.group())
+
+
+def _atributos_enlace(match):
+    """
+    Atributos de una coincidencia de _PATRON_ENLACE, o None si su class no
+    es la de un enlace de resultado
+    """
+    atributos = dict(_PATRON_ATRIBUTO.findall(match.group(1)))
+    return atributos if _CLASE_ENLACE in atributos.get('class', '') else None
+
+
+def _candidatos(texto):
+    """
+    Campos candidatos de un tramo de HTML en orden de aparición
+
+    Cada marca de _PATRON_MARCAS se resuelve con el patrón de su campo,
+    anclado en el '<' de la etiqueta que la contiene. Como en finditer, no
+    se prueba ninguna etiqueta que empiece dentro de una coincidencia
+    anterior (un precio no se vuelve a leer de sus etiquetas internas).
+
+    Args:
+        texto (str): HTML de una tarjeta o de una página sin tarjetas
+    Yields:
+        Tuple[str, re.Match]: Campo ('titulo', 'enlace', 'imagen',
+        'vendedor' o 'precio') y su coincidencia
+    """
+    consumido = 0
+    for marca in _PATRON_MARCAS.finditer(texto):
+        etiqueta = texto.rfind('<', consumido, marca.start() + 1)
+        if etiqueta == -1:
+            continue
+        campo, patron = _CAMPOS_POR_MARCA[marca.group()]
+        match = patron.match(texto, etiqueta)
+        if match:
+            consumido = match.end()
+            yield campo, match
+
+
+class LimitadorPeticiones:
+    """
+    Token bucket por host compartido entre hilos
+    
+    Cada host tiene una cubeta que se recarga a 'peticiones_por_segundo'
+    tokens por segundo hasta un máximo de 'rafaga'. adquirir() reserva un
+    token y duerme solo lo necesario si la cubeta está en déficit; penalizar()
+    endeuda la cubeta para que todos los hilos frenen ante un 429/503.
+    reservar() devuelve la espera sin dormir, para usarla desde asyncio.
+    
+    Attributes:
+        tasa (float): Tokens por segundo de cada host
+        rafaga (int): Peticiones que se pueden enviar seguidas sin esperar
+    """
+    
+    def __init__(self, peticiones_por_segundo: float, rafaga: int = 1):
+        if peticiones_por_segundo <= 0:
+            raise ValueError("peticiones_por_segundo debe ser mayor que 0")
+        if rafaga < 1:
+            raise ValueError("rafaga debe ser al menos 1")
+        self.tasa = peticiones_por_segundo
+        self.rafaga = rafaga
+        self._cubetas = {}
+        self._lock = threading.Lock()
+
+    def adquirir(self, host: str = ''):
+        """
+        Bloquea hasta que la cubeta del host permite enviar una petición
+        Args:
+            host (str): Host de destino
+        """
+        espera = self.reservar(host)
+        if espera > 0:
+            time.sleep(espera)
+
+    def reservar(self, host: str = '') -> float:
+        """
+        Reserva un token del host sin bloquear
+        Args:
+            host (str): Host de destino
+        Returns:
+            float: Segundos que hay que esperar antes de enviar la petición
+        """
+        with self._lock:
+            tokens = self._recargar(host) - 1
+            self._cubetas[host][0] = tokens
+        return max(0.0, -tokens / self.tasa)
+
+    def penalizar(self, host: str, segundos: float):
+        """
+        Frena las próximas peticiones al host durante al menos 'segundos'
+        Args:
+            host (str): Host que respondió con un error de sobrecarga
+            segundos (float): Pausa solicitada (Retry-After o backoff)
+        """
+        with self._lock:
+            tokens = self._recargar(host)
+            self._cubetas[host][0] = min(tokens, 0) - segundos * self.tasa
+
+    def _recargar(self, host):
+        """
+        Suma a la cubeta los tokens generados desde su último uso
+        """
+        ahora = time.monotonic()
+        cubeta = self._cubetas.setdefault(host, [float(self.rafaga), ahora])
+        cubeta[0] = min(self.rafaga, cubeta[0] + (ahora - cubeta[1]) * self.tasa)
+        cubeta[1] = ahora
+        return cubeta[0]
+
+
+class DecodificadorContenido:
+    """
+    Descompresor incremental según el header Content-Encoding
+    
+    Soporta gzip y deflate (con o sin cabecera zlib) con la librería
+    estándar, y br si el paquete opcional 'brotli' está instalado. Los
+    bloques se descomprimen a medida que llegan, sin esperar el cuerpo completo.
+    
+    Attributes:
+        codificaciones (List[str]): Codificaciones aplicadas, en orden de envío
+    """
+    
+    def __init__(self, content_encoding: Optional[str]):
+        self.codificaciones = [
+            c.strip().lower() for c in (content_encoding or '').split(',')
+            if c.strip() and c.strip().lower() != 'identity'
+        ]
+        for codificacion in self.codificaciones:
+            if codificacion not in self.soportadas():
+                raise ValueError(f"Content-Encoding no soportado: {codificacion}")
+        # Se deshacen en orden inverso al que se aplicaron
+        self._etapas = [self._crear_etapa(c) for c in reversed(self.codificaciones)]
+
+    @staticmethod
+    def soportadas() -> List[str]:
+        """
+        Codificaciones que este entorno puede descomprimir
+        """
+        codificaciones = ['gzip', 'x-gzip', 'deflate']
+        if brotli is not None:
+            codificaciones.append('br')
+        return codificaciones
+
+    @staticmethod
+    def accept_encoding() -> str:
+        """
+        Valor del header Accept-Encoding según los decodificadores disponibles
+        """
+        return 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+
+    def descomprimir(self, bloque: bytes) -> bytes:
+        """
+        Descomprime un bloque del cuerpo recibido
+        Args:
+            bloque (bytes): Bytes tal como llegan del socket
+        Returns:
+            bytes: Bytes descomprimidos disponibles hasta ahora
+        """
+        for etapa in self._etapas:
+            bloque = etapa.descomprimir(bloque)
+        return bloque
+
+    def finalizar(self) -> bytes:
+        """
+        Vacía los buffers internos al terminar el cuerpo
+        Returns:
+            bytes: Bytes descomprimidos pendientes
+        """
+        restante = b''
+        for etapa in self._etapas:
+            restante = etapa.descomprimir(restante) + etapa.finalizar()
+        return restante
+
+    def _crear_etapa(self, codificacion):
+        if codificacion in ('gzip', 'x-gzip'):
+            return _EtapaZlib(16 + zlib.MAX_WBITS)
+        if codificacion == 'deflate':
+            return _EtapaZlib(None)
+        return _EtapaBrotli()
+
+
+class _EtapaZlib:
+    """
+    Etapa gzip/deflate sobre zlib.decompressobj
+    
+    Con wbits None detecta en el primer bloque si el deflate trae cabecera
+    zlib o es deflate crudo, como envían algunos servidores.
+    """
+    
+    def __init__(self, wbits):
+        self._wbits = wbits
+        self._objeto = zlib.decompressobj(wbits) if wbits is not None else None
+        self._pendiente = b''
+
+    def descomprimir(self, bloque):
+        if self._objeto is None:
+            self._pendiente += bloque
+            if len(self._pendiente) < 2:
+                return b''
+            cabecera = self._pendiente[0] << 8 | self._pendiente[1]
+            con_zlib = self._pendiente[0] & 0x0F == 8 and cabecera % 31 == 0
+            self._objeto = zlib.decompressobj(zlib.MAX_WBITS if con_zlib else -zlib.MAX_WBITS)
+            bloque, self._pendiente = self._pendiente, b''
+        return self._objeto.decompress(bloque)
+
+    def finalizar(self):
+        if self._objeto is None:
+            if not self._pendiente:
+                return b''
+            self._objeto = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._objeto.decompress(self._pendiente) + self._objeto.flush()
+        return self._objeto.flush()
+
+
+class _EtapaBrotli:
+    """
+    Etapa br sobre el paquete opcional 'brotli'
+    """
+    
+    def __init__(self):
+        self._objeto = brotli.Decompressor()
+
+    def descomprimir(self, bloque):
+        return self._objeto.process(bloque) if bloque else b''
+
+    def finalizar(self):
+        return b''
+
+
+class MetricasBusqueda:
+    """
+    Tiempos por etapa de una búsqueda
+    
+    Las etapas de red son dns, conexion (TCP), tls, primer_byte (desde el
+    envío de la petición hasta recibir los headers) y descarga (lectura del
+    cuerpo); espera es el tiempo bloqueado en el limitador o en backoff. Las
+    de procesamiento son decodificacion, patron (recorrido de la expresión
+    regular), titulos y precios (limpieza y validación de cada campo) y
+    fallback (generación de productos de ejemplo). Todos los tiempos están
+    en segundos y se acumulan si la etapa ocurre varias veces.
+    
+    Attributes:
+        palabra_clave (str): Término buscado
+        url (str): URL del listado
+        etapas (Dict[str, float]): Segundos acumulados por etapa
+        contadores (Dict[str, int]): Conexiones, bytes, reintentos, aciertos de caché...
+        total (float): Duración total de la búsqueda
+    """
+    
+    ETAPAS_RED = ('espera', 'dns', 'conexion', 'tls', 'primer_byte', 'descarga')
+    ETAPAS_PROCESAMIENTO = ('decodificacion', 'patron', 'titulos', 'precios', 'fallback')
+    
+    def __init__(self, palabra_clave: str = '', url: str = ''):
+        self.palabra_clave = palabra_clave
+        self.url = url
+        self.etapas = dict.fromkeys(self.ETAPAS_RED + self.ETAPAS_PROCESAMIENTO, 0.0)
+        self.contadores = {}
+        self.total = 0.0
+        self._inicio = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def sumar(self, etapa: str, segundos: float):
+        """
+        Acumula tiempo en una etapa
+        """
+        with self._lock:
+            self.etapas[etapa] = self.etapas.get(etapa, 0.0) + segundos
+
+    def contar(self, nombre: str, cantidad: int = 1):
+        """
+        Incrementa un contador
+        """
+        with self._lock:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    @contextmanager
+    def medir(self, etapa: str):
+        """
+        Acumula en la etapa el tiempo que tarda el bloque
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar(etapa, time.perf_counter() - inicio)
+
+    def finalizar(self):
+        """
+        Fija la duración total desde la creación del objeto
+        """
+        self.total = time.perf_counter() - self._inicio
+
+    def tiempo_red(self) -> float:
+        """
+        Segundos dedicados a la red (incluye espera del limitador)
+        """
+        return sum(self.etapas[e] for e in self.ETAPAS_RED)
+
+    def tiempo_procesamiento(self) -> float:
+        """
+        Segundos dedicados a decodificar y extraer
+        """
+        return sum(self.etapas[e] for e in self.ETAPAS_PROCESAMIENTO)
+
+    def a_dict(self) -> Dict:
+        """
+        Representación serializable para exportar a un sistema de métricas
+        """
+        with self._lock:
+            return {
+                'palabra_clave': self.palabra_clave,
+                'url': self.url,
+                'total': self.total,
+                'etapas': dict(self.etapas),
+                'contadores': dict(self.contadores),
+            }
+
+    def resumen(self) -> str:
+        """
+        Línea legible con el reparto entre red y procesamiento
+        """
+        return (f"total {self.total * 1000:.1f} ms | red {self.tiempo_red() * 1000:.1f} ms | "
+                f"procesamiento {self.tiempo_procesamiento() * 1000:.1f} ms")
+
+
+def _cronometrar(iterador, metricas, etapa):
+    """
+    Recorre un iterador acumulando en la etapa solo el tiempo de cada next()
+    """
+    iterador = iter(iterador)
+    while True:
+        inicio = time.perf_counter()
+        elemento = next(iterador, None)
+        metricas.sumar(etapa, time.perf_counter() - inicio)
+        if elemento is None:
+            return
+        yield elemento
+
+
+_NADA_QUE_MEDIR = nullcontext()
+
+
+def _sin_medicion(etapa):
+    """
+    Sustituto de MetricasBusqueda.medir cuando no se registran métricas
+
+    nullcontext es reentrante, así que se comparte una sola instancia.
+    """
+    return _NADA_QUE_MEDIR
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones HTTP/HTTPS persistentes (keep-alive) por host
+    
+    Reutiliza las conexiones de http.client entre peticiones para no pagar
+    el handshake TCP y TLS en cada búsqueda. Todas las conexiones HTTPS
+    comparten un único contexto SSL.
+    
+    Attributes:
+        tamano_pool (int): Conexiones inactivas que se conservan por host
+        tiempo_inactividad (float): Segundos tras los que una conexión
+            inactiva se descarta
+        timeout (float): Timeout de socket en segundos
+    """
+    
+    CODIGOS_REDIRECCION = (301, 302, 303, 307, 308)
+    
+    def __init__(self, tamano_pool: int = 4, tiempo_inactividad: float = 30.0,
+                 timeout: float = 15):
+        if tamano_pool < 1:
+            raise ValueError("tamano_pool debe ser al menos 1")
+        self.tamano_pool = tamano_pool
+        self.tiempo_inactividad = tiempo_inactividad
+        self.timeout = timeout
+        
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+        
+        self._inactivas = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def abrir(self, url: str, headers: Dict[str, str], max_redirecciones: int = 5,
+              metricas: Optional[MetricasBusqueda] = None):
+        """
+        Envía una petición GET y entrega la respuesta sin leer el cuerpo
+        
+        La conexión vuelve al pool al salir del bloque si el cuerpo se leyó
+        completo y el servidor no pidió cerrarla. Sigue redirecciones y lanza
+        urllib.error.HTTPError / URLError igual que urlopen.
+        
+        Args:
+            url (str): URL a descargar
+            headers (Dict[str, str]): Headers HTTP de la petición
+            max_redirecciones (int): Redirecciones permitidas
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+                de DNS, conexión, TLS y primer byte
+        Yields:
+            http.client.HTTPResponse: Respuesta con el cuerpo pendiente de leer
+        """
+        metricas = metricas or MetricasBusqueda()
+        for _ in range(max_redirecciones + 1):
+            clave, ruta = self._clave(url)
+            conexion, respuesta = self._enviar(clave, ruta, headers, metricas)
+            
+            ubicacion = respuesta.getheader('Location')
+            if respuesta.status in self.CODIGOS_REDIRECCION and ubicacion:
+                respuesta.read()
+                self._liberar(clave, conexion, respuesta)
+                url = urllib.parse.urljoin(url, ubicacion)
+                continue
+            
+            if respuesta.status >= 400:
+                cuerpo = respuesta.read()
+                self._liberar(clave, conexion, respuesta)
+                raise urllib.error.HTTPError(url, respuesta.status, respuesta.reason,
+                                             respuesta.headers, io.BytesIO(cuerpo))
+            
+            try:
+                yield respuesta
+            finally:
+                self._liberar(clave, conexion, respuesta)
+            return
+        
+        raise urllib.error.URLError(f"Demasiadas redirecciones: {url}")
+
+    def cerrar(self):
+        """
+        Cierra todas las conexiones inactivas del pool
+        """
+        with self._lock:
+            inactivas, self._inactivas = self._inactivas, {}
+        for conexiones in inactivas.values():
+            for conexion, _ in conexiones:
+                conexion.close()
+
+    def _clave(self, url):
+        """
+        Separa una URL en la clave del host (esquema, host, puerto) y la ruta
+        """
+        partes = urllib.parse.urlsplit(url)
+        if partes.scheme not in ('http', 'https') or not partes.hostname:
+            raise urllib.error.URLError(f"URL no soportada: {url}")
+        puerto = partes.port or (443 if partes.scheme == 'https' else 80)
+        ruta = partes.path or '/'
+        if partes.query:
+            ruta += '?' + partes.query
+        return (partes.scheme, partes.hostname, puerto), ruta
+
+    def _tomar(self, clave):
+        """
+        Devuelve una conexión inactiva vigente del host o None
+        """
+        limite = time.monotonic() - self.tiempo_inactividad
+        with self._lock:
+            conexiones = self._inactivas.get(clave, [])
+            while conexiones:
+                conexion, ultimo_uso = conexiones.pop()
+                if ultimo_uso >= limite:
+                    return conexion
+                conexion.close()
+        return None
+
+    def _nueva(self, clave):
+        """
+        Crea una conexión nueva para el host
+        """
+        esquema, host, puerto = clave
+        if esquema == 'https':
+            return http.client.HTTPSConnection(host, puerto, timeout=self.timeout,
+                                               context=self.ssl_context)
+        return http.client.HTTPConnection(host, puerto, timeout=self.timeout)
+
+    def _conectar(self, conexion, metricas):
+        """
+        Abre el socket de una conexión nueva separando DNS, TCP y TLS
+        
+        Sustituye la función de conexión de http.client para resolver el
+        host por separado; el TLS es el resto del tiempo de connect().
+        """
+        tiempos = {'dns': 0.0, 'conexion': 0.0}
+        
+        def crear_conexion(direccion, timeout, source_address=None):
+            host, puerto = direccion
+            inicio = time.perf_counter()
+            destinos = socket.getaddrinfo(host, puerto, 0, socket.SOCK_STREAM)
+            tiempos['dns'] = time.perf_counter() - inicio
+            
+            inicio = time.perf_counter()
+            error = None
+            for _, _, _, _, destino in destinos:
+                try:
+                    sock = socket.create_connection(destino[:2], timeout, source_address)
+                    tiempos['conexion'] = time.perf_counter() - inicio
+                    return sock
+                except OSError as e:
+                    error = e
+            raise error or OSError(f"No se pudo resolver {host}")
+        
+        conexion._create_connection = crear_conexion
+        inicio = time.perf_counter()
+        conexion.connect()
+        total = time.perf_counter() - inicio
+        
+        metricas.sumar('dns', tiempos['dns'])
+        metricas.sumar('conexion', tiempos['conexion'])
+        metricas.sumar('tls', max(0.0, total - tiempos['dns'] - tiempos['conexion']))
+        metricas.contar('conexiones_nuevas')
+
+    def _enviar(self, clave, ruta, headers, metricas):
+        """
+        Envía la petición por una conexión reutilizada o nueva
+        
+        Si una conexión reutilizada fue cerrada por el servidor mientras
+        estaba inactiva, reintenta una vez con una conexión nueva.
+        """
+        conexion = self._tomar(clave)
+        reutilizada = conexion is not None
+        if reutilizada:
+            metricas.contar('conexiones_reutilizadas')
+        
+        while True:
+            try:
+                if conexion is None:
+                    conexion = self._nueva(clave)
+                    self._conectar(conexion, metricas)
+                inicio = time.perf_counter()
+                conexion.request('GET', ruta, headers=headers)
+                respuesta = conexion.getresponse()
+                metricas.sumar('primer_byte', time.perf_counter() - inicio)
+                return conexion, respuesta
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conexion.close()
+                if not reutilizada:
+                    raise urllib.error.URLError(e)
+                conexion, reutilizada = None, False
+            except (OSError, http.client.HTTPException) as e:
+                if conexion is not None:
+                    conexion.close()
+                raise urllib.error.URLError(e)
+
+    def _liberar(self, clave, conexion, respuesta):
+        """
+        Devuelve la conexión al pool o la cierra si no se puede reutilizar
+        """
+        if respuesta.isclosed() and not respuesta.will_close:
+            with self._lock:
+                conexiones = self._inactivas.setdefault(clave, [])
+                if len(conexiones) < self.tamano_pool:
+                    conexiones.append((conexion, time.monotonic()))
+                    return
+        conexion.close()
+
 
 class ScrapingMercadoLibre:
     """
@@ -37,12 +732,48 @@ class ScrapingMercadoLibre:
     - Proporciona datos de fallback
     
     Attributes:
-        base_url (str): URL base de MercadoLibre
+        base_url (str): URL base de MercadoLibre (o de un servidor de replay)
+        moneda (str): Moneda de los precios del sitio
+        pool (PoolConexiones): Conexiones keep-alive reutilizadas entre búsquedas
+        cache (Optional[CacheRespuestas]): Caché local de páginas de búsqueda
+        historial (Optional[HistorialPrecios]): Historial donde se registran
+            los precios de los productos reales extraídos
+        limitador (LimitadorPeticiones): Token bucket por host compartido por
+            todas las búsquedas del scraper
+        max_reintentos (int): Reintentos ante respuestas 429/5xx
+        hook_metricas (Optional[Callable]): Función que recibe las
+            MetricasBusqueda de cada búsqueda al terminar
+        usar_fallback (bool): Generar productos de ejemplo cuando el scraping
+            falla; desactivarlo permite medir solo la extracción real
         user_agents (List[str]): Lista de User-Agents para rotación
     """
     
-    def __init__(self):
-        self.base_url = "https://listado.mercadolibre.com.co"
+    # Productos por página del listado (desplazamiento de _Desde_N)
+    PRODUCTOS_POR_PAGINA = 50
+    
+    # Respuestas de sobrecarga que se reintentan con backoff
+    CODIGOS_REINTENTO = (429, 500, 502, 503, 504)
+    
+    def __init__(self, tamano_pool: int = 4, tiempo_inactividad: float = 30.0,
+                 cache: Optional[CacheRespuestas] = None,
+                 peticiones_por_segundo: float = 2.0, rafaga: int = 1,
+                 max_reintentos: int = 3, backoff_base: float = 1.0,
+                 max_backoff: float = 60.0,
+                 hook_metricas: Optional[Callable[[MetricasBusqueda], None]] = None,
+                 base_url: str = "https://listado.mercadolibre.com.co",
+                 usar_fallback: bool = True,
+                 historial: Optional[HistorialPrecios] = None):
+        self.base_url = base_url.rstrip('/')
+        self.moneda = 'COP'
+        self.pool = PoolConexiones(tamano_pool, tiempo_inactividad)
+        self.cache = cache
+        self.historial = historial
+        self.limitador = LimitadorPeticiones(peticiones_por_segundo, rafaga)
+        self.max_reintentos = max_reintentos
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.hook_metricas = hook_metricas
+        self.usar_fallback = usar_fallback
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -50,82 +781,776 @@ class ScrapingMercadoLibre:
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         ]
 
-    def _obtener_headers(self) -> Dict[str, str]:
+    def cerrar(self):
+        """
+        Libera las conexiones persistentes del pool
+        """
+        self.pool.cerrar()
+
+    def _obtener_headers(self) -> Dict[str, str]:
+        """
+        Genera headers HTTP realistas para simular navegador
+        
+        Returns:
+            Dict[str, str]: Headers HTTP configurados
+        """
+        return {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+            'Accept-Encoding': DecodificadorContenido.accept_encoding(),
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1',
+            'Cache-Control': 'max-age=0'
+        }
+
+    def buscar_productos(self, palabra_clave: str, limite: int = 5) -> List[Producto]:
+        """
+        Ejecuta el proceso de scraping para obtener productos
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            
+        Returns:
+            List[Producto]: Lista de productos con título y precio
+        """
+        return self._buscar(palabra_clave, limite, self.limitador)
+
+    def buscar_productos_con_metricas(self, palabra_clave: str,
+                                      limite: int = 5) -> Tuple[List[Producto], MetricasBusqueda]:
+        """
+        Igual que buscar_productos, devolviendo además los tiempos por etapa
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            
+        Returns:
+            Tuple[List[Producto], MetricasBusqueda]: Productos y métricas
+        """
+        metricas = MetricasBusqueda(palabra_clave)
+        productos = list(self._iterar(palabra_clave, limite, self.limitador, metricas))
+        return productos, metricas
+
+    def iter_productos(self, palabra_clave: str, limite: int = 5) -> Iterator[Producto]:
+        """
+        Genera los productos a medida que se extraen de la página
+        
+        A diferencia de buscar_productos, cada producto se entrega en cuanto
+        su tarjeta llega por la red y se procesa, sin esperar a que termine
+        la descarga ni construir listas intermedias.
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            
+        Yields:
+            Producto: Producto con título y precio
+        """
+        return self._iterar(palabra_clave, limite, self.limitador)
+
+    def buscar_productos_paginado(self, palabra_clave: str, limite: int = 500,
+                                  prefetch: int = 2,
+                                  peticiones_por_segundo: Optional[float] = None) -> List[Producto]:
+        """
+        Extrae productos de varias páginas del listado hasta alcanzar el límite
+        
+        Sigue los desplazamientos _Desde_N de MercadoLibre y descarga las
+        páginas siguientes en paralelo mientras procesa la actual.
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            prefetch (int): Páginas descargándose a la vez
+            peticiones_por_segundo (Optional[float]): Presupuesto propio de
+                peticiones; None usa el limitador compartido del scraper
+            
+        Returns:
+            List[Producto]: Productos en el orden del listado
+        """
+        return list(self.iter_productos_paginado(palabra_clave, limite, prefetch,
+                                                 peticiones_por_segundo))
+
+    def iter_productos_paginado(self, palabra_clave: str, limite: int = 500,
+                                prefetch: int = 2,
+                                peticiones_por_segundo: Optional[float] = None) -> Iterator[Producto]:
+        """
+        Versión generadora de buscar_productos_paginado
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            prefetch (int): Páginas descargándose a la vez
+            peticiones_por_segundo (Optional[float]): Presupuesto propio de
+                peticiones; None usa el limitador compartido del scraper
+            
+        Yields:
+            Producto: Producto con título y precio
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch debe ser al menos 1")
+        return self._iterar_paginado(palabra_clave, limite, prefetch,
+                                     self.limitador_para(peticiones_por_segundo))
+
+    def buscar_productos_lote(self, palabras: List[str], limite: int = 5,
+                              max_concurrencia: int = 8,
+                              peticiones_por_segundo: Optional[float] = None) -> List[List[Producto]]:
+        """
+        Busca varias palabras clave en paralelo con un pool de hilos
+        
+        Todas las búsquedas comparten el presupuesto de peticiones por segundo
+        del limitador, en lugar de esperar cada una por separado.
+        
+        Args:
+            palabras (List[str]): Términos de búsqueda
+            limite (int): Número máximo de productos por término
+            max_concurrencia (int): Número máximo de búsquedas simultáneas
+            peticiones_por_segundo (Optional[float]): Presupuesto propio de
+                peticiones; None usa el limitador compartido del scraper
+            
+        Returns:
+            List[List[Producto]]: Productos de cada término, en el mismo
+            orden que 'palabras'
+        """
+        if max_concurrencia < 1:
+            raise ValueError("max_concurrencia debe ser al menos 1")
+        
+        palabras = list(palabras)
+        if not palabras:
+            return []
+        
+        limitador = self.limitador_para(peticiones_por_segundo)
+        print(f"[INFO] Búsqueda en lote: {len(palabras)} términos, "
+              f"{max_concurrencia} hilos, {limitador.tasa} peticiones/s")
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrencia, len(palabras))) as executor:
+            # map conserva el orden de entrada aunque las búsquedas terminen desordenadas
+            return list(executor.map(
+                lambda palabra: self._buscar(palabra, limite, limitador),
+                palabras
+            ))
+
+    async def buscar_productos_async(self, palabra_clave: str, limite: int = 5,
+                                     cliente: Optional[ClienteAsync] = None) -> List[Producto]:
+        """
+        Versión asyncio de buscar_productos
+        
+        Comparte caché, limitador, reintentos y extracción con la versión
+        síncrona; solo cambia el transporte. Sin 'cliente' se abre uno
+        temporal para esta búsqueda.
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            cliente (Optional[ClienteAsync]): Cliente del bucle de eventos actual
+            
+        Returns:
+            List[Producto]: Lista de productos con título y precio
+        """
+        if cliente is None:
+            async with ClienteAsync(tiempo_inactividad=self.pool.tiempo_inactividad,
+                                    timeout=self.pool.timeout) as cliente:
+                return await self._buscar_async(palabra_clave, limite, self.limitador, cliente)
+        return await self._buscar_async(palabra_clave, limite, self.limitador, cliente)
+
+    async def buscar_productos_lote_async(self, palabras: List[str], limite: int = 5,
+                                          max_concurrencia: int = 100,
+                                          peticiones_por_segundo: Optional[float] = None) -> List[List[Producto]]:
+        """
+        Busca varias palabras clave de forma concurrente en un solo hilo
+        
+        Equivale a buscar_productos_lote sin un hilo por búsqueda: todas
+        comparten un ClienteAsync, así que cientos de búsquedas pueden estar
+        en vuelo a la vez dentro del presupuesto del limitador.
+        
+        Args:
+            palabras (List[str]): Términos de búsqueda
+            limite (int): Número máximo de productos por término
+            max_concurrencia (int): Número máximo de peticiones en vuelo
+            peticiones_por_segundo (Optional[float]): Presupuesto propio de
+                peticiones; None usa el limitador compartido del scraper
+            
+        Returns:
+            List[List[Producto]]: Productos de cada término, en el mismo
+            orden que 'palabras'
+        """
+        if max_concurrencia < 1:
+            raise ValueError("max_concurrencia debe ser al menos 1")
+        
+        palabras = list(palabras)
+        if not palabras:
+            return []
+        
+        limitador = self.limitador_para(peticiones_por_segundo)
+        print(f"[INFO] Búsqueda en lote (asyncio): {len(palabras)} términos, "
+              f"{max_concurrencia} peticiones en vuelo, {limitador.tasa} peticiones/s")
+        
+        async with ClienteAsync(max_concurrencia, self.pool.tamano_pool,
+                                self.pool.tiempo_inactividad, self.pool.timeout) as cliente:
+            # gather conserva el orden de entrada aunque las búsquedas terminen desordenadas
+            return list(await asyncio.gather(*(
+                self._buscar_async(palabra, limite, limitador, cliente) for palabra in palabras
+            )))
+
+    def reportar_metricas(self, metricas: MetricasBusqueda):
+        """
+        Cierra las métricas de una búsqueda y las entrega al hook configurado
+
+        Args:
+            metricas (MetricasBusqueda): Métricas de la búsqueda terminada
+        """
+        metricas.finalizar()
+        print(f"[INFO] Tiempos: {metricas.resumen()}")
+        if self.hook_metricas is None:
+            return
+        try:
+            self.hook_metricas(metricas)
+        except Exception as e:
+            print(f"[WARNING] Error en hook de métricas: {str(e)}")
+
+    def limitador_para(self, peticiones_por_segundo: Optional[float]) -> LimitadorPeticiones:
+        """
+        Devuelve el limitador compartido o uno nuevo con el presupuesto indicado
+        
+        Args:
+            peticiones_por_segundo (Optional[float]): Presupuesto propio; None
+                usa el limitador del scraper
+        Returns:
+            LimitadorPeticiones: Limitador con el que descargar
+        """
+        if peticiones_por_segundo is None:
+            return self.limitador
+        return LimitadorPeticiones(peticiones_por_segundo, self.limitador.rafaga)
+
+    def _calcular_backoff(self, intento, retry_after=None):
         """
-        Genera headers HTTP realistas para simular navegador
+        Calcula la pausa antes de reintentar una petición rechazada
+        
+        Respeta Retry-After (segundos o fecha HTTP) si el servidor lo envía;
+        si no, usa backoff exponencial con jitter para no sincronizar hilos.
         
+        Args:
+            intento (int): Número de reintento, empezando en 0
+            retry_after (Optional[str]): Valor del header Retry-After
         Returns:
-            Dict[str, str]: Headers HTTP configurados
+            float: Segundos de pausa, como máximo max_backoff
         """
-        return {
-            'User-Agent': random.choice(self.user_agents),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
+        if retry_after:
+            try:
+                segundos = float(retry_after)
+            except ValueError:
+                try:
+                    fecha = email.utils.parsedate_to_datetime(retry_after)
+                    segundos = fecha.timestamp() - time.time()
+                except (TypeError, ValueError):
+                    segundos = None
+            if segundos is not None:
+                return min(max(segundos, 0.0), self.max_backoff)
+        
+        techo = min(self.max_backoff, self.backoff_base * 2 ** intento)
+        return techo / 2 + random.uniform(0, techo / 2)
 
-    def buscar_productos(self, palabra_clave: str, limite: int = 5) -> List[Dict[str, str]]:
+    def construir_url(self, palabra_clave: str, desde: int = 1) -> str:
         """
-        Ejecuta el proceso de scraping para obtener productos
+        Genera la URL de búsqueda para una palabra clave
+        Args:
+            palabra_clave (str): Término de búsqueda
+            desde (int): Posición del primer producto del listado (1, 51, 101...)
+        Returns:
+            str: URL del listado
+        """
+        termino_url = palabra_clave.replace(' ', '-').lower()
+        if desde > 1:
+            termino_url += f"_Desde_{desde}_NoIndex_True"
+        params = urllib.parse.urlencode({'q': palabra_clave})
+        return f"{self.base_url}/{termino_url}?{params}"
+
+    def _descargar_pagina(self, palabra_clave, desde, limitador, metricas):
+        """
+        Descarga completa una página del listado
+        Args:
+            palabra_clave (str): Término de búsqueda
+            desde (int): Posición del primer producto de la página
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            metricas (MetricasBusqueda): Métricas de la búsqueda paginada
+        Returns:
+            str: Contenido HTML de la página
+        """
+        url = self.construir_url(palabra_clave, desde)
+        print(f"[DEBUG] Página desde {desde}: {url}")
+        return ''.join(self.iterar_html(url, limitador, metricas))
+
+    def _iterar_paginado(self, palabra_clave, limite, prefetch, limitador):
+        """
+        Genera productos recorriendo las páginas del listado en orden
         
         Args:
             palabra_clave (str): Término de búsqueda
             limite (int): Número máximo de productos a extraer
+            prefetch (int): Páginas descargándose a la vez
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+        Yields:
+            dict: Producto con id, título y precio
+        """
+        print(f"\n[INFO] Iniciando scraping paginado para: '{palabra_clave}'")
+        print(f"[INFO] Límite: {limite} productos, {prefetch} páginas en vuelo")
+        print("-" * 50)
+        
+        metricas = MetricasBusqueda(palabra_clave, self.construir_url(palabra_clave))
+        try:
+            pares = self._pares_paginados(palabra_clave, limite, prefetch, limitador, metricas)
+            yield from self._numerar_con_fallback(palabra_clave, limite, pares, metricas)
+        finally:
+            self.reportar_metricas(metricas)
+
+    def _pares_paginados(self, palabra_clave, limite, prefetch, limitador, metricas):
+        """
+        Genera los productos de las páginas sucesivas del listado
+        
+        Mantiene hasta 'prefetch' páginas descargándose en segundo plano
+        mientras se procesa la actual. Se detiene al alcanzar el límite o al
+        llegar a una página sin productos; las descargas pendientes se cancelan.
+        """
+        por_pagina = self.PRODUCTOS_POR_PAGINA
+        paginas = -(-limite // por_pagina)
+        desdes = iter(range(1, paginas * por_pagina + 1, por_pagina))
+        
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        en_vuelo = deque()
+        
+        def lanzar_siguiente():
+            desde = next(desdes, None)
+            if desde is not None:
+                en_vuelo.append(executor.submit(self._descargar_pagina, palabra_clave,
+                                                desde, limitador, metricas))
+        
+        extraidos = 0
+        try:
+            for _ in range(prefetch):
+                lanzar_siguiente()
             
+            while en_vuelo and extraidos < limite:
+                html_content = en_vuelo.popleft().result()
+                lanzar_siguiente()
+                
+                en_pagina = 0
+                for par in self.extraer_productos(html_content, limite - extraidos, metricas):
+                    en_pagina += 1
+                    extraidos += 1
+                    yield par
+                
+                if en_pagina == 0:
+                    print("[INFO] Página sin productos: fin del listado")
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _buscar(self, palabra_clave, limite, limitador):
+        """
+        Descarga y procesa el listado de una palabra clave
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
         Returns:
-            List[Dict[str, str]]: Lista de productos con título y precio
+            list: Productos extraídos o de ejemplo
+        """
+        return list(self._iterar(palabra_clave, limite, limitador))
+
+    def _iterar(self, palabra_clave, limite, limitador, metricas=None):
+        """
+        Genera los productos de una palabra clave a medida que se extraen
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            metricas (Optional[MetricasBusqueda]): Métricas a completar; si es
+                None se crean unas nuevas
+        Yields:
+            dict: Producto con id, título y precio
         """
         print(f"\n[INFO] Iniciando scraping para: '{palabra_clave}'")
         print(f"[INFO] Conectando a MercadoLibre Colombia...")
         print("-" * 50)
         
-        termino_url = palabra_clave.replace(' ', '-').lower()
-        params = urllib.parse.urlencode({'q': palabra_clave})
-        url = f"{self.base_url}/{termino_url}?{params}"
+        url = self.construir_url(palabra_clave)
+        metricas = metricas or MetricasBusqueda(palabra_clave)
+        metricas.url = url
         
         print(f"[DEBUG] URL generada: {url}")
         
-        delay = random.uniform(1, 3)
-        print(f"[INFO] Delay de {delay:.1f} segundos...")
-        time.sleep(delay)
+        try:
+            pares = self._pares_en_flujo(url, limite, limitador, metricas)
+            yield from self._numerar_con_fallback(palabra_clave, limite, pares, metricas)
+        finally:
+            self.reportar_metricas(metricas)
+
+    def _pares_en_flujo(self, url, limite, limitador, metricas):
+        """
+        Genera los productos de la página mientras se descarga
+        """
+        with closing(self.iterar_html(url, limitador, metricas)) as fragmentos:
+            yield from self.extraer_en_flujo(fragmentos, limite, metricas)
+
+    async def _buscar_async(self, palabra_clave, limite, limitador, cliente):
+        """
+        Descarga y procesa el listado de una palabra clave con asyncio
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos a extraer
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            cliente (ClienteAsync): Cliente del bucle de eventos actual
+        Returns:
+            List[Producto]: Productos extraídos o de ejemplo
+        """
+        print(f"[INFO] Iniciando scraping para: '{palabra_clave}'")
+        url = self.construir_url(palabra_clave)
+        metricas = MetricasBusqueda(palabra_clave, url)
+        print(f"[DEBUG] URL generada: {url}")
         
         try:
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            request = urllib.request.Request(url, headers=self._obtener_headers())
-            
+            try:
+                html_content = await self.descargar_html_async(url, limitador, cliente, metricas)
+                pares = self.extraer_productos(html_content, limite, metricas)
+            except Exception as e:
+                # El error se informa al recorrer los pares, igual que en la versión síncrona
+                pares = self._relanzar(e)
+            return list(self._numerar_con_fallback(palabra_clave, limite, pares, metricas))
+        finally:
+            self.reportar_metricas(metricas)
+
+    @staticmethod
+    def _relanzar(error):
+        """
+        Generador sin pares que lanza 'error' al recorrerlo
+        """
+        raise error
+        yield
+
+    async def descargar_html_async(self, url: str, limitador: LimitadorPeticiones,
+                                   cliente: ClienteAsync, metricas: MetricasBusqueda) -> str:
+        """
+        Descarga completa una URL con asyncio, desde la caché o desde la red
+        
+        Sigue las mismas reglas que iterar_html: caché vigente sin tocar la
+        red, revalidación condicional con 304 y reintentos de 429/5xx con la
+        pausa aplicada al host en el limitador.
+        
+        Args:
+            url (str): URL del listado
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            cliente (ClienteAsync): Cliente del bucle de eventos actual
+            metricas (MetricasBusqueda): Métricas de la búsqueda
+        Returns:
+            str: Contenido HTML de la página
+        """
+        entrada = self.cache.obtener(url) if self.cache else None
+        if entrada and entrada.vigente:
+            print(f"[SUCCESS] Página servida desde caché: {len(entrada.cuerpo)} caracteres")
+            metricas.contar('cache_aciertos')
+            return entrada.cuerpo
+        
+        headers = self._obtener_headers()
+        if entrada:
+            headers.update(entrada.headers_condicionales())
+        host = urllib.parse.urlsplit(url).hostname or ''
+        
+        for intento in range(self.max_reintentos + 1):
+            with metricas.medir('espera'):
+                await asyncio.sleep(limitador.reservar(host))
             print("[INFO] Enviando petición HTTP...")
-            with urllib.request.urlopen(request, timeout=15, context=ssl_context) as respuesta:
-                html_content = respuesta.read().decode('utf-8', errors='ignore')
-                print(f"[SUCCESS] Página descargada: {len(html_content)} caracteres")
-            
-            productos = self._hacer_scraping(html_content, limite)
-            
-            if productos:
-                print(f"[SUCCESS] Scraping completado: {len(productos)} productos extraídos")
-                return productos
-            else:
-                print("[WARNING] No se pudieron extraer productos del HTML")
-                return self._productos_ejemplo(palabra_clave, limite)
+            try:
+                respuesta = await cliente.obtener(url, headers, metricas=metricas)
+                break
+            except urllib.error.HTTPError as e:
+                if e.code not in self.CODIGOS_REINTENTO or intento >= self.max_reintentos:
+                    raise
+                pausa = self._calcular_backoff(intento, e.headers.get('Retry-After'))
+                print(f"[WARNING] HTTP {e.code}: reintento {intento + 1} en {pausa:.1f} segundos")
+                metricas.contar('reintentos')
+                limitador.penalizar(host, pausa)
+        
+        if respuesta.status == 304 and entrada:
+            self.cache.refrescar(url)
+            metricas.contar('cache_revalidadas')
+            print(f"[SUCCESS] Página revalidada (304): {len(entrada.cuerpo)} caracteres")
+            return entrada.cuerpo
+        
+        with metricas.medir('decodificacion'):
+            decodificador = DecodificadorContenido(respuesta.getheader('Content-Encoding'))
+            contenido = decodificador.descomprimir(respuesta.cuerpo) + decodificador.finalizar()
+            html_content = contenido.decode('utf-8', errors='ignore')
+        
+        print(f"[SUCCESS] Página descargada: {len(html_content)} caracteres")
+        if self.cache:
+            self.cache.guardar(url, html_content, respuesta.getheader('ETag'),
+                               respuesta.getheader('Last-Modified'))
+        return html_content
+
+    def _numerar_con_fallback(self, palabra_clave, limite, pares, metricas):
+        """
+        Convierte los pares extraídos en productos numerados
+        
+        Si falla la descarga o no se extrae ningún producto, genera los
+        productos de ejemplo (si usar_fallback está activo) y los cuenta en
+        la métrica 'productos_ejemplo'. Si la descarga falla después de haber
+        generado productos, se detiene sin mezclar datos de ejemplo. Los
+        productos reales entregados se registran en el historial de precios
+        en un solo lote al terminar.
+        
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos
+            pares (iterable): Campos de cada tarjeta extraída
+            metricas (MetricasBusqueda): Métricas de la búsqueda
+        Yields:
+            dict: Producto con id, título, precio, url, imagen y vendedor
+        """
+        extraidos = 0
+        error = False
+        reales = [] if self.historial else None
+        try:
+            with closing(pares):
+                for campos in pares:
+                    extraidos += 1
+                    producto = {'id': extraidos, **campos}
+                    if reales is not None:
+                        reales.append(producto)
+                    yield producto
                 
         except urllib.error.HTTPError as e:
             print(f"[ERROR] HTTP {e.code}: {e.reason}")
-            return self._productos_ejemplo(palabra_clave, limite)
+            error = True
         except urllib.error.URLError as e:
             print(f"[ERROR] Error de conexión: {e.reason}")
-            return self._productos_ejemplo(palabra_clave, limite)
+            error = True
         except Exception as e:
             print(f"[ERROR] Error durante scraping: {str(e)}")
-            return self._productos_ejemplo(palabra_clave, limite)
+            error = True
+        finally:
+            if reales:
+                self._registrar_historial(reales, metricas)
+        
+        if extraidos:
+            print(f"[SUCCESS] Scraping completado: {extraidos} productos extraídos")
+            return
+        
+        if not error:
+            print("[WARNING] No se pudieron extraer productos del HTML")
+        if not self.usar_fallback:
+            return
+        with metricas.medir('fallback'):
+            productos = self._productos_ejemplo(palabra_clave, limite)
+        metricas.contar('productos_ejemplo', len(productos))
+        yield from productos
+
+    def _registrar_historial(self, productos, metricas):
+        """
+        Guarda en el historial los precios nuevos o cambiados de una búsqueda
+        
+        Args:
+            productos (List[Producto]): Productos reales extraídos
+            metricas (MetricasBusqueda): Métricas de la búsqueda
+        """
+        try:
+            with metricas.medir('historial'):
+                cambios = self.historial.registrar(productos, tienda='mercadolibre')
+        except Exception as e:
+            print(f"[WARNING] No se pudo actualizar el historial de precios: {e}")
+            return
+        metricas.contar('precios_cambiados', len(cambios))
+        if cambios:
+            print(f"[INFO] Historial de precios: {len(cambios)} precios nuevos o cambiados")
+
+    def iterar_html(self, url: str, limitador: LimitadorPeticiones,
+                    metricas: MetricasBusqueda) -> Iterator[str]:
+        """
+        Genera el HTML de una URL por fragmentos, desde la caché o desde la red
+        
+        Una entrada vigente se sirve sin tocar la red ni consumir turno del
+        limitador. Una entrada expirada se revalida con If-None-Match /
+        If-Modified-Since y se reutiliza si el servidor responde 304.
+        
+        Si el consumidor deja de leer antes del final (cierra el generador al
+        alcanzar su límite), el resto del cuerpo se lee igualmente: así la
+        página se guarda en caché y la conexión vuelve al pool en lugar de
+        descartarse a medio leer.
+        
+        Las respuestas 429/5xx se reintentan hasta max_reintentos veces; la
+        pausa (Retry-After o backoff) se aplica al host en el limitador.
+        
+        Args:
+            url (str): URL del listado
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            metricas (MetricasBusqueda): Métricas de la búsqueda
+        Yields:
+            str: Fragmentos de contenido HTML
+        """
+        entrada = self.cache.obtener(url) if self.cache else None
+        if entrada and entrada.vigente:
+            print(f"[SUCCESS] Página servida desde caché: {len(entrada.cuerpo)} caracteres")
+            metricas.contar('cache_aciertos')
+            yield entrada.cuerpo
+            return
+        
+        headers = self._obtener_headers()
+        if entrada:
+            headers.update(entrada.headers_condicionales())
+        
+        with self._abrir_con_reintentos(url, headers, limitador, metricas) as respuesta:
+            if respuesta.status == 304 and entrada:
+                respuesta.read()
+                self.cache.refrescar(url)
+                metricas.contar('cache_revalidadas')
+                print(f"[SUCCESS] Página revalidada (304): {len(entrada.cuerpo)} caracteres")
+                yield entrada.cuerpo
+                return
+            
+            etag = respuesta.getheader('ETag')
+            last_modified = respuesta.getheader('Last-Modified')
+            partes = []
+            texto = self._iterar_texto(respuesta, metricas)
+            try:
+                for fragmento in texto:
+                    partes.append(fragmento)
+                    yield fragmento
+            except GeneratorExit:
+                try:
+                    partes.extend(texto)
+                except Exception as e:
+                    print(f"[WARNING] No se pudo completar la página para la caché: {e}")
+                    return
+        
+        html_content = ''.join(partes)
+        print(f"[SUCCESS] Página descargada: {len(html_content)} caracteres")
+        if self.cache:
+            self.cache.guardar(url, html_content, etag, last_modified)
+
+    def descargar_bytes(self, url: str, limitador: LimitadorPeticiones, metricas: MetricasBusqueda,
+                        tamano_bloque: int = 65536) -> bytes:
+        """
+        Descarga el cuerpo de una URL descomprimido pero sin decodificar
+
+        Pensado para entregar la página a otro proceso: la decodificación y
+        la extracción quedan fuera del hilo de E/S. Aplica la misma caché,
+        revalidación y reintentos que iterar_html.
+
+        Args:
+            url (str): URL del listado
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            metricas (MetricasBusqueda): Métricas de la página
+            tamano_bloque (int): Bytes leídos del socket por iteración
+        Returns:
+            bytes: HTML en UTF-8
+        """
+        entrada = self.cache.obtener(url) if self.cache else None
+        if entrada and entrada.vigente:
+            metricas.contar('cache_aciertos')
+            return entrada.cuerpo.encode('utf-8')
+
+        headers = self._obtener_headers()
+        if entrada:
+            headers.update(entrada.headers_condicionales())
+
+        with self._abrir_con_reintentos(url, headers, limitador, metricas) as respuesta:
+            if respuesta.status == 304 and entrada:
+                respuesta.read()
+                self.cache.refrescar(url)
+                metricas.contar('cache_revalidadas')
+                return entrada.cuerpo.encode('utf-8')
+
+            etag = respuesta.getheader('ETag')
+            last_modified = respuesta.getheader('Last-Modified')
+            decodificador = DecodificadorContenido(respuesta.getheader('Content-Encoding'))
+            partes = []
+            while True:
+                with metricas.medir('descarga'):
+                    bloque = respuesta.read(tamano_bloque)
+                if not bloque:
+                    break
+                metricas.contar('bytes_recibidos', len(bloque))
+                with metricas.medir('decodificacion'):
+                    partes.append(decodificador.descomprimir(bloque))
+            with metricas.medir('decodificacion'):
+                partes.append(decodificador.finalizar())
+
+        datos = b''.join(partes)
+        if self.cache:
+            self.cache.guardar(url, datos.decode('utf-8', errors='ignore'), etag, last_modified)
+        return datos
+
+    @contextmanager
+    def _abrir_con_reintentos(self, url, headers, limitador, metricas):
+        """
+        Abre la URL en el pool respetando el limitador y reintentando las
+        respuestas de sobrecarga (CODIGOS_REINTENTO)
+        
+        La pausa de cada reintento (Retry-After o backoff) se aplica a la
+        cubeta del host, así que también frena a los demás hilos.
+        
+        Args:
+            url (str): URL a descargar
+            headers (Dict[str, str]): Headers HTTP de la petición
+            limitador (LimitadorPeticiones): Presupuesto de peticiones a respetar
+            metricas (MetricasBusqueda): Métricas de la búsqueda
+        Yields:
+            http.client.HTTPResponse: Respuesta con el cuerpo pendiente de leer
+        """
+        host = urllib.parse.urlsplit(url).hostname or ''
+        entregada = False
+        
+        for intento in range(self.max_reintentos + 1):
+            with metricas.medir('espera'):
+                limitador.adquirir(host)
+            print("[INFO] Enviando petición HTTP...")
+            try:
+                with self.pool.abrir(url, headers, metricas=metricas) as respuesta:
+                    entregada = True
+                    yield respuesta
+                return
+            except urllib.error.HTTPError as e:
+                if entregada or e.code not in self.CODIGOS_REINTENTO or intento >= self.max_reintentos:
+                    raise
+                pausa = self._calcular_backoff(intento, e.headers.get('Retry-After'))
+                print(f"[WARNING] HTTP {e.code}: reintento {intento + 1} en {pausa:.1f} segundos")
+                metricas.contar('reintentos')
+                limitador.penalizar(host, pausa)
+
+    def _iterar_texto(self, respuesta, metricas, tamano_bloque=65536):
+        """
+        Lee el cuerpo de la respuesta por bloques, descomprimiendo y
+        decodificando UTF-8 de forma incremental
+        Args:
+            respuesta (http.client.HTTPResponse): Respuesta con el cuerpo pendiente
+            metricas (MetricasBusqueda): Donde registrar descarga y decodificación
+            tamano_bloque (int): Bytes leídos del socket por iteración
+        Yields:
+            str: Fragmentos de texto decodificado
+        """
+        decodificador = DecodificadorContenido(respuesta.getheader('Content-Encoding'))
+        texto = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        
+        while True:
+            with metricas.medir('descarga'):
+                bloque = respuesta.read(tamano_bloque)
+            if not bloque:
+                break
+            metricas.contar('bytes_recibidos', len(bloque))
+            with metricas.medir('decodificacion'):
+                fragmento = texto.decode(decodificador.descomprimir(bloque))
+            if fragmento:
+                yield fragmento
+        
+        with metricas.medir('decodificacion'):
+            fragmento = texto.decode(decodificador.finalizar(), final=True)
+        if fragmento:
+            yield fragmento
 
     def _hacer_scraping(self, html, limite):
         """
@@ -140,80 +1565,8 @@ class ScrapingMercadoLibre:
         productos = []
         
         try:
-            # PATRONES 
-            print("Buscando títulos de productos...")
-            patrones_titulo = [
-                r'<h2[^>]*class="[^"]*ui-search-item__title[^"]*"[^>]*>([^<]{15,120})</h2>',
-                r'<a[^>]*class="[^"]*ui-search-link[^"]*"[^>]*title="([^"]{15,120})"',
-                r'<li[^>]*class="[^"]*ui-search-layout__item[^"]*"[^>]*>.*?<h2[^>]*>([^<]{15,120})</h2>',
-                r'<div[^>]*class="[^"]*ui-search-item__title[^"]*"[^>]*>([^<]{15,120})</div>',
-                r'<span[^>]*class="[^"]*ui-search-item__title[^"]*"[^>]*>([^<]{15,120})</span>'
-            ]
-            
-            titulos_encontrados = []
-            for i, patron in enumerate(patrones_titulo):
-                matches = re.findall(patron, html, re.IGNORECASE | re.DOTALL)
-                print(f"   Patrón {i+1}: {len(matches)} coincidencias")
-                
-                for match in matches:
-                    titulo_limpio = self._limpiar_texto(match)
-                    if titulo_limpio and len(titulo_limpio) >= 15:
-                        titulos_encontrados.append(titulo_limpio)
-                        if len(titulos_encontrados) >= limite * 2:
-                            break
-                
-                if len(titulos_encontrados) >= limite:
-                    break
-            
-            print(f"Títulos extraídos: {len(titulos_encontrados)}")
-            
-            # PATRONES ACTUALIZADOS PARA PRECIOS
-            print("Buscando precios...")
-            patrones_precio = [
-                # Patrones mas detallados 
-                r'<span[^>]*class="[^"]*price-tag-fraction[^"]*"[^>]*>([\d.]+(?:,\d{2})?)</span>',
-                r'<div[^>]*class="[^"]*price-tag[^"]*"[^>]*>.*?([\d.]+(?:,\d{2})?)</div>',
-                r'<span[^>]*class="[^"]*price-tag[^"]*"[^>]*>.*?([\d.]+(?:,\d{2})?)</span>',
-                r'<span[^>]*>.*?\$\s*([\d.]+(?:,\d{2})?)</span>',
-                r'price-tag[^>]*>.*?([\d.]+(?:,\d{2})?)'
-            ]
-            
-            precios_encontrados = []
-            for i, patron in enumerate(patrones_precio):
-                matches = re.findall(patron, html, re.IGNORECASE)
-                print(f"   Patrón precio {i+1}: {len(matches)} coincidencias")
-                
-                for match in matches:
-                    precio_limpio = self._limpiar_precio(match)
-                    if precio_limpio:
-                        precios_encontrados.append(precio_limpio)
-                        if len(precios_encontrados) >= limite * 2:
-                            break
-                
-                if len(precios_encontrados) >= limite:
-                    break
-            
-            print(f"Precios extraídos: {len(precios_encontrados)}")
-            
-            # Combinar títulos y precios
-            min_items = min(len(titulos_encontrados), len(precios_encontrados), limite)
-            
-            if min_items > 0:
-                for i in range(min_items):
-                    productos.append({
-                        'id': i + 1,
-                        'titulo': titulos_encontrados[i],
-                        'precio': precios_encontrados[i]
-                    })
-            
-            # Si tenemos más títulos que precios, agregar con precio genérico
-            if len(titulos_encontrados) > len(productos) and len(productos) < limite:
-                for i in range(len(productos), min(len(titulos_encontrados), limite)):
-                    productos.append({
-                        'id': i + 1,
-                        'titulo': titulos_encontrados[i],
-                        'precio': 'Consultar precio'
-                    })
+            for campos in self.extraer_productos(html, limite):
+                productos.append({'id': len(productos) + 1, **campos})
             
             print(f"Productos finales combinados: {len(productos)}")
             
@@ -222,7 +1575,300 @@ class ScrapingMercadoLibre:
         
         return productos
 
-    def _limpiar_texto(self, texto):
+    def extraer_productos(self, html: str, limite: int,
+                          metricas: Optional[MetricasBusqueda] = None) -> Iterator[Producto]:
+        """
+        Recorre el HTML una sola vez y genera los campos de cada producto
+        Args:
+            html (str): Contenido HTML de la página
+            limite (int): Número máximo de productos a generar
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+        Yields:
+            dict: titulo, precio, url, imagen y vendedor de cada producto
+        """
+        return self.extraer_en_flujo((html,), limite, metricas)
+
+    def extraer_en_flujo(self, fragmentos: Iterable[str], limite: int,
+                         metricas: Optional[MetricasBusqueda] = None) -> Iterator[Producto]:
+        """
+        Genera los campos de cada producto a partir de HTML que llega por fragmentos
+        
+        Todos los campos de un producto salen de la misma tarjeta de
+        resultado: cada tarjeta se procesa en cuanto llega el inicio de la
+        siguiente (o al final del documento), de modo que una tarjeta sin
+        precio no desplaza a las siguientes. El texto anterior a la primera
+        tarjeta, o la página entera si no tiene tarjetas, se procesa cuando
+        termina: en él cada título se empareja con el siguiente precio. El
+        recorrido se detiene al alcanzar el límite.
+        
+        Args:
+            fragmentos (iterable): Fragmentos de texto HTML en orden
+            limite (int): Número máximo de productos a generar
+            metricas (Optional[MetricasBusqueda]): Donde registrar el tiempo
+                de búsqueda (patron) y de limpieza de títulos y precios
+        Yields:
+            dict: titulo, precio, url, imagen y vendedor de cada producto
+        """
+        if limite <= 0:
+            return
+        
+        tramos = self._tramos(fragmentos)
+        if metricas is not None:
+            tramos = _cronometrar(tramos, metricas, 'patron')
+        
+        emitidos = 0
+        for es_tarjeta, texto in tramos:
+            if es_tarjeta:
+                producto = self.extraer_campos_tarjeta(texto, metricas)
+                productos = (producto,) if producto['titulo'] else ()
+            else:
+                productos = self._pares_sin_tarjetas(texto, metricas)
+            for producto in productos:
+                yield producto
+                emitidos += 1
+                if emitidos >= limite:
+                    return
+
+    def localizar_tarjetas(self, fragmentos: Iterable[str]) -> Iterator[str]:
+        """
+        Genera el HTML de cada tarjeta de resultado a medida que llegan los fragmentos
+        
+        El texto anterior a la primera tarjeta se descarta; extraer_en_flujo
+        lo aprovecha para las páginas sin tarjetas.
+        
+        Args:
+            fragmentos (Iterable[str]): Fragmentos de texto HTML en orden
+        Yields:
+            str: HTML de cada tarjeta, en orden
+        """
+        for es_tarjeta, texto in self._tramos(fragmentos):
+            if es_tarjeta:
+                yield texto
+
+    @staticmethod
+    def _tramos(fragmentos):
+        """
+        Divide en tarjetas de resultado el HTML que llega por fragmentos
+        
+        Las tarjetas se localizan con str.find de _MARCA_TARJETA y se
+        confirman con _PATRON_TARJETA en el '<' de su etiqueta. Cada tarjeta
+        va desde su etiqueta hasta la de la siguiente (la última, hasta el
+        final del documento).
+        
+        Args:
+            fragmentos (iterable): Fragmentos de texto HTML en orden
+        Yields:
+            Tuple[bool, str]: (False, texto anterior a la primera tarjeta) y
+            (True, texto de la tarjeta) por cada tarjeta, en orden
+        """
+        buffer = ''
+        inicio = 0
+        desde = 0
+        en_tarjeta = False
+        for fragmento in fragmentos:
+            buffer = buffer[inicio:] + fragmento
+            desde -= inicio
+            inicio = 0
+            while True:
+                posicion = buffer.find(_MARCA_TARJETA, desde)
+                if posicion == -1:
+                    # La marca puede haber quedado partida al final del fragmento
+                    desde = max(desde, len(buffer) - len(_MARCA_TARJETA) + 1)
+                    break
+                desde = posicion + len(_MARCA_TARJETA)
+                etiqueta = buffer.rfind('<', inicio, posicion)
+                # La etiqueta de la tarjeta en curso puede repetir la marca
+                if etiqueta == -1 or (en_tarjeta and etiqueta == inicio):
+                    continue
+                if not _PATRON_TARJETA.match(buffer, etiqueta):
+                    continue
+                if etiqueta > inicio:
+                    yield en_tarjeta, buffer[inicio:etiqueta]
+                inicio = etiqueta
+                en_tarjeta = True
+        
+        if len(buffer) > inicio:
+            yield en_tarjeta, buffer[inicio:]
+
+    def extraer_campos_tarjeta(self, tarjeta: str,
+                               metricas: Optional[MetricasBusqueda] = None) -> Producto:
+        """
+        Busca los campos de un producto dentro del texto de su tarjeta
+
+        Cada campo toma el primer candidato válido en el orden del documento;
+        el título puede salir también del atributo title del enlace.
+
+        Args:
+            tarjeta (str): HTML de la tarjeta
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+        Returns:
+            dict: titulo, precio, url, imagen y vendedor (None si no aparecen)
+        """
+        medir = metricas.medir if metricas is not None else _sin_medicion
+        producto = self._producto_vacio()
+
+        def titulo(match):
+            if match.re is _PATRON_ENLACE:
+                atributos = _atributos_enlace(match)
+                if atributos is None:
+                    return None
+                # Los enlaces se recorren desde el principio de la tarjeta: el
+                # primero con href es la URL y no hace falta buscarla otra vez
+                if producto['url'] is None and atributos.get('href'):
+                    producto['url'] = self._url_absoluta(atributos['href'])
+                texto = atributos.get('title')
+                if not texto:
+                    return None
+            else:
+                texto = match.group('titulo')
+            with medir('titulos'):
+                titulo_limpio = self.limpiar_texto(texto)
+            return titulo_limpio if len(titulo_limpio) >= 15 else None
+
+        def precio(match):
+            with medir('precios'):
+                return self._limpiar_precio(match.group('precio'))
+
+        def url(match):
+            href = (_atributos_enlace(match) or {}).get('href')
+            return self._url_absoluta(href) if href else None
+
+        def imagen(match):
+            atributos = dict(_PATRON_ATRIBUTO.findall(match.group(1)))
+            # Las imágenes diferidas guardan la URL real en data-src
+            src = atributos.get('data-src') or atributos.get('src')
+            if src and not src.startswith('data:'):
+                return html.unescape(src)
+            return None
+
+        def vendedor(match):
+            return _PREFIJO_VENDEDOR.sub('', self.limpiar_texto(match.group(1))) or None
+
+        producto['titulo'] = self._primer_valor(tarjeta, _FUENTES_TITULO, titulo, metricas)
+        if producto['titulo'] is None:
+            return producto
+        producto['precio'] = self._primer_valor(tarjeta, _FUENTES_PRECIO, precio, metricas)
+        if producto['url'] is None:
+            producto['url'] = self._primer_valor(tarjeta, _FUENTES_ENLACE, url, metricas)
+        producto['imagen'] = self._primer_valor(tarjeta, _FUENTES_IMAGEN, imagen, metricas)
+        producto['vendedor'] = self._primer_valor(tarjeta, _FUENTES_VENDEDOR, vendedor, metricas)
+        return producto
+
+    @staticmethod
+    def _primer_valor(tarjeta, fuentes, valor, metricas=None):
+        """
+        Primer valor válido de un campo de la tarjeta en el orden del documento
+
+        Cada marca se localiza con str.find y el patrón de su fuente se prueba
+        anclado en el '<' de la etiqueta que la contiene. Cada fuente se
+        recorre hasta su primer valor válido y solo antes de la etiqueta del
+        mejor encontrado hasta entonces: una marca que empieza ahí o después
+        solo puede estar en una etiqueta posterior, así que las fuentes
+        siguientes apenas cuestan cuando la primera acierta pronto.
+
+        Args:
+            tarjeta (str): HTML de la tarjeta
+            fuentes (tuple): Pares (marca, patrón) donde puede aparecer el campo
+            valor (callable): Convierte una coincidencia en el valor del campo,
+                o None si no es válida
+            metricas (Optional[MetricasBusqueda]): Donde registrar el tiempo
+                de búsqueda (patron)
+        Returns:
+            Any: Valor del candidato válido más temprano, o None
+        """
+        reloj = time.perf_counter if metricas is not None else None
+        mejor = None
+        hasta = len(tarjeta)
+        for marca, patron in fuentes:
+            fin = hasta + len(marca) - 1
+            if reloj:
+                inicio = reloj()
+            posicion = tarjeta.find(marca, 0, fin)
+            while posicion != -1:
+                etiqueta = tarjeta.rfind('<', 0, posicion + 1)
+                match = patron.match(tarjeta, etiqueta) if etiqueta != -1 else None
+                if reloj:
+                    metricas.sumar('patron', reloj() - inicio)
+                if match is not None:
+                    resultado = valor(match)
+                    if resultado is not None:
+                        mejor, hasta = resultado, etiqueta
+                        break
+                if reloj:
+                    inicio = reloj()
+                posicion = tarjeta.find(marca, posicion + 1, fin)
+            else:
+                if reloj:
+                    metricas.sumar('patron', reloj() - inicio)
+        return mejor
+
+    def _pares_sin_tarjetas(self, texto, metricas=None):
+        """
+        Empareja cada título con el siguiente precio en HTML sin tarjetas
+
+        Un título que llega sin que el anterior tenga precio se descarta; el
+        último título se emite aunque no tenga precio. Enlaces, imágenes y
+        vendedores solo son fiables dentro de una tarjeta y no se usan.
+
+        Args:
+            texto (str): HTML sin tarjetas de resultado
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+        Yields:
+            dict: titulo, precio, url, imagen y vendedor de cada producto
+        """
+        medir = metricas.medir if metricas is not None else _sin_medicion
+        candidatos = _candidatos(texto)
+        if metricas is not None:
+            candidatos = _cronometrar(candidatos, metricas, 'patron')
+
+        producto = self._producto_vacio()
+        for campo, match in candidatos:
+            if campo == 'precio':
+                if producto['titulo'] is not None and producto['precio'] is None:
+                    with medir('precios'):
+                        producto['precio'] = self._limpiar_precio(match.group('precio'))
+                continue
+            if campo == 'enlace':
+                texto_titulo = (_atributos_enlace(match) or {}).get('title')
+            elif campo == 'titulo':
+                texto_titulo = match.group('titulo')
+            else:
+                continue
+            if not texto_titulo:
+                continue
+
+            if producto['titulo'] and producto['precio']:
+                yield producto
+                producto = self._producto_vacio()
+            if producto['titulo'] is None:
+                with medir('titulos'):
+                    titulo_limpio = self.limpiar_texto(texto_titulo)
+                if len(titulo_limpio) >= 15:
+                    producto['titulo'] = titulo_limpio
+
+        if producto['titulo']:
+            yield producto
+
+    def _url_absoluta(self, href):
+        """
+        URL absoluta de un enlace de la tarjeta
+
+        urljoin solo hace falta para rutas relativas y es de lo más caro de
+        procesar una tarjeta, así que las URL absolutas no pasan por él.
+        """
+        href = html.unescape(href)
+        if href.startswith(('https://', 'http://')):
+            return href
+        return urllib.parse.urljoin(self.base_url, href)
+
+    @staticmethod
+    def _producto_vacio():
+        """
+        Campos de un producto antes de recorrer su tarjeta
+        """
+        return {'titulo': None, 'precio': None, 'url': None, 'imagen': None, 'vendedor': None}
+
+    def limpiar_texto(self, texto: str) -> str:
         """
         Limpia y normaliza texto extraído del HTML
         Args:
@@ -233,45 +1879,31 @@ class ScrapingMercadoLibre:
         if not texto:
             return ""
         
-        # Remover etiquetas HTML restantes
-        texto = re.sub(r'<[^>]+>', '', texto)
+        # Sin etiquetas ni entidades basta con colapsar espacios (caso habitual)
+        if '<' not in texto and '&' not in texto:
+            return ' '.join(texto.split())
         
-        entidades = {
-            '&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"',
-            '&#39;': "'", '&nbsp;': ' ', '&aacute;': 'á', '&eacute;': 'é',
-            '&iacute;': 'í', '&oacute;': 'ó', '&uacute;': 'ú', '&ntilde;': 'ñ'
-        }
-        
-        for entidad, caracter in entidades.items():
-            texto = texto.replace(entidad, caracter)
-        
-        texto = re.sub(r'\s+', ' ', texto).strip()
-        
-        return texto
+        # Una sola pasada: etiquetas, entidades HTML5 y espacios
+        return _PATRON_NORMALIZAR.sub(_normalizar_fragmento, texto).strip()
 
     def _limpiar_precio(self, precio):
         """
-        Limpia y formatea precios extraídos
+        Convierte el texto de un precio extraído en un Precio estructurado
         Args:
             precio (str): Precio a limpiar
         Returns:
-            str: Precio formateado
+            Optional[Precio]: Precio en COP o None si no es un precio válido
         """
         if not precio:
             return None
         
-        # Remover excepto puntos y comas
-        precio_limpio = re.sub(r'[^\d.,]', '', precio)
+        precio_estructurado = Precio.desde_texto(precio, self.moneda)
         
-        if not precio_limpio:
-            return None
-        
-        try:
-            numero = float(precio_limpio.replace('.', '').replace(',', '.'))
-            if numero >= 1000: 
-                return f"${precio_limpio} COP"
-        except ValueError:
-            pass
+        # Importes por debajo de 1000 suelen ser cuotas o descuentos, no precios
+        # (se compara en unidades menores para no construir un Decimal)
+        minimo = 1000 * 10 ** MONEDAS[self.moneda].decimales
+        if precio_estructurado and precio_estructurado.unidades_menores >= minimo:
+            return precio_estructurado
         
         return None
 
@@ -333,8 +1965,9 @@ class ScrapingMercadoLibre:
         for i in range(min(limite, len(productos_base))):
             productos.append({
                 'id': i + 1,
+                **self._producto_vacio(),
                 'titulo': productos_base[i],
-                'precio': f"${precios_ejemplo[i % len(precios_ejemplo)]} COP"
+                'precio': Precio.desde_texto(precios_ejemplo[i % len(precios_ejemplo)], self.moneda)
             })
         
         print(f"{len(productos)} productos de ejemplo generados")
@@ -357,7 +1990,14 @@ class ScrapingMercadoLibre:
         for producto in productos:
             print(f"\nPRODUCTO #{producto['id']}")
             print(f"Título: {producto['titulo']}")
-            print(f"Precio: {producto['precio']}")
+            precio = producto['precio']
+            print(f"Precio: {precio if precio is not None else 'Consultar precio'}")
+            if producto.get('tienda'):
+                print(f"Tienda: {producto['tienda']}")
+            if producto.get('vendedor'):
+                print(f"Vendedor: {producto['vendedor']}")
+            if producto.get('url'):
+                print(f"Enlace: {producto['url']}")
             print("-" * 50)
         
         print(f"\n[INFO] Total extraído: {len(productos)} productos")
@@ -374,7 +2014,7 @@ def main():
     print("Implementación técnica para extracción de datos")
     print("=" * 70)
     
-    scraper = ScrapingMercadoLibre()
+    scraper = ScrapingMercadoLibre(cache=CacheRespuestas())
     
     while True:
         print("\nOPCIONES DISPONIBLES:")
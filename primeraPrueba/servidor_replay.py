@@ -0,0 +1,455 @@
+"""
+Grabación y replay de páginas de búsqueda con un servidor local
+
+Graba una vez las respuestas reales de las tiendas en disco y las sirve desde
+un servidor HTTP local que imita a MercadoLibre y Amazon, con latencia,
+errores 5xx y respuestas 429 configurables. Los dos scrapers pueden apuntar a
+él (ScrapingMercadoLibre(base_url=...), AdaptadorAmazon.base_url o la
+variable AMAZON_URL_BASE de buscar_productos.py), de modo que la descarga
+concurrente se puede probar con carga de forma determinista y sin red.
+
+Características técnicas:
+- Solo librerías estándar (http.server con un hilo por conexión, keep-alive)
+- Grabaciones indexadas por ruta + parámetros ordenados, cuerpo en gzip
+- Respuesta gzip si el cliente la acepta y 304 con If-None-Match
+- Latencia, jitter, tasa de errores y tasa de 429 reproducibles con semilla
+
+Uso:
+    python servidor_replay.py grabar laptop celular --tiendas mercadolibre amazon
+    python servidor_replay.py fixtures
+    python servidor_replay.py servir --puerto 8765 --latencia 0.05 --tasa-429 0.1
+    python servidor_replay.py carga --busquedas 300 --concurrencia 100 --tasa-error 0.05
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional
+
+from producto_Scraper import MetricasBusqueda, ScrapingMercadoLibre
+from tiendas import BusquedaMultitienda, crear_adaptador, tiendas_registradas
+
+DIRECTORIO_GRABACIONES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'grabaciones')
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class Grabacion(NamedTuple):
+    """
+    Respuesta grabada de una URL
+
+    Attributes:
+        url (str): URL original
+        content_type (str): Header Content-Type de la respuesta
+        etag (str): ETag con el que se sirve (hash del cuerpo)
+        cuerpo_gzip (bytes): Cuerpo comprimido con gzip
+    """
+    url: str
+    content_type: str
+    etag: str
+    cuerpo_gzip: bytes
+
+
+def ruta_grabacion(url: str) -> str:
+    """
+    Ruta y parámetros ordenados de una URL, sin esquema ni host
+
+    Es la clave de las grabaciones: la misma búsqueda se encuentra tanto
+    con la URL real como con la del servidor local.
+
+    Args:
+        url (str): URL completa o ruta con parámetros
+    Returns:
+        str: Ruta normalizada ('/laptop?q=laptop')
+    """
+    partes = urllib.parse.urlsplit(url)
+    parametros = sorted(urllib.parse.parse_qsl(partes.query, keep_blank_values=True))
+    consulta = urllib.parse.urlencode(parametros)
+    return (partes.path or '/') + (f"?{consulta}" if consulta else '')
+
+
+def _nombre_archivo(url):
+    """
+    Nombre base de los archivos de una grabación
+    """
+    return hashlib.sha1(ruta_grabacion(url).encode('utf-8')).hexdigest()[:20]
+
+
+def guardar_grabacion(directorio: str, url: str, html_content: str,
+                      content_type: str = 'text/html; charset=utf-8'):
+    """
+    Guarda el HTML de una URL como grabación (.html.gz + .json)
+
+    Args:
+        directorio (str): Carpeta de grabaciones
+        url (str): URL de la página
+        html_content (str): Contenido HTML decodificado
+        content_type (str): Content-Type con el que se servirá
+    """
+    os.makedirs(directorio, exist_ok=True)
+    base = os.path.join(directorio, _nombre_archivo(url))
+    with open(base + '.html.gz', 'wb') as archivo:
+        archivo.write(gzip.compress(html_content.encode('utf-8'), mtime=0))
+    with open(base + '.json', 'w', encoding='utf-8') as archivo:
+        json.dump({'url': url, 'ruta': ruta_grabacion(url), 'content_type': content_type,
+                   'grabado': time.strftime('%Y-%m-%dT%H:%M:%S')}, archivo, indent=2)
+
+
+def cargar_grabaciones(directorio: str = DIRECTORIO_GRABACIONES) -> Dict[str, Grabacion]:
+    """
+    Carga en memoria todas las grabaciones de un directorio
+
+    Args:
+        directorio (str): Carpeta de grabaciones
+    Returns:
+        Dict[str, Grabacion]: Grabaciones por ruta normalizada
+    """
+    grabaciones = {}
+    if not os.path.isdir(directorio):
+        return grabaciones
+    for nombre in sorted(os.listdir(directorio)):
+        if not nombre.endswith('.json'):
+            continue
+        base = os.path.join(directorio, nombre[:-len('.json')])
+        with open(base + '.json', encoding='utf-8') as archivo:
+            meta = json.load(archivo)
+        with open(base + '.html.gz', 'rb') as archivo:
+            cuerpo_gzip = archivo.read()
+        etag = '"%s"' % hashlib.sha1(cuerpo_gzip).hexdigest()[:16]
+        grabaciones[meta['ruta']] = Grabacion(meta['url'], meta['content_type'], etag, cuerpo_gzip)
+    return grabaciones
+
+
+def grabar(palabras: List[str], tiendas: Optional[List[str]] = None,
+           directorio: str = DIRECTORIO_GRABACIONES,
+           scraper: Optional[ScrapingMercadoLibre] = None) -> int:
+    """
+    Descarga una vez las búsquedas reales y las guarda como grabaciones
+
+    Args:
+        palabras (List[str]): Términos de búsqueda
+        tiendas (Optional[List[str]]): Tiendas registradas (todas por defecto)
+        directorio (str): Carpeta de grabaciones
+        scraper (Optional[ScrapingMercadoLibre]): Scraper para descargar
+    Returns:
+        int: Número de páginas grabadas
+    """
+    scraper = scraper or ScrapingMercadoLibre()
+    grabadas = 0
+    for nombre in tiendas or tiendas_registradas():
+        adaptador = crear_adaptador(nombre, scraper)
+        for palabra in palabras:
+            url = adaptador.construir_url(palabra)
+            try:
+                html_content = ''.join(adaptador.descargar(url, MetricasBusqueda(palabra, url)))
+            except OSError as e:
+                print(f"[ERROR] {nombre}: no se pudo grabar {url}: {e}")
+                continue
+            guardar_grabacion(directorio, url, html_content)
+            grabadas += 1
+            print(f"[SUCCESS] {nombre}: {url} grabada ({len(html_content)} caracteres)")
+    return grabadas
+
+
+def importar_fixtures(directorio: str = DIRECTORIO_GRABACIONES,
+                      fixtures: str = DIRECTORIO_FIXTURES) -> int:
+    """
+    Graba las páginas de fixtures/ bajo la URL de búsqueda que les corresponde
+
+    El nombre '<tienda>_<palabra>_<n>.html.gz' indica la tienda y la palabra
+    clave; con varias páginas de la misma búsqueda se conserva la mayor.
+    Permite usar el servidor en CI sin haber grabado nunca el sitio real.
+
+    Args:
+        directorio (str): Carpeta de grabaciones
+        fixtures (str): Carpeta de fixtures del benchmark
+    Returns:
+        int: Número de búsquedas grabadas
+    """
+    scraper = ScrapingMercadoLibre()
+    paginas = {}
+    for nombre in sorted(os.listdir(fixtures)):
+        if not nombre.endswith('.html.gz'):
+            continue
+        partes = nombre[:-len('.html.gz')].split('_')
+        if len(partes) < 2 or partes[0] not in tiendas_registradas():
+            continue
+        with gzip.open(os.path.join(fixtures, nombre), 'rt', encoding='utf-8') as archivo:
+            html_content = archivo.read()
+        url = crear_adaptador(partes[0], scraper).construir_url(partes[1])
+        if len(html_content) > len(paginas.get(url, '')):
+            paginas[url] = html_content
+
+    for url, html_content in paginas.items():
+        guardar_grabacion(directorio, url, html_content)
+        print(f"[SUCCESS] Fixture grabada como {ruta_grabacion(url)}")
+    return len(paginas)
+
+
+class _ManejadorReplay(BaseHTTPRequestHandler):
+    """
+    Sirve las grabaciones del ServidorReplay asociado al servidor HTTP
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        replay = self.server.replay
+        time.sleep(replay._latencia())
+
+        falla = replay._sortear_falla()
+        if falla == 429:
+            self._responder(429, b'', {'Retry-After': f"{replay.retry_after:g}"})
+            return
+        if falla is not None:
+            self._responder(falla, b'')
+            return
+
+        grabacion = replay.grabaciones.get(ruta_grabacion(self.path))
+        if grabacion is None:
+            self._responder(404, b'')
+            return
+        if self.headers.get('If-None-Match') == grabacion.etag:
+            self._responder(304, None, {'ETag': grabacion.etag})
+            return
+
+        headers = {'Content-Type': grabacion.content_type, 'ETag': grabacion.etag}
+        if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            headers['Content-Encoding'] = 'gzip'
+            cuerpo = grabacion.cuerpo_gzip
+        else:
+            cuerpo = gzip.decompress(grabacion.cuerpo_gzip)
+        self._responder(200, cuerpo, headers)
+
+    def _responder(self, status, cuerpo, headers=None):
+        # Se cuenta antes de enviar: el cliente puede consultar las
+        # estadísticas en cuanto recibe la respuesta
+        self.server.replay._contar(status)
+        self.send_response(status)
+        for nombre, valor in (headers or {}).items():
+            self.send_header(nombre, valor)
+        if cuerpo is not None:
+            self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        if cuerpo:
+            self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        # Sin una línea por petición: con cientos en vuelo ahogaría la salida
+        pass
+
+
+class ServidorReplay:
+    """
+    Servidor HTTP local que reproduce las grabaciones
+
+    Se puede usar como gestor de contexto: arranca en un hilo en segundo
+    plano al entrar y se detiene al salir.
+
+    Attributes:
+        grabaciones (Dict[str, Grabacion]): Grabaciones por ruta
+        latencia (float): Segundos de espera antes de cada respuesta
+        jitter (float): Variación aleatoria máxima de la latencia
+        tasa_error (float): Probabilidad de responder 503
+        tasa_429 (float): Probabilidad de responder 429 con Retry-After
+        retry_after (float): Segundos del header Retry-After
+        estadisticas (Dict[int, int]): Respuestas enviadas por código
+    """
+
+    def __init__(self, directorio: str = DIRECTORIO_GRABACIONES, latencia: float = 0.0,
+                 jitter: float = 0.0, tasa_error: float = 0.0, tasa_429: float = 0.0,
+                 retry_after: float = 1.0, semilla: Optional[int] = None,
+                 host: str = '127.0.0.1', puerto: int = 0):
+        if latencia < 0 or jitter < 0:
+            raise ValueError("latencia y jitter no pueden ser negativos")
+        if not 0 <= tasa_error <= 1 or not 0 <= tasa_429 <= 1 or tasa_error + tasa_429 > 1:
+            raise ValueError("tasa_error y tasa_429 deben estar entre 0 y 1 y sumar como máximo 1")
+        self.grabaciones = cargar_grabaciones(directorio)
+        self.latencia = latencia
+        self.jitter = jitter
+        self.tasa_error = tasa_error
+        self.tasa_429 = tasa_429
+        self.retry_after = retry_after
+        self.estadisticas = {}
+
+        self._azar = random.Random(semilla)
+        self._lock = threading.Lock()
+        self._http = ThreadingHTTPServer((host, puerto), _ManejadorReplay, bind_and_activate=False)
+        self._http.daemon_threads = True
+        self._http.request_queue_size = 256
+        self._http.replay = self
+        self._http.server_bind()
+        self._hilo = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        URL base del servidor ('http://127.0.0.1:PUERTO')
+        """
+        host, puerto = self._http.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def iniciar(self) -> 'ServidorReplay':
+        """
+        Arranca el servidor en un hilo en segundo plano
+        """
+        self._http.server_activate()
+        self._hilo = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._hilo.start()
+        print(f"[INFO] Servidor de replay en {self.base_url} con {len(self.grabaciones)} grabaciones")
+        return self
+
+    def detener(self):
+        """
+        Detiene el servidor y cierra el socket
+        """
+        if self._hilo is not None:
+            self._http.shutdown()
+            self._hilo.join()
+            self._hilo = None
+        self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+    def _latencia(self):
+        """
+        Latencia de la próxima respuesta
+        """
+        if not self.jitter:
+            return self.latencia
+        with self._lock:
+            return self.latencia + self._azar.uniform(0, self.jitter)
+
+    def _sortear_falla(self):
+        """
+        Decide si la próxima respuesta es un 429, un 503 o la grabación (None)
+        """
+        if not self.tasa_error and not self.tasa_429:
+            return None
+        with self._lock:
+            sorteo = self._azar.random()
+        if sorteo < self.tasa_429:
+            return 429
+        if sorteo < self.tasa_429 + self.tasa_error:
+            return 503
+        return None
+
+    def _contar(self, status):
+        with self._lock:
+            self.estadisticas[status] = self.estadisticas.get(status, 0) + 1
+
+
+def prueba_carga(servidor: ServidorReplay, busquedas: int = 100, concurrencia: int = 50,
+                 palabra: str = 'laptop', limite: int = 5):
+    """
+    Lanza búsquedas concurrentes contra el servidor y reporta el rendimiento
+
+    MercadoLibre usa el backend asyncio y Amazon el adaptador en hilos. Los
+    productos de ejemplo están desactivados, así que solo cuentan los
+    extraídos de verdad.
+
+    Args:
+        servidor (ServidorReplay): Servidor en marcha
+        busquedas (int): Búsquedas por tienda
+        concurrencia (int): Peticiones en vuelo como máximo
+        palabra (str): Término grabado que se repite en cada búsqueda
+        limite (int): Productos por búsqueda
+    """
+    def ejecutar():
+        scraper = ScrapingMercadoLibre(base_url=servidor.base_url, usar_fallback=False,
+                                       peticiones_por_segundo=10000, rafaga=concurrencia,
+                                       backoff_base=0.05, max_backoff=servidor.retry_after)
+        inicio = time.perf_counter()
+        resultados = asyncio.run(scraper.buscar_productos_lote_async(
+            [palabra] * busquedas, limite, max_concurrencia=concurrencia))
+        resumen = [('mercadolibre (asyncio)', time.perf_counter() - inicio,
+                    sum(len(productos) for productos in resultados))]
+
+        multitienda = BusquedaMultitienda(['amazon'], scraper, max_concurrencia=concurrencia)
+        for adaptador in multitienda.adaptadores:
+            adaptador.base_url = servidor.base_url
+        inicio = time.perf_counter()
+        resultados = multitienda.buscar_lote([palabra] * busquedas, limite)
+        resumen.append(('amazon (hilos)', time.perf_counter() - inicio,
+                        sum(len(productos) for productos in resultados)))
+        return resumen
+
+    with open(os.devnull, 'w') as nulo:
+        with redirect_stdout(nulo):
+            resumen = ejecutar()
+
+    print("=" * 70)
+    print(f"PRUEBA DE CARGA: {busquedas} búsquedas por tienda, {concurrencia} en vuelo")
+    print("=" * 70)
+    for nombre, segundos, productos in resumen:
+        print(f"{nombre:<25} {segundos:8.2f} s {busquedas / segundos:10.1f} búsquedas/s "
+              f"{productos:8d} productos reales")
+    print(f"Respuestas del servidor: {dict(sorted(servidor.estadisticas.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--directorio', default=DIRECTORIO_GRABACIONES,
+                        help='Carpeta de grabaciones')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    grabar_cmd = comandos.add_parser('grabar', help='Graba búsquedas reales')
+    grabar_cmd.add_argument('palabras', nargs='+')
+    grabar_cmd.add_argument('--tiendas', nargs='+', choices=tiendas_registradas())
+
+    comandos.add_parser('fixtures', help='Graba las páginas de fixtures/')
+
+    for nombre in ('servir', 'carga'):
+        comando = comandos.add_parser(nombre, help='Sirve las grabaciones' if nombre == 'servir'
+                                      else 'Prueba de carga contra el servidor local')
+        comando.add_argument('--puerto', type=int, default=8765 if nombre == 'servir' else 0)
+        comando.add_argument('--latencia', type=float, default=0.0)
+        comando.add_argument('--jitter', type=float, default=0.0)
+        comando.add_argument('--tasa-error', type=float, default=0.0)
+        comando.add_argument('--tasa-429', type=float, default=0.0)
+        comando.add_argument('--retry-after', type=float, default=1.0)
+        comando.add_argument('--semilla', type=int, default=2024)
+    carga_cmd = comandos.choices['carga']
+    carga_cmd.add_argument('--busquedas', type=int, default=100)
+    carga_cmd.add_argument('--concurrencia', type=int, default=50)
+    carga_cmd.add_argument('--palabra', default='laptop')
+
+    args = parser.parse_args()
+
+    if args.comando == 'grabar':
+        grabar(args.palabras, args.tiendas, args.directorio)
+        return
+    if args.comando == 'fixtures':
+        importar_fixtures(args.directorio)
+        return
+
+    servidor = ServidorReplay(args.directorio, args.latencia, args.jitter, args.tasa_error,
+                              args.tasa_429, args.retry_after, args.semilla, puerto=args.puerto)
+    if not servidor.grabaciones:
+        print("[WARNING] No hay grabaciones: ejecute 'grabar' o 'fixtures' primero")
+    with servidor:
+        if args.comando == 'carga':
+            prueba_carga(servidor, args.busquedas, args.concurrencia, args.palabra)
+            return
+        print("Ctrl+C para detener")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
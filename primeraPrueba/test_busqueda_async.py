@@ -0,0 +1,121 @@
+"""
+Búsquedas de buscar_productos.py contra servidores locales
+
+Para el lote con asyncio, un servidor asyncio hace de Amazon: sirve una
+página de fixtures/ y falla a propósito para algunas palabras clave. La
+búsqueda síncrona usa el servidor de replay. Nada toca la red.
+"""
+
+import asyncio
+import gzip
+import importlib.util
+import io
+import os
+import urllib.error
+import urllib.parse
+from contextlib import redirect_stdout
+
+import pytest
+
+from producto_Scraper import ScrapingMercadoLibre
+from servidor_replay import ServidorReplay, importar_fixtures
+from tiendas import crear_adaptador
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+_spec = importlib.util.spec_from_file_location(
+    'buscar_productos', os.path.join(DIRECTORIO, 'Nivel Intermedio_OtraSolucion', 'buscar_productos.py'))
+buscar_productos = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(buscar_productos)
+
+with gzip.open(os.path.join(DIRECTORIO, 'fixtures', 'amazon_laptop_16.html.gz')) as _archivo:
+    PAGINA = _archivo.read()
+
+
+async def _servir(lector, escritor):
+    """
+    Responde una petición: 'cerrada' corta la conexión, 'ausente' da 404,
+    'corrupta' anuncia gzip con un cuerpo que no lo es y cualquier otra
+    palabra recibe la página de Amazon
+    """
+    linea = await lector.readline()
+    while await lector.readline() not in (b'\r\n', b'\n', b''):
+        pass
+    consulta = urllib.parse.parse_qs(urllib.parse.urlsplit(linea.split()[1].decode()).query)
+    palabra = consulta['k'][0]
+
+    if palabra == 'cerrada':
+        escritor.close()
+        return
+    extra = ''
+    if palabra == 'ausente':
+        estado, cuerpo = '404 Not Found', b'no existe'
+    elif palabra == 'corrupta':
+        estado, cuerpo, extra = '200 OK', b'no es gzip', 'Content-Encoding: gzip\r\n'
+    else:
+        estado, cuerpo = '200 OK', PAGINA
+    escritor.write(f"HTTP/1.1 {estado}\r\nContent-Type: text/html; charset=utf-8\r\n{extra}"
+                   f"Content-Length: {len(cuerpo)}\r\nConnection: close\r\n\r\n".encode() + cuerpo)
+    await escritor.drain()
+    escritor.close()
+
+
+def _buscar_lote(palabras):
+    async def ejecutar():
+        servidor = await asyncio.start_server(_servir, '127.0.0.1', 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        scraper = ScrapingMercadoLibre(usar_fallback=False, peticiones_por_segundo=1000, rafaga=10)
+        tienda = crear_adaptador('amazon', scraper)
+        tienda.base_url = f"http://127.0.0.1:{puerto}"
+        async with servidor:
+            return await buscar_productos.buscar_lote_async(palabras, tienda, modo='flujo')
+
+    return asyncio.run(ejecutar())
+
+
+def test_lote_async_extrae_cada_busqueda(capsys):
+    fallidas = _buscar_lote(['laptop', 'portatil'])
+
+    salida = capsys.readouterr().out
+    assert fallidas == []
+    assert salida.count('Resultados de búsqueda para:') == 2
+    assert salida.count(f"\nProducto {buscar_productos.LIMITE}:") == 2
+    assert f"\nProducto {buscar_productos.LIMITE + 1}:" not in salida
+
+
+def test_lote_async_informa_fallos_por_palabra(capsys):
+    fallidas = _buscar_lote(['laptop', 'cerrada', 'ausente', 'corrupta', 'laptop'])
+
+    salida = capsys.readouterr().out
+    assert [palabra for palabra, _ in fallidas] == ['cerrada', 'ausente', 'corrupta']
+    assert isinstance(dict(fallidas)['ausente'], urllib.error.HTTPError)
+    # Un error que no es de red (cuerpo gzip inválido) tampoco se escapa del lote
+    assert not isinstance(dict(fallidas)['corrupta'], OSError)
+    for palabra in ('cerrada', 'ausente', 'corrupta'):
+        assert f"Error al buscar '{palabra}'" in salida
+    assert "3 de 5 búsquedas fallaron" in salida
+    # Las búsquedas que fallan no cancelan a las demás
+    assert salida.count('Resultados de búsqueda para: laptop') == 2
+
+
+@pytest.mark.parametrize('modo', ['flujo', 'bs4'])
+def test_buscar_productos_con_la_firma_original(tmp_path, monkeypatch, capsys, modo):
+    if modo == 'bs4':
+        pytest.importorskip('bs4')
+    with redirect_stdout(io.StringIO()):
+        importar_fixtures(str(tmp_path))
+    monkeypatch.setattr(buscar_productos, 'MODO_PARSEO', modo)
+    monkeypatch.setattr(buscar_productos, '_tienda', None)
+
+    with redirect_stdout(io.StringIO()):
+        servidor = ServidorReplay(str(tmp_path)).iniciar()
+    monkeypatch.setattr(buscar_productos, 'URL_BASE', servidor.base_url)
+    try:
+        buscar_productos.buscar_productos('laptop')
+    finally:
+        servidor.detener()
+    salida = capsys.readouterr().out
+
+    assert 'Resultados de búsqueda para: laptop' in salida
+    assert f"\nProducto {buscar_productos.LIMITE}:" in salida
+    assert f"\nProducto {buscar_productos.LIMITE + 1}:" not in salida
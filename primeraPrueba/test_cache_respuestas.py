@@ -0,0 +1,78 @@
+"""
+Caché de respuestas sobre una base SQLite en memoria
+
+El reloj se sustituye por uno manual para probar TTL y LRU sin esperas.
+"""
+
+import types
+
+import pytest
+
+import cache_respuestas
+from cache_respuestas import CacheRespuestas
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def time(self):
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = _Reloj()
+    monkeypatch.setattr(cache_respuestas, 'time', types.SimpleNamespace(time=reloj.time))
+    return reloj
+
+
+def test_entrada_expira_al_superar_el_ttl(reloj):
+    cache = CacheRespuestas(':memory:', ttl=60)
+    cache.guardar('https://a.test/laptop', '<html>', etag='"v1"')
+
+    reloj.ahora += 59
+    assert cache.obtener('https://a.test/laptop').vigente
+
+    reloj.ahora += 1
+    entrada = cache.obtener('https://a.test/laptop')
+    # Expirada pero no borrada: se conserva para revalidarla con el ETag
+    assert not entrada.vigente
+    assert entrada.headers_condicionales() == {'If-None-Match': '"v1"'}
+
+
+def test_refrescar_reinicia_el_ttl(reloj):
+    cache = CacheRespuestas(':memory:', ttl=60)
+    cache.guardar('https://a.test/laptop', '<html>')
+
+    reloj.ahora += 100
+    cache.refrescar('https://a.test/laptop')
+    reloj.ahora += 30
+    assert cache.obtener('https://a.test/laptop').vigente
+
+
+def test_desaloja_la_entrada_usada_hace_mas_tiempo(reloj):
+    cache = CacheRespuestas(':memory:', max_bytes=250)
+    for nombre in 'abc':
+        reloj.ahora += 1
+        cache.guardar(f'https://a.test/{nombre}', nombre * 100)
+        if nombre == 'b':
+            # 'a' se lee después de guardar 'b': la menos usada pasa a ser 'b'
+            reloj.ahora += 1
+            cache.obtener('https://a.test/a')
+
+    assert cache.obtener('https://a.test/a') is not None
+    assert cache.obtener('https://a.test/b') is None
+    assert cache.obtener('https://a.test/c') is not None
+
+
+def test_no_guarda_cuerpos_mayores_que_max_bytes():
+    cache = CacheRespuestas(':memory:', max_bytes=10)
+    cache.guardar('https://a.test/grande', 'x' * 11)
+    assert cache.obtener('https://a.test/grande') is None
+
+
+def test_clave_ignora_mayusculas_puerto_por_defecto_y_orden_de_parametros():
+    cache = CacheRespuestas(':memory:')
+    cache.guardar('HTTPS://A.test:443/laptop?b=2&a=1#resultados', '<html>')
+    assert cache.obtener('https://a.test/laptop?a=1&b=2').cuerpo == '<html>'
@@ -0,0 +1,200 @@
+"""
+Descarga de listados contra el servidor de replay local
+
+El servidor sirve las páginas de fixtures/ (gzip, ETag, 304 y 429 incluidos),
+así que la caché, las conexiones persistentes, la descompresión incremental y
+los reintentos se prueban sin tocar la red.
+"""
+
+import email.utils
+import gzip
+import io
+import os
+import random
+import socket
+import time
+import urllib.error
+import zlib
+from contextlib import redirect_stdout
+
+import pytest
+
+from cache_respuestas import CacheRespuestas
+from producto_Scraper import DecodificadorContenido, LimitadorPeticiones, MetricasBusqueda, ScrapingMercadoLibre
+from servidor_replay import DIRECTORIO_FIXTURES, ServidorReplay, guardar_grabacion, importar_fixtures
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    with redirect_stdout(io.StringIO()):
+        importar_fixtures(str(tmp_path))
+        with ServidorReplay(str(tmp_path)) as servidor:
+            yield servidor
+
+
+def _scraper(servidor, **opciones):
+    return ScrapingMercadoLibre(base_url=servidor.base_url, usar_fallback=False,
+                                peticiones_por_segundo=1000, rafaga=10, **opciones)
+
+
+def _buscar(scraper, palabra='laptop', limite=5):
+    with redirect_stdout(io.StringIO()):
+        return scraper.buscar_productos_con_metricas(palabra, limite)
+
+
+def test_busqueda_corta_guarda_la_pagina_en_cache(servidor):
+    scraper = _scraper(servidor, cache=CacheRespuestas(':memory:'))
+
+    primeros, metricas = _buscar(scraper)
+    segundos, metricas_cache = _buscar(scraper)
+
+    assert len(primeros) == 5 and segundos == primeros
+    # La búsqueda se detuvo en el producto 5, pero la página quedó completa en caché
+    assert servidor.estadisticas == {200: 1}
+    assert metricas_cache.contadores['cache_aciertos'] == 1
+    pagina = scraper.cache.obtener(metricas.url).cuerpo
+    assert len(list(scraper.extraer_productos(pagina, 1000))) == 200
+
+
+def test_busqueda_corta_devuelve_la_conexion_al_pool(tmp_path):
+    # Relleno que no se comprime: el cuerpo ocupa varias lecturas del socket
+    with gzip.open(os.path.join(DIRECTORIO_FIXTURES, 'mercadolibre_laptop_200.html.gz'), 'rt') as archivo:
+        html_content = archivo.read()
+    relleno = random.Random(0).randbytes(150_000).hex()
+    html_content = html_content.replace('</body>', f'<!-- {relleno} --></body>')
+
+    guardar_grabacion(str(tmp_path), ScrapingMercadoLibre().construir_url('laptop'), html_content)
+
+    with redirect_stdout(io.StringIO()), ServidorReplay(str(tmp_path)) as servidor:
+        scraper = _scraper(servidor)
+        _, primera = _buscar(scraper)
+        _, segunda = _buscar(scraper)
+
+    assert servidor.estadisticas == {200: 2}
+    assert primera.contadores['conexiones_nuevas'] == 1
+    assert segunda.contadores.get('conexiones_nuevas', 0) == 0
+    assert segunda.contadores['conexiones_reutilizadas'] == 1
+
+
+def test_pagina_expirada_se_revalida_con_304(servidor):
+    scraper = _scraper(servidor, cache=CacheRespuestas(':memory:', ttl=0))
+
+    primeros, _ = _buscar(scraper)
+    segundos, metricas = _buscar(scraper)
+
+    assert segundos == primeros
+    assert servidor.estadisticas == {200: 1, 304: 1}
+    assert metricas.contadores['cache_revalidadas'] == 1
+    assert metricas.contadores.get('bytes_recibidos', 0) == 0
+
+
+def test_conexion_inactiva_caducada_no_se_reutiliza(servidor):
+    scraper = _scraper(servidor, tiempo_inactividad=0)
+
+    _buscar(scraper, limite=1000)
+    _, metricas = _buscar(scraper, limite=1000)
+
+    assert metricas.contadores['conexiones_nuevas'] == 1
+    assert metricas.contadores.get('conexiones_reutilizadas', 0) == 0
+
+
+def test_conexion_cerrada_por_el_servidor_se_reemplaza(servidor):
+    scraper = _scraper(servidor)
+    _buscar(scraper, limite=1000)
+
+    # Simula el cierre del keep-alive por el servidor mientras estaba inactiva
+    for conexiones in scraper.pool._inactivas.values():
+        for conexion, _ in conexiones:
+            conexion.sock.shutdown(socket.SHUT_RDWR)
+
+    productos, metricas = _buscar(scraper, limite=1000)
+    assert len(productos) == 200
+    assert metricas.contadores['conexiones_reutilizadas'] == 1
+    assert metricas.contadores['conexiones_nuevas'] == 1
+
+
+@pytest.mark.parametrize('tamano_bloque', [1, 7, 4096])
+def test_decodificacion_incremental_con_bloques_que_cortan_caracteres(servidor, tamano_bloque):
+    with gzip.open(os.path.join(DIRECTORIO_FIXTURES, 'mercadolibre_laptop_200.html.gz'), 'rt',
+                   encoding='utf-8') as archivo:
+        esperado = archivo.read()
+    scraper = _scraper(servidor)
+    metricas = MetricasBusqueda()
+
+    with scraper.pool.abrir(scraper.construir_url('laptop'), scraper._obtener_headers()) as respuesta:
+        assert respuesta.getheader('Content-Encoding') == 'gzip'
+        fragmentos = list(scraper._iterar_texto(respuesta, metricas, tamano_bloque))
+
+    assert ''.join(fragmentos) == esperado
+    assert len(fragmentos) > 1 and any(ord(c) > 127 for c in esperado)
+
+
+@pytest.mark.parametrize('comprimir', [
+    lambda datos: gzip.compress(datos),
+    lambda datos: zlib.compress(datos),
+    lambda datos: zlib.compress(datos)[2:-4],
+], ids=['gzip', 'deflate-zlib', 'deflate-crudo'])
+def test_decodificador_por_bloques_de_un_byte(comprimir):
+    datos = 'Portátil 15" ñandú €'.encode('utf-8') * 50
+    codificacion = 'gzip' if comprimir(b'')[:2] == b'\x1f\x8b' else 'deflate'
+    decodificador = DecodificadorContenido(codificacion)
+
+    comprimido = comprimir(datos)
+    partes = [decodificador.descomprimir(comprimido[i:i + 1]) for i in range(len(comprimido))]
+    assert b''.join(partes) + decodificador.finalizar() == datos
+
+
+def test_decodificador_rechaza_codificaciones_no_soportadas():
+    with pytest.raises(ValueError):
+        DecodificadorContenido('compress')
+
+
+def test_limitador_permite_la_rafaga_y_luego_espacia_peticiones():
+    limitador = LimitadorPeticiones(10, rafaga=2)
+    assert limitador.reservar('a.test') == 0
+    assert limitador.reservar('a.test') == 0
+    assert limitador.reservar('a.test') == pytest.approx(0.1, abs=0.01)
+    # Cada host tiene su propia cubeta
+    assert limitador.reservar('b.test') == 0
+
+
+def test_penalizar_frena_al_host_durante_la_pausa():
+    limitador = LimitadorPeticiones(10, rafaga=5)
+    limitador.penalizar('a.test', 2.0)
+    assert limitador.reservar('a.test') == pytest.approx(2.1, abs=0.01)
+    assert limitador.reservar('b.test') == 0
+
+
+def test_backoff_respeta_retry_after_y_max_backoff():
+    scraper = ScrapingMercadoLibre(backoff_base=1.0, max_backoff=10.0)
+    fecha = email.utils.formatdate(time.time() + 5, usegmt=True)
+
+    assert scraper._calcular_backoff(0, '3') == 3.0
+    assert scraper._calcular_backoff(0, '120') == 10.0
+    assert 3.5 <= scraper._calcular_backoff(0, fecha) <= 5.0
+    for intento in range(6):
+        techo = min(10.0, 2 ** intento)
+        assert techo / 2 <= scraper._calcular_backoff(intento, 'mañana') <= techo
+
+
+def test_429_se_reintenta_tras_retry_after(tmp_path):
+    with redirect_stdout(io.StringIO()):
+        importar_fixtures(str(tmp_path))
+        servidor = ServidorReplay(str(tmp_path), tasa_429=1.0, retry_after=0.1).iniciar()
+    try:
+        scraper = _scraper(servidor, max_reintentos=2)
+        url = scraper.construir_url('laptop')
+        metricas = MetricasBusqueda('laptop', url)
+
+        inicio = time.monotonic()
+        with redirect_stdout(io.StringIO()), pytest.raises(urllib.error.HTTPError) as error:
+            list(scraper.iterar_html(url, scraper.limitador, metricas))
+        transcurrido = time.monotonic() - inicio
+    finally:
+        servidor.detener()
+
+    assert error.value.code == 429
+    assert servidor.estadisticas == {429: 3}
+    assert metricas.contadores['reintentos'] == 2
+    # Dos pausas de Retry-After aplicadas a través del limitador
+    assert transcurrido >= 0.2
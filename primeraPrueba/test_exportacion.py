@@ -0,0 +1,55 @@
+"""
+Escritura por lotes y rotación por tamaño del exportador
+"""
+
+import csv
+import json
+
+import pytest
+
+from exportacion import ExportadorProductos
+from precios import Precio
+
+
+def _producto(numero):
+    return {'id': numero, 'titulo': f'Laptop {numero}', 'precio': Precio(189900000 + numero),
+            'url': f'https://articulo.mercadolibre.com.co/MCO-{100000 + numero}-laptop-_JM'}
+
+
+def test_rota_al_superar_max_bytes(tmp_path):
+    ruta_base = str(tmp_path / 'productos')
+    with ExportadorProductos(ruta_base, 'csv', columnas=['id', 'titulo', 'precio'],
+                             tamano_lote=2, max_bytes=60) as exportador:
+        exportador.escribir_muchos(_producto(numero) for numero in range(1, 8))
+
+    assert exportador.exportados == 7
+    # Cada lote de 2 filas más el encabezado supera 60 bytes: un archivo por lote
+    assert exportador.archivos == [f"{ruta_base}-{indice:05d}.csv" for indice in range(4)]
+
+    filas = []
+    for ruta in exportador.archivos:
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            lector = csv.reader(archivo)
+            assert next(lector) == ['id', 'titulo', 'precio']
+            filas.extend(lector)
+    assert [fila[0] for fila in filas] == [str(numero) for numero in range(1, 8)]
+    assert filas[0] == ['1', 'Laptop 1', '1899000.01']
+
+
+def test_no_escribe_hasta_completar_un_lote(tmp_path):
+    exportador = ExportadorProductos(str(tmp_path / 'productos'), 'jsonl', tamano_lote=3)
+    exportador.escribir(_producto(1), palabra_clave='laptop')
+    exportador.escribir(_producto(2), palabra_clave='laptop')
+    assert exportador.archivos == [] and exportador.exportados == 0
+
+    exportador.cerrar()
+    with open(exportador.archivos[0], encoding='utf-8') as archivo:
+        filas = [json.loads(linea) for linea in archivo]
+    assert [fila['id'] for fila in filas] == [1, 2]
+    assert filas[0]['precio_unidades_menores'] == 189900001
+    assert filas[0]['palabra_clave'] == 'laptop'
+
+
+def test_rechaza_columnas_desconocidas(tmp_path):
+    with pytest.raises(ValueError):
+        ExportadorProductos(str(tmp_path / 'productos'), columnas=['titulo', 'descuento'])
@@ -0,0 +1,57 @@
+"""
+Detección de cambios del historial de precios sobre SQLite en memoria
+"""
+
+from historial_precios import HistorialPrecios, id_producto_desde_url
+from precios import Precio
+
+_URL = 'https://articulo.mercadolibre.com.co/MCO-{}-laptop-_JM?tracking_id=abc'
+
+
+def _producto(numero, precio):
+    return {'titulo': f'Laptop {numero}', 'precio': precio, 'url': _URL.format(100000 + numero)}
+
+
+def test_solo_registra_productos_nuevos_o_con_precio_distinto():
+    historial = HistorialPrecios(':memory:', tamano_lote=2)
+
+    cambios = historial.registrar([_producto(1, Precio(100000)), _producto(2, Precio(200000)),
+                                   _producto(3, Precio(300000))], tienda='mercadolibre')
+    assert [(c.id_producto, c.anterior) for c in cambios] == [
+        ('MCO-100001', None), ('MCO-100002', None), ('MCO-100003', None)]
+
+    assert historial.registrar([_producto(1, Precio(100000)), _producto(2, Precio(200000))]) == []
+
+    cambios = historial.registrar([_producto(1, Precio(100000)), _producto(2, Precio(150000))])
+    assert len(cambios) == 1
+    assert cambios[0].anterior == Precio(200000) and cambios[0].actual == Precio(150000)
+    assert cambios[0].variacion == -50000 and cambios[0].porcentaje == -25.0
+
+    assert [precio for _, precio in historial.historial('MCO-100002')] == [Precio(200000), Precio(150000)]
+    assert [c.id_producto for c in historial.mayores_bajadas()] == ['MCO-100002']
+
+
+def test_cambio_de_moneda_cuenta_como_cambio_sin_variacion():
+    historial = HistorialPrecios(':memory:')
+    historial.registrar([_producto(1, Precio(100000, 'COP'))])
+
+    cambio, = historial.registrar([_producto(1, Precio(100000, 'USD'))])
+    assert cambio.variacion is None
+
+
+def test_ignora_productos_sin_id_o_sin_precio_y_usa_la_ultima_aparicion():
+    historial = HistorialPrecios(':memory:')
+    cambios = historial.registrar([
+        {'titulo': 'Sin URL', 'precio': Precio(1)},
+        _producto(1, None),
+        _producto(2, Precio(100000)),
+        _producto(2, Precio(90000)),
+    ])
+    assert [(c.id_producto, c.actual) for c in cambios] == [('MCO-100002', Precio(90000))]
+
+
+def test_id_estable_desde_la_url():
+    assert id_producto_desde_url(_URL.format(123456)) == 'MCO-123456'
+    assert id_producto_desde_url('https://www.mercadolibre.com.co/laptop/p/MCO123456?wid=MCO987654') == 'MCO-987654'
+    assert id_producto_desde_url('https://www.amazon.com/Laptop/dp/B0ABCDEFGH/ref=sr_1_1') == 'AMZN-B0ABCDEFGH'
+    assert id_producto_desde_url('https://www.amazon.com/s?k=laptop') is None
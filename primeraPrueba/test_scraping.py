@@ -0,0 +1,318 @@
+"""
+Pruebas sin red sobre el corpus sintético de fixtures/
+
+Cubren el extractor de una pasada (y que sus precios coinciden con los de la
+versión original), los ganchos de AdaptadorTienda, Precio.desde_texto, las
+variantes de numeroFrecuente y el orden de entrega de PipelineParseo con
+palabras clave repetidas.
+"""
+
+import html
+import io
+import os
+import random
+import re
+import sys
+from array import array
+from contextlib import redirect_stdout
+
+import pytest
+
+import numeroFrecuente
+from benchmark_scraping import (DIRECTORIO_FIXTURES, PATRONES_PRECIO_ORIGINAL, cargar_corpus,
+                                generar_fixtures)
+from numeroFrecuente import (FrecuenciaTracker, VentanaFrecuencia, VentanaTemporalFrecuencia,
+                             numero_mas_frecuente, numero_mas_frecuente_archivo,
+                             verificar_aproximacion)
+from pipeline_parseo import PipelineParseo
+from precios import Precio
+from producto_Scraper import MetricasBusqueda, ScrapingMercadoLibre
+from tiendas import AdaptadorAmazon, AdaptadorTienda, dividir_tarjetas
+
+CORPUS = dict(cargar_corpus())
+PAGINAS_MERCADOLIBRE = sorted(nombre for nombre in CORPUS if nombre.startswith('mercadolibre'))
+PAGINAS_AMAZON = sorted(nombre for nombre in CORPUS if nombre.startswith('amazon'))
+
+
+def _tarjetas(nombre):
+    """
+    Tarjetas de una página del corpus: el sufijo del nombre ('_50')
+    """
+    return int(nombre.rsplit('_', 1)[1])
+
+
+@pytest.fixture(scope='module')
+def scraper():
+    scraper = ScrapingMercadoLibre(usar_fallback=False)
+    yield scraper
+    scraper.cerrar()
+
+
+def test_fixtures_reproducibles(tmp_path):
+    # Lo que se comprueba abajo depende de cómo generar_fixtures arma las tarjetas
+    with redirect_stdout(io.StringIO()):
+        generar_fixtures(str(tmp_path))
+    for nombre in os.listdir(tmp_path):
+        with open(tmp_path / nombre, 'rb') as generado, \
+                open(os.path.join(DIRECTORIO_FIXTURES, nombre), 'rb') as guardado:
+            assert generado.read() == guardado.read(), nombre
+
+
+# Extractor
+
+@pytest.mark.parametrize('nombre', PAGINAS_MERCADOLIBRE)
+def test_extractor_mercadolibre(scraper, nombre):
+    tarjetas = _tarjetas(nombre)
+    productos = list(scraper.extraer_productos(CORPUS[nombre], 1000))
+
+    assert len(productos) == tarjetas
+    # Una de cada nueve tarjetas es publicidad sin precio; no desplaza a las demás
+    assert [producto['precio'] is None for producto in productos] == [i % 9 == 4 for i in range(tarjetas)]
+    for producto in productos:
+        assert len(producto['titulo']) >= 15
+        assert '&amp;' not in producto['titulo']
+        assert producto['url'].startswith('https://articulo.mercadolibre.com.co/MCO-')
+        assert producto['imagen'].endswith('-O.webp')
+        assert producto['vendedor'] and not producto['vendedor'].startswith('Vendido')
+        if producto['precio'] is not None:
+            assert producto['precio'].moneda == 'COP'
+            assert producto['precio'].unidades_menores % 100_000 == 0
+
+
+@pytest.mark.parametrize('nombre', PAGINAS_MERCADOLIBRE)
+def test_extractor_en_flujo_igual_que_completo(scraper, nombre):
+    html = CORPUS[nombre]
+    azar = random.Random(nombre)
+    fragmentos, inicio = [], 0
+    while inicio < len(html):
+        tamano = azar.randint(1, 20_000)
+        fragmentos.append(html[inicio:inicio + tamano])
+        inicio += tamano
+
+    for limite in (1, 7, 1000):
+        assert list(scraper.extraer_en_flujo(iter(fragmentos), limite)) == \
+               list(scraper.extraer_productos(html, limite))
+
+
+def test_hacer_scraping_numera_hasta_el_limite(scraper):
+    with redirect_stdout(io.StringIO()):
+        productos = scraper._hacer_scraping(CORPUS['mercadolibre_laptop_50'], 20)
+    assert [producto['id'] for producto in productos] == list(range(1, 21))
+
+
+@pytest.mark.parametrize('nombre', PAGINAS_AMAZON)
+def test_extractor_amazon(scraper, nombre):
+    tarjetas = _tarjetas(nombre)
+    html = CORPUS[nombre]
+    fragmentos = (html[inicio:inicio + 4096] for inicio in range(0, len(html), 4096))
+    productos = list(AdaptadorAmazon(scraper).extraer_productos(
+        fragmentos, 'https://www.amazon.com.co/s?k=laptop', 1000))
+
+    assert len(productos) == tarjetas
+    assert [producto['precio'] is None for producto in productos] == [i % 7 == 3 for i in range(tarjetas)]
+    for i, producto in enumerate(productos):
+        assert producto['url'].startswith('https://www.amazon.com.co/dp/B0')
+        assert producto['url'].endswith(f'/ref=sr_1_{i + 1}')
+        assert producto['imagen'].startswith('https://m.media-amazon.com/images/I/')
+
+
+class _TiendaMinima(AdaptadorTienda):
+    """
+    Tienda de prueba que solo define los ganchos
+    """
+
+    nombre = 'minima'
+
+    def construir_url(self, palabra_clave):
+        return f"http://tienda.test/buscar?q={palabra_clave}"
+
+    def localizar_tarjetas(self, fragmentos):
+        return dividir_tarjetas(fragmentos, 'class="item"')
+
+    def extraer_campos(self, tarjeta, url_base, metricas=None):
+        titulo = re.search(r'<b>([^<]*)</b>', tarjeta)
+        if titulo is None:
+            return None
+        return {'titulo': titulo.group(1), 'precio': None, 'url': None, 'imagen': None, 'vendedor': None}
+
+
+def test_adaptador_nuevo_solo_define_ganchos(scraper):
+    html = '<ul>' + ''.join(f'<li class="item"><b>Producto {i}</b></li>' if i != 2 else '<li class="item"></li>'
+                            for i in range(6)) + '</ul>'
+    fragmentos = (html[inicio:inicio + 5] for inicio in range(0, len(html), 5))
+    metricas = MetricasBusqueda()
+
+    productos = list(_TiendaMinima(scraper).extraer_productos(fragmentos, '', 4, metricas))
+
+    # La tarjeta sin título no cuenta para el límite
+    assert [producto['titulo'] for producto in productos] == [f'Producto {i}' for i in (0, 1, 3, 4)]
+    assert metricas.etapas['patron'] > 0
+    with pytest.raises(TypeError):
+        type('SinGanchos', (AdaptadorTienda,), {'construir_url': _TiendaMinima.construir_url})(scraper)
+
+
+@pytest.mark.parametrize('nombre', PAGINAS_MERCADOLIBRE)
+def test_precios_iguales_que_la_version_original(scraper, nombre):
+    # La velocidad frente a la versión original se compara en benchmark_scraping.py
+    html = CORPUS[nombre]
+    originales = [scraper._limpiar_precio(texto) for texto in PATRONES_PRECIO_ORIGINAL[0].findall(html)]
+
+    productos = list(scraper.extraer_productos(html, 1000))
+
+    assert [producto['precio'] for producto in productos if producto['precio'] is not None] == originales
+
+
+def test_entidades_de_espacio_igual_que_html_unescape(scraper):
+    codigos = [codigo for codigo in range(sys.maxunicode + 1) if chr(codigo).isspace()]
+    for codigo in codigos:
+        for entidad in (f'&#{codigo};', f'&#x{codigo:X};', f'&#00{codigo}'):
+            texto = f'Laptop{entidad}Gamer &amp; Pro'
+            esperado = ' '.join(html.unescape(texto).split())
+            assert scraper.limpiar_texto(texto) == esperado, entidad
+
+
+# Precio.desde_texto
+
+@pytest.mark.parametrize('texto, moneda, unidades_menores', [
+    ('$ 1.899.000', 'COP', 189_900_000),
+    ('2.499.', 'COP', 249_900),
+    ('1,299', 'COP', 129_900),
+    ('12.50', 'COP', 125_000),
+    ('1.234,5', 'COP', 123_450),
+    ('12.50', 'MXN', 1_250),
+    ('1,299.99', 'USD', 129_999),
+    ('1,50', 'USD', 15_000),
+    ('1,234.565', 'USD', 123_457),
+    ('$ 12.990', 'CLP', 12_990),
+    ('R$ 3.199,90', 'BRL', 319_990),
+])
+def test_precio_desde_texto(texto, moneda, unidades_menores):
+    assert Precio.desde_texto(texto, moneda) == Precio(unidades_menores, moneda)
+
+
+@pytest.mark.parametrize('texto', ['', None, 'Precio no disponible', '.,', '$'])
+def test_precio_desde_texto_sin_importe(texto):
+    assert Precio.desde_texto(texto, 'COP') is None
+
+
+def test_precio_formato_local():
+    assert str(Precio(189_900_000, 'COP')) == '$1.899.000 COP'
+    assert str(Precio(129_999, 'USD')) == '$1,299.99 USD'
+    assert Precio.desde_texto(str(Precio(319_990, 'BRL')), 'BRL') == Precio(319_990, 'BRL')
+
+
+def test_precio_se_ordena_solo_dentro_de_una_moneda():
+    assert Precio(50_000, 'COP') < Precio(100_000, 'COP') <= Precio(100_000, 'COP')
+    assert min([Precio(300, 'USD'), Precio(100, 'USD'), Precio(200, 'USD')]) == Precio(100, 'USD')
+    for comparar in (lambda a, b: a < b, lambda a, b: a <= b, lambda a, b: a > b, lambda a, b: a >= b):
+        with pytest.raises(TypeError):
+            comparar(Precio(100, 'USD'), Precio(50_000, 'COP'))
+    with pytest.raises(TypeError):
+        sorted([Precio(100, 'USD'), Precio(50_000, 'COP')])
+    assert Precio(100, 'USD') != Precio(100, 'COP')
+
+
+# numeroFrecuente
+
+MODOS_NUMPY = [False] + ([True] if numeroFrecuente.np is not None else [])
+
+
+@pytest.mark.parametrize('usar_numpy', MODOS_NUMPY)
+@pytest.mark.parametrize('valores, esperado', [
+    ([1, 3, 1, 3, 2, 1], 1),
+    ([4, 4, 5, 5], 4),
+    ([-3, 7, -3, 7], -3),
+    ([42], 42),
+])
+def test_numero_mas_frecuente_exacto(valores, esperado, usar_numpy):
+    assert numero_mas_frecuente(valores, usar_numpy=usar_numpy) == esperado
+
+
+def test_numero_mas_frecuente_vacio():
+    with pytest.raises(ValueError):
+        numero_mas_frecuente([])
+
+
+def test_tracker_y_ventanas():
+    tracker = FrecuenciaTracker([1, 3, 1, 3, 2, 1])
+    tracker.remove(1)
+    tracker.add(3)
+    assert tracker.mas_frecuente() == 3
+
+    ventana = VentanaFrecuencia(3)
+    ventana.add_many([1, 3, 1, 3, 2, 1])
+    assert len(ventana) == 3
+    assert ventana.mas_frecuente() == 1
+
+    temporal = VentanaTemporalFrecuencia(10)
+    temporal.add(1, instante=0)
+    temporal.add(1, instante=1)
+    temporal.add(2, instante=8)
+    assert temporal.mas_frecuente(instante=9) == 1
+    assert temporal.mas_frecuente(instante=12) == 2
+
+
+def test_numero_mas_frecuente_aproximado():
+    azar = random.Random(7)
+    valores = [7] * 3000 + [azar.randint(1, 1000) for _ in range(20_000)]
+    azar.shuffle(valores)
+
+    assert numero_mas_frecuente(valores, aproximado=64) == 7
+    verificacion = verificar_aproximacion(valores, k=64)
+    assert verificacion['coincide'] and verificacion['dentro_de_cota']
+
+
+def test_numero_mas_frecuente_archivo(tmp_path):
+    azar = random.Random(3)
+    valores = [azar.randint(-50, 50) for _ in range(20_003)]
+    ruta = tmp_path / 'valores.bin'
+    ruta.write_bytes(array('q', valores).tobytes())
+    esperado = numero_mas_frecuente(valores, usar_numpy=False)
+
+    assert numero_mas_frecuente_archivo(str(ruta), procesos=2, tamano_bloque=1000) == esperado
+    assert numero_mas_frecuente_archivo(array('q', valores).tobytes(), procesos=2,
+                                        tamano_bloque=333) == esperado
+    # Buffers con formato propio: los tramos se cortan en bytes, no en elementos
+    assert numero_mas_frecuente_archivo(array('q', valores), procesos=2, tamano_bloque=333) == esperado
+    assert numero_mas_frecuente_archivo(memoryview(array('q', valores)), procesos=2,
+                                        tamano_bloque=333) == esperado
+
+
+# PipelineParseo
+
+def _pipeline_simulado(monkeypatch, ordenado):
+    """
+    Pipeline cuyo scraper "descarga" la página de 50 productos del corpus; la
+    palabra 'corto' solo tiene una página y la siguiente llega vacía
+    """
+    llena = CORPUS['mercadolibre_laptop_50'].encode()
+    vacia = b'<html><body>Sin resultados</body></html>'
+
+    def descargar(url, limitador, metricas):
+        return vacia if 'corto' in url and '_Desde_' in url else llena
+
+    scraper = ScrapingMercadoLibre(usar_fallback=False)
+    monkeypatch.setattr(scraper, 'descargar_bytes', descargar)
+    return PipelineParseo(scraper, hilos_descarga=2, procesos=2, ordenado=ordenado)
+
+
+@pytest.mark.parametrize('ordenado', [True, False])
+def test_pipeline_palabras_repetidas(monkeypatch, ordenado):
+    with redirect_stdout(io.StringIO()), _pipeline_simulado(monkeypatch, ordenado) as pipeline:
+        resultados = pipeline.buscar_lote(['laptop', 'corto', 'laptop'], 200)
+
+    # Cada aparición de 'laptop' tiene sus propias cuatro páginas
+    assert [len(productos) for productos in resultados] == [200, 50, 200]
+    for productos in resultados:
+        assert [producto['id'] for producto in productos] == list(range(1, len(productos) + 1))
+
+
+def test_pipeline_ordenado_entrega_en_orden_de_tareas(monkeypatch):
+    with redirect_stdout(io.StringIO()), _pipeline_simulado(monkeypatch, True) as pipeline:
+        paginas = [(resultado.termino, resultado.desde, len(resultado.productos))
+                   for resultado in pipeline.procesar(['laptop', 'corto', 'laptop'], 200)]
+
+    # La página vacía de 'corto' cierra su listado: las siguientes no se entregan
+    assert paginas == ([(0, desde, 50) for desde in (1, 51, 101, 151)]
+                       + [(1, 1, 50), (1, 51, 0)]
+                       + [(2, desde, 50) for desde in (1, 51, 101, 151)])
@@ -0,0 +1,554 @@
+"""
+Adaptadores de tienda y búsqueda en varias tiendas a la vez
+
+Características técnicas:
+- Interfaz común por tienda (clase abstracta) con ganchos para construir la
+  URL, localizar las tarjetas y leer sus campos; el recorrido en flujo, el
+  límite y las métricas son comunes
+- Registro de adaptadores por nombre (registrar_tienda / crear_adaptador)
+- Descarga, caché, limitador por host, reintentos y métricas compartidos con
+  ScrapingMercadoLibre (solo librerías estándar)
+- Búsqueda concurrente en todas las tiendas con resultados combinados y
+  ordenados por precio para compararlos
+"""
+
+import re
+import urllib.error
+import urllib.parse
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Type
+
+from cliente_async import ClienteAsync
+from precios import Precio
+from producto_Scraper import MetricasBusqueda, Producto, ScrapingMercadoLibre
+
+
+_REGISTRO: Dict[str, Type['AdaptadorTienda']] = {}
+
+
+def registrar_tienda(clase: Type['AdaptadorTienda']) -> Type['AdaptadorTienda']:
+    """
+    Decorador que registra un adaptador con su atributo 'nombre'
+
+    Args:
+        clase (Type[AdaptadorTienda]): Adaptador a registrar
+    Returns:
+        Type[AdaptadorTienda]: La misma clase, para usarlo como decorador
+    """
+    if not clase.nombre:
+        raise ValueError(f"{clase.__name__} no define 'nombre'")
+    _REGISTRO[clase.nombre] = clase
+    return clase
+
+
+def tiendas_registradas() -> List[str]:
+    """
+    Nombres de las tiendas disponibles, en orden de registro
+    """
+    return list(_REGISTRO)
+
+
+def crear_adaptador(nombre: str, scraper: ScrapingMercadoLibre) -> 'AdaptadorTienda':
+    """
+    Instancia el adaptador registrado con 'nombre'
+
+    Args:
+        nombre (str): Nombre de la tienda ('mercadolibre', 'amazon', ...)
+        scraper (ScrapingMercadoLibre): Scraper que aporta la descarga y la limpieza de texto
+    Returns:
+        AdaptadorTienda: Adaptador listo para usar
+    """
+    try:
+        return _REGISTRO[nombre](scraper)
+    except KeyError:
+        raise ValueError(f"Tienda desconocida: '{nombre}'. "
+                         f"Disponibles: {', '.join(_REGISTRO)}") from None
+
+
+_PREFIJO_VENDEDOR_AMAZON = re.compile(r'^(?:vendido\s+por|de|por)\s+', re.IGNORECASE)
+
+
+def limpiar_vendedor_amazon(texto: str) -> str:
+    """
+    Quita el prefijo ('Vendido por', 'de', 'por') del vendedor de una tarjeta de Amazon
+
+    Args:
+        texto (str): Texto del vendedor ya limpio de etiquetas
+    Returns:
+        str: Nombre del vendedor (vacío si no hay)
+    """
+    return _PREFIJO_VENDEDOR_AMAZON.sub('', texto)
+
+
+def dividir_tarjetas(fragmentos: Iterable[str], marca: str) -> Iterator[str]:
+    """
+    Corta en tarjetas de resultado el HTML que llega por fragmentos
+
+    Cada tarjeta va desde la etiqueta que contiene 'marca' hasta la de la
+    siguiente (la última, hasta el final del documento); el texto anterior a
+    la primera se descarta. Solo usa str.find, así que sirve de
+    localizador para cualquier tienda cuyas tarjetas se reconocen por un
+    atributo de su etiqueta de apertura.
+
+    Args:
+        fragmentos (Iterable[str]): Fragmentos de texto HTML en orden
+        marca (str): Texto que solo aparece en la etiqueta de apertura de cada tarjeta
+    Yields:
+        str: HTML de cada tarjeta, en orden
+    """
+    buffer = ''
+    inicio = None
+    desde = 0
+    for fragmento in fragmentos:
+        # Antes de la primera tarjeta solo hace falta conservar la última etiqueta
+        corte = inicio if inicio is not None else max(buffer.rfind('<', 0, desde), 0)
+        buffer = buffer[corte:] + fragmento
+        desde -= corte
+        if inicio is not None:
+            inicio = 0
+        while True:
+            posicion = buffer.find(marca, desde)
+            if posicion == -1:
+                # La marca puede haber quedado partida al final del fragmento
+                desde = max(desde, len(buffer) - len(marca) + 1)
+                break
+            desde = posicion + len(marca)
+            etiqueta = buffer.rfind('<', 0, posicion)
+            # La etiqueta de la tarjeta en curso puede repetir la marca
+            if etiqueta == -1 or (inicio is not None and etiqueta <= inicio):
+                continue
+            if inicio is not None:
+                yield buffer[inicio:etiqueta]
+            inicio = etiqueta
+
+    if inicio is not None:
+        yield buffer[inicio:]
+
+
+class AdaptadorTienda(ABC):
+    """
+    Interfaz de una tienda para BusquedaMultitienda
+
+    Una tienda nueva define 'nombre', 'moneda' y tres ganchos:
+    construir_url, localizar_tarjetas y extraer_campos, y se registra con
+    @registrar_tienda. El recorrido en flujo, el límite de productos y las
+    métricas los pone extraer_productos; la descarga (caché, limitador,
+    reintentos y métricas), el scraper compartido a través de descargar,
+    buscar y buscar_async.
+
+    Attributes:
+        nombre (str): Nombre con el que se registra la tienda
+        moneda (str): Moneda de los precios del sitio
+        scraper (ScrapingMercadoLibre): Infraestructura de descarga y limpieza de texto
+    """
+
+    nombre = ''
+    moneda = 'COP'
+
+    def __init__(self, scraper: ScrapingMercadoLibre):
+        self.scraper = scraper
+
+    @abstractmethod
+    def construir_url(self, palabra_clave: str) -> str:
+        """
+        Genera la URL de búsqueda de una palabra clave
+        """
+
+    @abstractmethod
+    def localizar_tarjetas(self, fragmentos: Iterable[str]) -> Iterator[str]:
+        """
+        Genera el HTML de cada tarjeta de resultado a medida que llegan los fragmentos
+
+        Debe consumir 'fragmentos' solo hasta completar la tarjeta que
+        entrega: extraer_productos deja de pedir tarjetas al alcanzar el
+        límite y la descarga se cierra entonces. dividir_tarjetas sirve si
+        las tarjetas se reconocen por un atributo.
+
+        Args:
+            fragmentos (Iterable[str]): Contenido HTML de la página por fragmentos
+        Yields:
+            str: HTML de cada tarjeta, en orden
+        """
+
+    @abstractmethod
+    def extraer_campos(self, tarjeta: str, url_base: str,
+                       metricas: Optional[MetricasBusqueda] = None) -> Optional[Producto]:
+        """
+        Lee los campos del producto de una tarjeta
+
+        Args:
+            tarjeta (str): HTML de la tarjeta
+            url_base (str): URL de la página, para resolver enlaces relativos
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+                de la lectura de campos
+        Returns:
+            Optional[Producto]: titulo, precio, url, imagen y vendedor, o
+            None si la tarjeta no tiene título
+        """
+
+    def extraer_productos(self, fragmentos: Iterable[str], url_base: str, limite: int,
+                          metricas: Optional[MetricasBusqueda] = None) -> Iterator[Producto]:
+        """
+        Genera los productos de la página hasta alcanzar el límite
+
+        Cada producto se entrega en cuanto se completa su tarjeta y se deja
+        de consumir 'fragmentos' al llegar al límite; buscar cierra entonces
+        la descarga. El tiempo de localizar tarjetas se registra como
+        'patron'.
+
+        Args:
+            fragmentos (Iterable[str]): Contenido HTML de la página por fragmentos
+            url_base (str): URL de la página, para resolver enlaces relativos
+            limite (int): Número máximo de productos
+            metricas (Optional[MetricasBusqueda]): Donde registrar los tiempos
+        Yields:
+            Producto: titulo, precio, url, imagen y vendedor de cada producto
+        """
+        if limite <= 0:
+            return
+        medir = metricas.medir if metricas is not None else lambda etapa: nullcontext()
+
+        emitidos = 0
+        with closing(self.localizar_tarjetas(fragmentos)) as tarjetas:
+            while True:
+                with medir('patron'):
+                    tarjeta = next(tarjetas, None)
+                if tarjeta is None:
+                    return
+                producto = self.extraer_campos(tarjeta, url_base, metricas)
+                if producto is None:
+                    continue
+                yield producto
+                emitidos += 1
+                if emitidos >= limite:
+                    return
+
+    def descargar(self, url: str, metricas: MetricasBusqueda) -> Iterator[str]:
+        """
+        Genera el HTML de una URL por fragmentos con la infraestructura del scraper
+
+        Args:
+            url (str): URL de la página
+            metricas (MetricasBusqueda): Métricas de la búsqueda
+        Yields:
+            str: Fragmentos de contenido HTML
+        """
+        return self.scraper.iterar_html(url, self.scraper.limitador, metricas)
+
+    def buscar(self, palabra_clave: str, limite: int,
+               metricas: Optional[MetricasBusqueda] = None) -> List[Producto]:
+        """
+        Descarga la página de búsqueda y extrae sus productos
+
+        Los errores de descarga se propagan; las métricas no se reportan,
+        eso queda a cargo de quien las creó.
+
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos
+            metricas (Optional[MetricasBusqueda]): Métricas a completar
+        Returns:
+            List[Producto]: Productos extraídos, sin id ni tienda
+        """
+        url = self.construir_url(palabra_clave)
+        metricas = metricas or MetricasBusqueda(palabra_clave, url)
+        with closing(self.descargar(url, metricas)) as fragmentos:
+            return list(self.extraer_productos(fragmentos, url, limite, metricas))
+
+    async def buscar_async(self, palabra_clave: str, limite: int, cliente: ClienteAsync,
+                           metricas: Optional[MetricasBusqueda] = None) -> List[Producto]:
+        """
+        Igual que buscar, pero descarga con el cliente asyncio del bucle actual
+
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos
+            cliente (ClienteAsync): Cliente del bucle de eventos actual
+            metricas (Optional[MetricasBusqueda]): Métricas a completar
+        Returns:
+            List[Producto]: Productos extraídos, sin id ni tienda
+        """
+        url = self.construir_url(palabra_clave)
+        metricas = metricas or MetricasBusqueda(palabra_clave, url)
+        html_content = await self.scraper.descargar_html_async(url, self.scraper.limitador,
+                                                               cliente, metricas)
+        return list(self.extraer_productos((html_content,), url, limite, metricas))
+
+
+@registrar_tienda
+class AdaptadorMercadoLibre(AdaptadorTienda):
+    """
+    MercadoLibre Colombia, con el localizador de tarjetas y la lectura de
+    campos de ScrapingMercadoLibre
+
+    Solo se leen las tarjetas de resultado: el emparejamiento de títulos y
+    precios de las páginas sin tarjetas queda en ScrapingMercadoLibre.
+    """
+
+    nombre = 'mercadolibre'
+    moneda = 'COP'
+
+    def construir_url(self, palabra_clave):
+        return self.scraper.construir_url(palabra_clave)
+
+    def localizar_tarjetas(self, fragmentos):
+        return self.scraper.localizar_tarjetas(fragmentos)
+
+    def extraer_campos(self, tarjeta, url_base, metricas=None):
+        producto = self.scraper.extraer_campos_tarjeta(tarjeta, metricas)
+        return producto if producto['titulo'] else None
+
+
+class _ExtractorAmazon(HTMLParser):
+    """
+    Lee los campos de una tarjeta s-search-result a partir de los eventos de html.parser
+
+    No construye el árbol: solo sigue la profundidad de <div> dentro de la
+    tarjeta abierta y el texto del campo que se está leyendo. Lo que sigue
+    al cierre de la tarjeta se ignora.
+
+    Attributes:
+        producto (Optional[Producto]): Producto de la tarjeta, si tiene título
+    """
+
+    def __init__(self, url_base, moneda):
+        super().__init__(convert_charrefs=True)
+        self.url_base = url_base
+        self.moneda = moneda
+        self.producto = None
+        self._tarjeta = None
+        self._divs = 0
+        self._enlace_titulo = None
+        self._campo = None
+        self._cierre_campo = None
+        self._texto = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._tarjeta is None:
+            if tag == 'div' and ('data-component-type', 's-search-result') in attrs:
+                self._tarjeta = {'titulo': None, 'precio': None, 'url': None, 'imagen': None, 'vendedor': None}
+                self._enlace_titulo = None
+                self._divs = 1
+            return
+
+        atributos = dict(attrs)
+        clases = (atributos.get('class') or '').split()
+        if tag == 'div':
+            self._divs += 1
+        # Cada etiqueta separa palabras
+        if self._campo is not None:
+            self._texto.append(' ')
+        # El precio es solo el texto anterior a la primera etiqueta interna (decimales)
+        if self._campo == 'precio':
+            self._cerrar_campo()
+
+        if self._campo is None:
+            if tag == 'h2' and self._tarjeta['titulo'] is None:
+                self._abrir_campo('titulo', 'h2')
+            elif tag == 'span' and 'a-price-whole' in clases and self._tarjeta['precio'] is None:
+                self._abrir_campo('precio', 'span')
+            elif (tag == 'div' and atributos.get('class') == 'a-row a-size-base a-color-secondary'
+                  and self._tarjeta['vendedor'] is None):
+                self._abrir_campo('vendedor', 'div')
+
+        if tag == 'a' and atributos.get('href'):
+            # El enlace del título es el del producto; si no hay, el primero de la tarjeta
+            if self._campo == 'titulo' and self._enlace_titulo is None:
+                self._enlace_titulo = atributos['href']
+            elif self._tarjeta['url'] is None:
+                self._tarjeta['url'] = atributos['href']
+        elif tag == 'img' and 's-image' in clases and self._tarjeta['imagen'] is None:
+            self._tarjeta['imagen'] = atributos.get('src')
+
+    def handle_endtag(self, tag):
+        if self._tarjeta is None:
+            return
+        if self._campo is not None:
+            self._texto.append(' ')
+        if self._campo == 'precio' or (self._campo is not None and tag == self._cierre_campo[0]
+                                       and (tag != 'div' or self._divs == self._cierre_campo[1])):
+            self._cerrar_campo()
+        if tag == 'div':
+            self._divs -= 1
+            if self._divs == 0:
+                self._cerrar_tarjeta()
+
+    def handle_data(self, data):
+        if self._campo is not None:
+            self._texto.append(data)
+
+    def close(self):
+        super().close()
+        if self._tarjeta is not None:
+            self._cerrar_tarjeta()
+
+    def _abrir_campo(self, campo, etiqueta):
+        self._campo = campo
+        self._cierre_campo = (etiqueta, self._divs)
+        self._texto = []
+
+    def _cerrar_campo(self):
+        texto = ' '.join(''.join(self._texto).split())
+        if self._campo == 'titulo':
+            self._tarjeta['titulo'] = texto or None
+        elif self._campo == 'precio':
+            self._tarjeta['precio'] = Precio.desde_texto(texto, self.moneda)
+        else:
+            self._tarjeta['vendedor'] = limpiar_vendedor_amazon(texto) or None
+        self._campo = None
+        self._texto = []
+
+    def _cerrar_tarjeta(self):
+        if self._campo is not None:
+            self._cerrar_campo()
+        tarjeta, self._tarjeta = self._tarjeta, None
+        if not tarjeta['titulo']:
+            return
+
+        enlace = self._enlace_titulo or tarjeta['url']
+        tarjeta['url'] = urllib.parse.urljoin(self.url_base, enlace) if enlace else None
+        self.producto = tarjeta
+
+
+@registrar_tienda
+class AdaptadorAmazon(AdaptadorTienda):
+    """
+    Amazon Colombia: las tarjetas s-search-result se cortan en flujo por su
+    atributo y sus campos se leen con html.parser
+
+    Attributes:
+        base_url (str): Origen de las búsquedas; se puede cambiar por el de
+            un servidor de replay
+    """
+
+    nombre = 'amazon'
+    moneda = 'COP'
+    base_url = "https://www.amazon.com.co"
+
+    def construir_url(self, palabra_clave):
+        return f"{self.base_url}/s?k={urllib.parse.quote(palabra_clave)}"
+
+    def localizar_tarjetas(self, fragmentos):
+        return dividir_tarjetas(fragmentos, 'data-component-type="s-search-result"')
+
+    def extraer_campos(self, tarjeta, url_base, metricas=None):
+        extractor = _ExtractorAmazon(url_base, self.moneda)
+        with metricas.medir('patron') if metricas is not None else nullcontext():
+            extractor.feed(tarjeta)
+            extractor.close()
+        return extractor.producto
+
+
+class BusquedaMultitienda:
+    """
+    Busca la misma palabra clave en varias tiendas a la vez y combina resultados
+
+    Cada par (palabra, tienda) se descarga en un hilo del pool con la
+    infraestructura del scraper: conexiones keep-alive, caché, limitador por
+    host (cada tienda tiene su propia cubeta) y reintentos. A diferencia de
+    ScrapingMercadoLibre no se generan productos de ejemplo: una tienda que
+    falla simplemente no aporta resultados a la comparación.
+
+    Attributes:
+        scraper (ScrapingMercadoLibre): Infraestructura de descarga compartida
+        adaptadores (List[AdaptadorTienda]): Tiendas consultadas
+        max_concurrencia (int): Descargas simultáneas como máximo
+    """
+
+    def __init__(self, tiendas: Optional[List[str]] = None,
+                 scraper: Optional[ScrapingMercadoLibre] = None,
+                 max_concurrencia: int = 8):
+        if max_concurrencia < 1:
+            raise ValueError("max_concurrencia debe ser al menos 1")
+        self.scraper = scraper or ScrapingMercadoLibre()
+        self.adaptadores = [crear_adaptador(nombre, self.scraper)
+                            for nombre in (tiendas or tiendas_registradas())]
+        self.max_concurrencia = max_concurrencia
+
+    def buscar(self, palabra_clave: str, limite: int = 5) -> List[Producto]:
+        """
+        Busca en todas las tiendas y devuelve los productos ordenados por precio
+
+        Args:
+            palabra_clave (str): Término de búsqueda
+            limite (int): Número máximo de productos por tienda
+        Returns:
+            List[Producto]: Productos de todas las tiendas con la clave
+            'tienda', del más barato al más caro (sin precio al final)
+        """
+        return self.buscar_lote([palabra_clave], limite)[0]
+
+    def buscar_lote(self, palabras: List[str], limite: int = 5) -> List[List[Producto]]:
+        """
+        Busca varias palabras clave en todas las tiendas de forma concurrente
+
+        Args:
+            palabras (List[str]): Términos de búsqueda
+            limite (int): Número máximo de productos por tienda y término
+        Returns:
+            List[List[Producto]]: Productos combinados de cada término, en
+            el mismo orden que 'palabras'
+        """
+        palabras = list(palabras)
+        tareas = [(palabra, adaptador) for palabra in palabras for adaptador in self.adaptadores]
+        if not tareas:
+            return [[] for _ in palabras]
+
+        print(f"[INFO] Búsqueda multitienda: {len(palabras)} términos en "
+              f"{', '.join(adaptador.nombre for adaptador in self.adaptadores)}")
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrencia, len(tareas))) as executor:
+            resultados = list(executor.map(lambda tarea: self._buscar_en(*tarea, limite), tareas))
+
+        por_tienda = len(self.adaptadores)
+        return [self._combinar(resultados[i:i + por_tienda])
+                for i in range(0, len(resultados), por_tienda)]
+
+    def _buscar_en(self, palabra_clave, adaptador, limite):
+        """
+        Descarga y extrae los productos de una tienda para una palabra clave
+        """
+        url = adaptador.construir_url(palabra_clave)
+        metricas = MetricasBusqueda(palabra_clave, url)
+        print(f"[DEBUG] {adaptador.nombre}: {url}")
+
+        productos = []
+        try:
+            for campos in adaptador.buscar(palabra_clave, limite, metricas):
+                productos.append({**campos, 'tienda': adaptador.nombre})
+            print(f"[SUCCESS] {adaptador.nombre}: {len(productos)} productos extraídos")
+        except urllib.error.HTTPError as e:
+            print(f"[ERROR] {adaptador.nombre}: HTTP {e.code}: {e.reason}")
+        except urllib.error.URLError as e:
+            print(f"[ERROR] {adaptador.nombre}: Error de conexión: {e.reason}")
+        except Exception as e:
+            print(f"[ERROR] {adaptador.nombre}: Error durante scraping: {str(e)}")
+        finally:
+            self.scraper.reportar_metricas(metricas)
+        return productos
+
+    @staticmethod
+    def _combinar(listas):
+        """
+        Une los productos de cada tienda ordenados por precio y los renumera
+        """
+        def clave(producto):
+            precio = producto['precio']
+            if precio is None:
+                return (1, '', 0)
+            return (0, precio.moneda, precio.unidades_menores)
+
+        productos = sorted((producto for lista in listas for producto in lista), key=clave)
+        return [{'id': i, **producto} for i, producto in enumerate(productos, 1)]
+
+
+if __name__ == "__main__":
+    palabra = "laptop"
+    busqueda = BusquedaMultitienda()
+    try:
+        busqueda.scraper.mostrar_resultados(busqueda.buscar(palabra, limite=5))
+    finally:
+        busqueda.scraper.cerrar()